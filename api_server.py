@@ -0,0 +1,318 @@
+"""Local HTTP JSON API exposing the calculator's budget and TAM numbers.
+
+Run with:
+    python api_server.py --port 8502
+
+Endpoints:
+    GET  /health
+    GET  /industries
+    POST /budget          {"annual_revenue": 100, "industry": "Healthcare"}
+    POST /budget/batch    {"accounts": [{"annual_revenue": 100, "industry": "Retail"}, ...]}
+                          or columnar {"annual_revenue": [...], "industry": [...]}
+    GET  /tam/sectors
+    GET  /tam/tiers?industry=Weighted%20Average
+    POST /naics/map       {"naics": [541511, "4451", "31-33"]}
+"""
+import argparse
+import asyncio
+import functools
+import json
+import os
+from urllib.parse import urlsplit, parse_qs
+import numpy as np
+import data
+from data import INDUSTRY_PRESETS
+from preset_registry import PRESETS
+from naics_mapping import get_naics_mapping
+from calculations import calculate_account_budgets, compute_sector_tam, compute_tier_tam, preset_arrays
+
+API_HOST = os.environ.get("API_HOST", "127.0.0.1")
+API_PORT = int(os.environ.get("API_PORT", "8502"))
+
+# Largest request body accepted (batched POSTs of many accounts)
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class ApiError(Exception):
+    """Error returned to the client as a JSON body"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _list_items(items, limit=5):
+    """Comma-separated first few items, noting how many more there are"""
+    items = [str(item) for item in items]
+    more = f" and {len(items) - limit} more" if len(items) > limit else ""
+    return ", ".join(items[:limit]) + more
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _require_industry(industry):
+    if not isinstance(industry, str) or industry not in INDUSTRY_PRESETS:
+        raise ApiError(400, f"Unknown industry: {industry}")
+    return industry
+
+
+def _require_number(body, key, default=None):
+    """A finite JSON number from the body, or the default when the key is absent"""
+    value = body.get(key, default)
+    if not _is_number(value) or not np.isfinite(value):
+        raise ApiError(400, f"{key} must be a finite number")
+    return float(value)
+
+
+def _number_column(values, key, length=None):
+    """Float array of a JSON list of numbers (null becomes NaN), optionally of a required length"""
+    if not isinstance(values, list):
+        raise ApiError(400, f"{key} must be a list")
+    invalid = [index for index, value in enumerate(values) if value is not None and not _is_number(value)]
+    if invalid:
+        raise ApiError(400, f"{key} must be numeric (index {_list_items(invalid)})")
+    if length is not None and len(values) != length:
+        raise ApiError(400, f"{key} must have one value per account ({length}), got {len(values)}")
+    return np.array([np.nan if value is None else value for value in values], dtype=float)
+
+
+def handle_industries(query, body):
+    """All industry presets"""
+    return {"version": PRESETS.version,
+            "industries": {name: dict(preset) for name, preset in INDUSTRY_PRESETS.items()}}
+
+
+def handle_budget(query, body):
+    """Budget for a single account"""
+    if "annual_revenue" not in body:
+        raise ApiError(400, "annual_revenue is required")
+    annual_revenue = _require_number(body, "annual_revenue")
+    industry = _require_industry(body.get("industry", "Weighted Average"))
+    preset = INDUSTRY_PRESETS[industry]
+    result = calculate_account_budgets(
+        [annual_revenue],
+        [industry],
+        [_require_number(body, "it_percentage", preset["it_typical"])],
+        [_require_number(body, "security_percentage", preset["security_typical"])]
+    )
+    response = {key: float(values[0]) for key, values in result.items()}
+    response["industry"] = industry
+    return response
+
+
+def handle_budget_batch(query, body):
+    """Budgets for many accounts in one vectorized pass"""
+    if "accounts" in body:
+        accounts = body["accounts"]
+        if not isinstance(accounts, list) or not all(isinstance(a, dict) for a in accounts):
+            raise ApiError(400, "accounts must be a list of objects")
+        columns = {
+            "annual_revenue": [a.get("annual_revenue") for a in accounts],
+            "industry": [a.get("industry", "Weighted Average") for a in accounts]
+        }
+        for key in ("it_percentage", "security_percentage"):
+            if any(key in a for a in accounts):
+                columns[key] = [a.get(key) for a in accounts]
+    else:
+        columns = body
+
+    if columns.get("annual_revenue") is None:
+        raise ApiError(400, "annual_revenue is required")
+    revenue = _number_column(columns["annual_revenue"], "annual_revenue")
+    missing = np.flatnonzero(~np.isfinite(revenue))
+    if len(missing):
+        raise ApiError(400, f"annual_revenue is missing or not finite at index {_list_items(missing)}")
+    industries = columns.get("industry", "Weighted Average")
+    if isinstance(industries, str):
+        industries = [industries] * len(revenue)
+    if not isinstance(industries, list) or not all(isinstance(name, str) for name in industries):
+        raise ApiError(400, "industry must be a string or a list of strings")
+    if len(industries) != len(revenue):
+        raise ApiError(400, "industry and annual_revenue must have the same length")
+    lookup = PRESETS.snapshot().lookup
+    unknown = [name for name in dict.fromkeys(industries) if name not in lookup]
+    if unknown:
+        raise ApiError(400, f"Unknown industry: {_list_items(unknown)}")
+
+    # Per-account overrides; missing values (null) keep the industry typical
+    presets = preset_arrays(industries)
+    percentages = {"it_percentage": presets["it_typical"], "security_percentage": presets["security_typical"]}
+    for key in percentages:
+        if key in columns:
+            override = _number_column(columns[key], key, len(revenue))
+            if np.isinf(override).any():
+                raise ApiError(400, f"{key} must be finite")
+            percentages[key] = np.where(np.isnan(override), percentages[key], override)
+    result = calculate_account_budgets(revenue, industries, **percentages)
+
+    response = {key: values.tolist() for key, values in result.items()}
+    response["totals"] = {
+        "accounts": int(len(revenue)),
+        "annual_revenue": float(revenue.sum()),
+        "it_budget": float(result["it_budget"].sum()),
+        "security_budget": float(result["security_budget"].sum())
+    }
+    return response
+
+
+def handle_naics_map(query, body):
+    """Industry and typical IT/security percentages for an array of raw 2-6 digit NAICS codes"""
+    codes = body.get("naics")
+    if not isinstance(codes, list):
+        raise ApiError(400, "naics must be a list of codes")
+    mapping = get_naics_mapping()
+    ids = mapping.industry_ids(codes)
+    percentages = mapping.percentages_for_ids(ids)
+    return {
+        "industry": mapping.industries_for_ids(ids, "Weighted Average").tolist(),
+        "it_percentage": percentages["it_typical"].tolist(),
+        "security_percentage": percentages["security_typical"].tolist(),
+        "unmatched": int((ids < 0).sum())
+    }
+
+
+@functools.lru_cache(maxsize=4)
+def sector_tam_records(preset_key, vintage_key):
+    """Sector TAM records, computed once per preset version and NAICS vintage (st.cache_data only persists inside a Streamlit runtime)"""
+    naics_data = data.load_naics_revenue_data(vintage_key[0])
+    if naics_data is None:
+        return None
+    return compute_sector_tam(naics_data).to_dict(orient="records")
+
+
+def handle_sector_tam(query, body):
+    """Sector TAM from the cached NAICS dataset"""
+    records = sector_tam_records(data.sector_preset_key(), data.vintage_key())
+    if records is None:
+        raise ApiError(500, "NAICS data unavailable")
+    return {"sectors": records}
+
+
+@functools.lru_cache(maxsize=64)
+def tier_tam_records(industry, preset_key):
+    """Tier TAM records for one industry; preset_key changes only when that industry's preset does"""
+    preset = INDUSTRY_PRESETS[industry]
+    return compute_tier_tam(preset["it_typical"], preset["security_typical"]).to_dict(orient="records")
+
+
+def handle_tier_tam(query, body):
+    """TAM per NAICS revenue tier for an industry's typical percentages"""
+    industry = _require_industry(query.get("industry", ["Weighted Average"])[0])
+    return {"industry": industry, "tiers": tier_tam_records(industry, PRESETS.dependency_key([industry]))}
+
+
+ROUTES = {
+    ("GET", "/health"): lambda query, body: {"status": "ok"},
+    ("GET", "/industries"): handle_industries,
+    ("POST", "/budget"): handle_budget,
+    ("POST", "/budget/batch"): handle_budget_batch,
+    ("GET", "/tam/sectors"): handle_sector_tam,
+    ("GET", "/tam/tiers"): handle_tier_tam,
+    ("POST", "/naics/map"): handle_naics_map,
+}
+
+# Handlers that do enough work to be moved off the event loop
+OFFLOADED = {handle_budget_batch, handle_naics_map}
+
+
+def dispatch(method, target, raw_body):
+    """Route a request and return (status, payload bytes)"""
+    url = urlsplit(target)
+    handler = ROUTES.get((method, url.path))
+    try:
+        if handler is None:
+            if any(path == url.path for _, path in ROUTES):
+                raise ApiError(405, f"{method} not allowed for {url.path}")
+            raise ApiError(404, f"No route for {url.path}")
+        body = json.loads(raw_body) if raw_body else {}
+        if not isinstance(body, dict):
+            raise ApiError(400, "Request body must be a JSON object")
+        payload = handler(parse_qs(url.query), body)
+        status = 200
+    except ApiError as e:
+        status, payload = e.status, {"error": e.message}
+    except json.JSONDecodeError as e:
+        status, payload = 400, {"error": f"Invalid JSON: {e}"}
+    except Exception as e:
+        status, payload = 500, {"error": str(e)}
+    try:
+        return status, json.dumps(payload, allow_nan=False).encode()
+    except ValueError as e:
+        return 500, json.dumps({"error": f"Response is not valid JSON: {e}"}).encode()
+
+
+async def handle_connection(reader, writer):
+    """Serve HTTP/1.1 requests on one keep-alive connection"""
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            try:
+                method, target, version = request_line.decode("latin-1").split()
+            except ValueError:
+                break
+
+            # Read headers
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length", 0) or 0)
+            if length > MAX_BODY_BYTES:
+                status, payload = 413, json.dumps({"error": "Request body too large"}).encode()
+                keep_alive = False
+            else:
+                raw_body = await reader.readexactly(length) if length else b""
+                handler = ROUTES.get((method, urlsplit(target).path))
+                if handler in OFFLOADED:
+                    status, payload = await loop.run_in_executor(None, dispatch, method, target, raw_body)
+                else:
+                    status, payload = dispatch(method, target, raw_body)
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+            writer.write(
+                f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + payload
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host=API_HOST, port=API_PORT):
+    """Run the API server until cancelled"""
+    # Warm the NAICS cache so the first TAM request doesn't pay the workbook parse
+    sector_tam_records(data.sector_preset_key(), data.vintage_key())
+    server = await asyncio.start_server(handle_connection, host, port, limit=MAX_BODY_BYTES)
+    print(f"Security budget API listening on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Security budget calculator JSON API")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
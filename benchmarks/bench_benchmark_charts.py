@@ -0,0 +1,61 @@
+"""Build and serialisation time of the Industry Benchmarks views for large custom industry lists.
+
+    python benchmarks/bench_benchmark_charts.py --industries 100 1000
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import plotly.io as pio
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pages.industry_benchmarks import build_industry_table, create_bubble_chart, create_range_chart, create_reference_table
+from data import INDUSTRY_PRESETS
+from session_memory import CustomIndustryTable
+
+
+def random_industries(count, seed=0):
+    """Custom industry table with plausible random benchmarks"""
+    rng = np.random.default_rng(seed)
+    it = rng.uniform(2, 10, count)
+    sec = rng.uniform(5, 15, count)
+    industries = CustomIndustryTable()
+    industries.update_many([f"Industry {i}" for i in range(count)],
+                           np.column_stack([it - 1, it, it + 1, sec - 2, sec, sec + 2]))
+    return industries
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--industries", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    print(f"{'industries':>10} {'table ms':>9} {'range ms':>9} {'bubble ms':>10} {'json ms':>8} {'payload KB':>11}")
+    for count in args.industries:
+        table, table_time = timed(build_industry_table, INDUSTRY_PRESETS, random_industries(count))
+        figures = []
+        range_time = 0.0
+        for field in ("it", "security"):
+            fig, elapsed = timed(create_range_chart, table, field, "", "", "", "#96E4B0", "#008581")
+            figures.append(fig)
+            range_time += elapsed
+        bubble_fig, bubble_time = timed(create_bubble_chart, table)
+        figures.append(bubble_fig)
+        create_reference_table(table)
+
+        # Serialisation is what Streamlit does to ship each figure to the browser
+        payloads, json_time = timed(lambda: [pio.to_json(fig, validate=False) for fig in figures])
+        print(f"{count:>10,} {table_time * 1000:>9.0f} {range_time * 1000:>9.0f} {bubble_time * 1000:>10.0f} "
+              f"{json_time * 1000:>8.0f} {sum(len(p) for p in payloads) / 1024:>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Throughput and peak-memory benchmark for streaming table exports.
+
+    python benchmarks/bench_exports.py --rows 1000000 --scenarios 10
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import multiprocessing
+import resource
+import numpy as np
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from exports import WRITERS, iter_budget_table_chunks
+from scenario_store import ScenarioPage
+
+
+def export_once(rows, scenarios, fmt, results):
+    """Run one export in a fresh process so its peak RSS is isolated"""
+    revenue = np.linspace(1, 1000, rows)
+    rng = np.random.default_rng(0)
+    calculations = ScenarioPage(
+        [(i, "Weighted Average", it, sec, 100.0, 0.0)
+         for i, (it, sec) in enumerate(zip(rng.uniform(2, 15, scenarios), rng.uniform(5, 20, scenarios)))]
+    )
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with tempfile.TemporaryFile() as out:
+        start = time.perf_counter()
+        WRITERS[fmt](iter_budget_table_chunks(revenue, 5.5, 9.5, calculations), out)
+        elapsed = time.perf_counter() - start
+        size = out.seek(0, os.SEEK_END)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((elapsed, size, baseline * 1024, peak * 1024))
+
+
+def run(rows, scenarios, formats):
+    print(f"Exporting {rows:,} rows x {7 + scenarios} columns")
+    print(f"{'format':<10}{'seconds':>10}{'rows/s':>14}{'file MB':>10}{'peak RSS MB':>13}{'export MB':>11}")
+    for fmt in formats:
+        results = multiprocessing.Queue()
+        process = multiprocessing.Process(target=export_once, args=(rows, scenarios, fmt, results))
+        process.start()
+        elapsed, size, baseline, peak = results.get()
+        process.join()
+        print(f"{fmt:<10}{elapsed:>10.2f}{rows / elapsed:>14,.0f}{size / 1e6:>10.1f}"
+              f"{peak / 1e6:>13.1f}{(peak - baseline) / 1e6:>11.1f}", flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark streaming exports")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--scenarios", type=int, default=10)
+    parser.add_argument("--formats", nargs="+", default=list(WRITERS))
+    args = parser.parse_args()
+    run(args.rows, args.scenarios, args.formats)
@@ -0,0 +1,78 @@
+"""Bytes and serialisation time per figure shipped to the browser.
+
+    python benchmarks/bench_figure_payloads.py --saved 0 20 --industries 100
+
+"plotly_chart" is the JSON Streamlit sends for st.plotly_chart; "component" is the typed-array
+payload of the browser-side budget chart.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import numpy as np
+import plotly.io as pio
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from budget_component import encode_figure
+from data import CHART_COLORS, INDUSTRY_PRESETS, generate_revenue_array
+from pages.budget_calculator import create_budget_donut_chart
+from pages.industry_benchmarks import build_industry_table, create_bubble_chart, create_range_chart
+from scenario_store import ScenarioPage
+from utils import create_security_budget_chart
+from bench_benchmark_charts import random_industries
+
+
+def saved_calculations(count, seed=0):
+    """Page of random saved calculations"""
+    rng = np.random.default_rng(seed)
+    rows = [(i, "Weighted Average", round(rng.uniform(3, 8), 1), round(rng.uniform(5, 15), 1), 100, 0.0)
+            for i in range(count)]
+    return ScenarioPage(rows, 0, count)
+
+
+def budget_chart(calculations, max_chart_revenue=1000):
+    revenue_array = generate_revenue_array(max_chart_revenue)
+    return create_security_budget_chart(
+        revenue_array, np.arange(len(revenue_array)), 5.7, 11.3, True, 3.0, 8.0, 5.5, 5.0, 15.0, 10.0,
+        CHART_COLORS, calculations
+    )
+
+
+def measure(name, fig, repeat, component=False):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        payload = pio.to_json(fig, validate=False)
+    json_ms = (time.perf_counter() - start) / repeat * 1000
+    line = f"{name:<28} {len(payload):>12,} {json_ms:>8.2f}"
+    if component:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            encoded = json.dumps(encode_figure(fig), separators=(",", ":"))
+        line += f" {len(encoded):>12,} {(time.perf_counter() - start) / repeat * 1000:>8.2f}"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--saved", type=int, nargs="+", default=[0, 20],
+                        help="saved calculations drawn on the budget chart")
+    parser.add_argument("--industries", type=int, nargs="+", default=[100],
+                        help="custom industries on the benchmark charts")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'figure':<28} {'plotly_chart B':>12} {'json ms':>8} {'component B':>12} {'enc ms':>8}")
+    for count in args.saved:
+        measure(f"budget chart ({count} saved)", budget_chart(saved_calculations(count)), args.repeat, True)
+    measure("budget donut", create_budget_donut_chart(250, 5.7, 11.3), args.repeat, True)
+    for count in args.industries:
+        table = build_industry_table(INDUSTRY_PRESETS, random_industries(count))
+        measure(f"IT range ({count} custom)", create_range_chart(table, "it", "", "", "", "#96E4B0", "#008581"),
+                args.repeat)
+        measure(f"bubble chart ({count} custom)", create_bubble_chart(table), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Throughput of NAICS code -> industry percentage mapping.
+
+    python benchmarks/bench_naics_mapping.py --codes 10000000
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data import NAICS_TO_SECTOR
+from naics_mapping import compile_naics_mapping
+
+
+def random_codes(count, seed=0):
+    """Valid-looking NAICS codes of 2-6 digits, mostly 6-digit like CRM exports"""
+    rng = np.random.default_rng(seed)
+    sectors = np.array([int(code) for code in NAICS_TO_SECTOR], dtype=np.int64)
+    digits = rng.choice([2, 3, 4, 5, 6], size=count, p=[0.05, 0.05, 0.1, 0.1, 0.7])
+    codes = sectors[rng.integers(0, len(sectors), count)]
+    for extra in range(1, 5):
+        longer = digits >= 2 + extra
+        codes[longer] = codes[longer] * 10 + rng.integers(0, 10, int(longer.sum()))
+    return codes
+
+
+def report(label, count, seconds):
+    print(f"{label:<28} {seconds:>8.3f} s {count / seconds / 1e6:>8.1f} M codes/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--codes", type=int, default=10_000_000)
+    parser.add_argument("--string-codes", type=int, default=1_000_000,
+                        help="Codes in the (slower) string input benchmark")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    mapping = compile_naics_mapping()
+    print(f"Compiled table: {mapping.nbytes / 1e6:.1f} MB in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    codes = random_codes(args.codes)
+    start = time.perf_counter()
+    ids = mapping.industry_ids(codes)
+    report("int codes -> industry ids", args.codes, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    mapping.percentages_for_ids(ids)
+    report("industry ids -> percentages", args.codes, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    mapping.percentages(codes)
+    report("int codes -> percentages", args.codes, time.perf_counter() - start)
+
+    strings = codes[:args.string_codes].astype(str).astype(object)
+    start = time.perf_counter()
+    mapping.percentages(strings)
+    report("string codes -> percentages", len(strings), time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Per-keystroke latency of the NAICS code and name search.
+
+    python benchmarks/bench_naics_search.py --queries "5415" "computer systems" "hospitals"
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data import load_naics_code_table
+from naics_search import build_naics_search_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", nargs="+", default=["5415", "computer systems", "hospitals", "manufacturing",
+                                                          "sofware publishers"])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = build_naics_search_index(load_naics_code_table())
+    print(f"Indexed {len(index):,} NAICS entries in {(time.perf_counter() - start) * 1000:.0f} ms (incl. workbook read)")
+
+    # Every prefix of a query is one keystroke
+    print(f"{'query':<22} {'keystrokes':>10} {'mean ms':>8} {'max ms':>8}  top match")
+    for query in args.queries:
+        timings = []
+        for length in range(1, len(query) + 1):
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                results = index.search(query[:length])
+            timings.append((time.perf_counter() - start) / args.repeat * 1000)
+        top = index.labels[results[0]] if results else "-"
+        print(f"{query:<22} {len(query):>10} {np.mean(timings):>8.3f} {np.max(timings):>8.3f}  {top}")
+
+
+if __name__ == "__main__":
+    main()
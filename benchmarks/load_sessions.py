@@ -0,0 +1,377 @@
+"""Concurrent-session load and soak test for the Streamlit app: rerun latency, CPU and RSS per replica size.
+
+Starts `streamlit run security_budget_calculator.py` pinned to each CPU count, then drives it with
+simulated browser sessions over the app's websocket protocol, stepping up the number of sessions:
+    python benchmarks/load_sessions.py --cpus 1 2 --sessions 1 4 16 32 --duration 30 --slo-ms 1000
+
+Soak test: hold a fixed number of sessions and watch RSS over time for growth:
+    python benchmarks/load_sessions.py --cpus 2 --sessions 16 --duration 1800 --sample-interval 30
+
+Or attach to an already running replica (CPU and RSS need its process id):
+    python benchmarks/load_sessions.py --url http://localhost:8501 --pid 12345 --sessions 8
+
+Each session replays interaction scripts between think times: slider drags, industry and revenue
+changes, custom-industry adds through the form and NAICS multiselect changes. Tab switches happen
+in the browser and never rerun the script, so they only add think time.
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import numpy as np
+from tornado.websocket import websocket_connect
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_SCRIPT = "security_budget_calculator.py"
+
+# Widgets the scripts interact with: (element type, label)
+INDUSTRY_RADIO = ("radio", "Select Industry")
+IT_SLIDER = ("slider", "IT Budget (% of Revenue)")
+SECURITY_SLIDER = ("slider", "Security Budget (% of IT)")
+REVENUE_INPUT = ("number_input", "Annual Revenue (Million $)")
+NAICS_MULTISELECT = ("multiselect", "Select NAICS Industry Code(s)")
+CUSTOM_NAME_INPUT = ("text_input", "Industry Name")
+CUSTOM_ADD_BUTTON = ("button", "Add Industry")
+
+WIDGET_TYPES = {"button", "checkbox", "multiselect", "number_input", "radio", "selectbox", "slider", "text_input"}
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+class Session:
+    """One simulated browser tab: keeps widget state by widget id, like the frontend does"""
+
+    def __init__(self, url, rng):
+        self.url = url.rstrip("/").replace("http", "ws", 1) + "/_stcore/stream"
+        self.rng = rng
+        self.connection = None
+        self.widgets = {}       # (type, label) -> element proto from the last run
+        self.states = {}        # widget id -> WidgetState values set by this session
+        self.cache = {}         # ForwardMsg hash -> message, for reference messages
+        self.custom_count = 0
+
+    async def connect(self):
+        self.connection = await websocket_connect(self.url, max_message_size=2 ** 28)
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+
+    async def rerun(self, triggers=()):
+        """Send the current widget states, wait for the run to finish and return (seconds, exceptions)"""
+        message = BackMsg()
+        message.rerun_script.widget_states.SetInParent()
+        widgets = message.rerun_script.widget_states.widgets
+        for widget_id, set_value in self.states.items():
+            state = widgets.add()
+            state.id = widget_id
+            set_value(state)
+        for widget_id in triggers:
+            state = widgets.add()
+            state.id = widget_id
+            state.trigger_value = True
+
+        start = time.perf_counter()
+        await self.connection.write_message(message.SerializeToString(), binary=True)
+        widgets_seen, exceptions = {}, 0
+        while True:
+            payload = await self.connection.read_message()
+            if payload is None:
+                raise ConnectionError("websocket closed")
+            msg = ForwardMsg()
+            msg.ParseFromString(payload)
+            if msg.WhichOneof("type") == "ref_hash":
+                msg = self.cache[msg.ref_hash]
+            elif msg.metadata.cacheable:
+                self.cache[msg.hash] = msg
+            kind = msg.WhichOneof("type")
+            if kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type == "exception":
+                    exceptions += 1
+                elif element_type in WIDGET_TYPES:
+                    proto = getattr(element, element_type)
+                    widgets_seen.setdefault((element_type, proto.label), proto)
+            elif kind == "script_finished" and msg.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                break
+            elif kind == "script_finished":
+                widgets_seen = {}
+        elapsed = time.perf_counter() - start
+
+        # Widgets whose id changed are new widgets that start from their default, as in the browser
+        self.widgets = widgets_seen
+        live_ids = {proto.id for proto in widgets_seen.values()}
+        self.states = {widget_id: value for widget_id, value in self.states.items() if widget_id in live_ids}
+        return elapsed, exceptions
+
+    def set(self, widget, set_value):
+        """Record a new value for a widget from the last run; False if it wasn't rendered"""
+        proto = self.widgets.get(widget)
+        if proto is None:
+            return False
+        self.states[proto.id] = set_value
+        return True
+
+    def _slider_value(self, widget):
+        proto = self.widgets[widget]
+        value = round(self.rng.uniform(proto.min, proto.max) / proto.step) * proto.step
+        return lambda state: state.double_array_value.data.append(value)
+
+    # Interaction scripts: each returns the list of widget triggers for its rerun, or None if it can't run
+
+    def drag_slider(self):
+        widget = self.rng.choice([IT_SLIDER, SECURITY_SLIDER])
+        if widget in self.widgets and self.set(widget, self._slider_value(widget)):
+            return ()
+
+    def change_industry(self):
+        proto = self.widgets.get(INDUSTRY_RADIO)
+        if proto is not None:
+            index = self.rng.randrange(len(proto.options))
+            self.set(INDUSTRY_RADIO, lambda state: setattr(state, "int_value", index))
+            return ()
+
+    def change_revenue(self):
+        value = self.rng.randrange(1, 101) * 10
+        if self.set(REVENUE_INPUT, lambda state: setattr(state, "int_value", value)):
+            return ()
+
+    def select_naics(self):
+        proto = self.widgets.get(NAICS_MULTISELECT)
+        if proto is not None:
+            indices = self.rng.sample(range(1, len(proto.options)), self.rng.randint(1, 3))
+            self.set(NAICS_MULTISELECT, lambda state: state.int_array_value.data.extend(indices))
+            return ()
+
+    def add_custom_industry(self):
+        button = self.widgets.get(CUSTOM_ADD_BUTTON)
+        if button is not None:
+            self.custom_count += 1
+            name = f"Load Test Industry {self.custom_count}"
+            if self.set(CUSTOM_NAME_INPUT, lambda state: setattr(state, "string_value", name)):
+                return (button.id,)
+
+
+# Relative frequency of each interaction script
+SCRIPTS = [
+    ("slider", Session.drag_slider, 50),
+    ("industry", Session.change_industry, 15),
+    ("revenue", Session.change_revenue, 15),
+    ("naics", Session.select_naics, 15),
+    ("custom_add", Session.add_custom_industry, 5),
+]
+
+
+async def run_session(url, deadline, think_time, latencies, errors, seed):
+    rng = random.Random(seed)
+    session = Session(url, rng)
+    try:
+        await session.connect()
+        elapsed, exceptions = await session.rerun()
+        latencies.setdefault("page_load", []).append(elapsed)
+        errors["page_load"] = errors.get("page_load", 0) + exceptions
+        labels, functions, weights = zip(*SCRIPTS)
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(rng.uniform(*think_time))
+            index = rng.choices(range(len(SCRIPTS)), weights)[0]
+            triggers = functions[index](session)
+            if triggers is None:
+                continue
+            elapsed, exceptions = await session.rerun(triggers)
+            latencies.setdefault(labels[index], []).append(elapsed)
+            errors[labels[index]] = errors.get(labels[index], 0) + exceptions
+    except (ConnectionError, OSError) as e:
+        errors["connection"] = errors.get("connection", 0) + 1
+        print(f"session {seed}: {e}", file=sys.stderr)
+    finally:
+        session.close()
+
+
+class ProcessSampler:
+    """CPU (% of one core) and RSS of a process and its children, sampled from /proc"""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.samples = []  # (seconds, cpu %, rss MB)
+        self._last = None
+
+    def _pids(self):
+        pids = [self.pid]
+        try:
+            with open(f"/proc/{self.pid}/task/{self.pid}/children") as f:
+                pids += [int(child) for child in f.read().split()]
+        except OSError:
+            pass
+        return pids
+
+    def read(self):
+        """Total CPU seconds and RSS (MB)"""
+        cpu, rss = 0.0, 0.0
+        for pid in self._pids():
+            try:
+                with open(f"/proc/{pid}/stat") as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+                cpu += (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+                with open(f"/proc/{pid}/status") as f:
+                    for line in f:
+                        if line.startswith("VmRSS:"):
+                            rss += int(line.split()[1]) / 1024
+            except OSError:
+                pass
+        return cpu, rss
+
+    def sample(self):
+        now = time.perf_counter()
+        cpu, rss = self.read()
+        if self._last is not None:
+            last_time, last_cpu = self._last
+            self.samples.append((now, (cpu - last_cpu) / (now - last_time) * 100, rss))
+        self._last = (now, cpu)
+
+    async def run(self, interval, stop, report=False):
+        start = time.perf_counter()
+        self.sample()
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+            self.sample()
+            if report and self.samples:
+                _, cpu, rss = self.samples[-1]
+                print(f"  t={time.perf_counter() - start:>7.0f}s  cpu {cpu:>6.1f}%  rss {rss:>8.1f} MB", flush=True)
+
+
+async def run_step(url, pid, sessions, duration, think_time, sample_interval, soak):
+    """Drive the app with a number of concurrent sessions; returns the step's summary row"""
+    latencies, errors = {}, {}
+    sampler = ProcessSampler(pid) if pid else None
+    stop = asyncio.Event()
+    sampling = asyncio.ensure_future(sampler.run(sample_interval, stop, soak)) if sampler else None
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*[
+        run_session(url, deadline, think_time, latencies, errors, seed) for seed in range(sessions)
+    ])
+    elapsed = time.perf_counter() - start
+    stop.set()
+    if sampling:
+        await sampling
+
+    reruns = np.array([value for label, values in latencies.items() if label != "page_load" for value in values])
+    row = {
+        "sessions": sessions,
+        "reruns": len(reruns),
+        "reruns/s": len(reruns) / elapsed,
+        "p50": np.percentile(reruns, 50) * 1000 if len(reruns) else np.nan,
+        "p95": np.percentile(reruns, 95) * 1000 if len(reruns) else np.nan,
+        "p99": np.percentile(reruns, 99) * 1000 if len(reruns) else np.nan,
+        "errors": sum(errors.values()),
+        "cpu": np.mean([cpu for _, cpu, _ in sampler.samples]) if sampler and sampler.samples else np.nan,
+        "rss": max([rss for _, _, rss in sampler.samples]) if sampler and sampler.samples else np.nan,
+    }
+    if soak and sampler and len(sampler.samples) > 1:
+        times = np.array([t for t, _, _ in sampler.samples])
+        rss = np.array([rss for _, _, rss in sampler.samples])
+        slope = np.polyfit((times - times[0]) / 3600, rss, 1)[0]
+        print(f"  RSS {rss[0]:.1f} -> {rss[-1]:.1f} MB, trend {slope:+.1f} MB/hour")
+
+    print(f"  {'script':<12}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for label in sorted(latencies):
+        values = np.array(latencies[label]) * 1000
+        print(f"  {label:<12}{len(values):>8}{np.percentile(values, 50):>10.0f}"
+              f"{np.percentile(values, 95):>10.0f}{np.percentile(values, 99):>10.0f}{errors.get(label, 0):>8}")
+    return row
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_replica(cpus, port):
+    """Start the app pinned to the first `cpus` CPUs and wait until it answers"""
+    available = sorted(os.sched_getaffinity(0))
+    if cpus > len(available):
+        raise SystemExit(f"Only {len(available)} CPUs available")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP_SCRIPT, "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=APP_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        preexec_fn=lambda: os.sched_setaffinity(0, available[:cpus])
+    )
+    for _ in range(300):
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return process
+        except OSError:
+            if process.poll() is not None:
+                raise SystemExit("Streamlit exited during startup")
+            time.sleep(0.1)
+    process.terminate()
+    raise SystemExit("Streamlit did not start within 30s")
+
+
+def print_report(label, rows, slo_ms):
+    print(f"\nCapacity report: {label}")
+    print(f"{'sessions':>8}{'reruns':>8}{'reruns/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'errors':>8}{'cpu %':>8}{'rss MB':>9}")
+    for row in rows:
+        print(f"{row['sessions']:>8}{row['reruns']:>8}{row['reruns/s']:>10.1f}{row['p50']:>9.0f}{row['p95']:>9.0f}"
+              f"{row['p99']:>9.0f}{row['errors']:>8}{row['cpu']:>8.0f}{row['rss']:>9.0f}")
+    within = [row["sessions"] for row in rows if row["p95"] <= slo_ms and row["errors"] == 0]
+    if within:
+        print(f"Capacity: {max(within)} concurrent sessions with p95 rerun latency <= {slo_ms:.0f} ms")
+    else:
+        print(f"Capacity: below {rows[0]['sessions']} sessions at p95 <= {slo_ms:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="attach to a running app instead of starting one per CPU count")
+    parser.add_argument("--pid", type=int, help="process id of the app given by --url, for CPU and RSS")
+    parser.add_argument("--cpus", type=int, nargs="+", default=[1], help="replica sizes (CPUs) to test")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--duration", type=float, default=30, help="seconds per step")
+    parser.add_argument("--think-time", type=float, nargs=2, default=[0.5, 3.0], metavar=("MIN", "MAX"),
+                        help="seconds between a session's interactions")
+    parser.add_argument("--slo-ms", type=float, default=1000, help="p95 rerun latency target")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="seconds between CPU/RSS samples")
+    args = parser.parse_args()
+    soak = len(args.sessions) == 1 and args.duration >= 300
+
+    if args.url:
+        rows = []
+        for sessions in args.sessions:
+            print(f"{sessions} sessions for {args.duration:.0f}s")
+            rows.append(asyncio.run(run_step(args.url, args.pid, sessions, args.duration, args.think_time,
+                                             args.sample_interval, soak)))
+        print_report(args.url, rows, args.slo_ms)
+        return
+
+    for cpus in args.cpus:
+        rows = []
+        for sessions in args.sessions:
+            # A fresh replica per step so caches and memory start from the same state
+            port = free_port()
+            process = start_replica(cpus, port)
+            try:
+                print(f"{cpus} CPU(s), {sessions} sessions for {args.duration:.0f}s")
+                rows.append(asyncio.run(run_step(f"http://127.0.0.1:{port}", process.pid, sessions, args.duration,
+                                                 args.think_time, args.sample_interval, soak)))
+            finally:
+                process.terminate()
+                process.wait()
+        print_report(f"{cpus} CPU(s) per replica", rows, args.slo_ms)
+
+
+if __name__ == "__main__":
+    main()
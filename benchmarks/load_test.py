@@ -0,0 +1,98 @@
+"""Load test for api_server.py: reports p50/p99 latency and requests/sec.
+
+Start the API first (python api_server.py), then run:
+    python benchmarks/load_test.py --concurrency 32 --duration 10 --batch-size 1000
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import numpy as np
+
+INDUSTRIES = ["Financial Services", "Healthcare", "Retail", "Technology", "Manufacturing",
+              "Government/Public Sector", "Education", "Energy & Utilities",
+              "Transportation & Logistics", "Weighted Average"]
+
+
+def build_requests(batch_size):
+    """Request mix: (label, method, path, body bytes)"""
+    accounts = [
+        {"annual_revenue": round(random.uniform(1, 1000), 1), "industry": random.choice(INDUSTRIES)}
+        for _ in range(batch_size)
+    ]
+    return [
+        ("budget", "POST", "/budget", json.dumps({"annual_revenue": 250, "industry": "Healthcare"}).encode()),
+        ("budget_batch", "POST", "/budget/batch", json.dumps({"accounts": accounts}).encode()),
+        ("industries", "GET", "/industries", b""),
+        ("tam_tiers", "GET", "/tam/tiers?industry=Technology", b""),
+        ("tam_sectors", "GET", "/tam/sectors", b""),
+    ]
+
+
+async def send(reader, writer, host, method, path, body):
+    """Send one keep-alive request and read the full response; returns the status code"""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":")[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def worker(host, port, requests, weights, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port, limit=2 ** 26)
+    try:
+        while time.perf_counter() < deadline:
+            label, method, path, body = random.choices(requests, weights)[0]
+            start = time.perf_counter()
+            status = await send(reader, writer, host, method, path, body)
+            latencies.setdefault(label, []).append(time.perf_counter() - start)
+            if status != 200:
+                errors[label] = errors.get(label, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run(host, port, concurrency, duration, batch_size):
+    requests = build_requests(batch_size)
+    weights = [50, 10, 15, 15, 10]
+    latencies, errors = {}, {}
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*[
+        worker(host, port, requests, weights, deadline, latencies, errors) for _ in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - start
+
+    total = sum(len(v) for v in latencies.values())
+    print(f"{total} requests in {elapsed:.1f}s with {concurrency} connections "
+          f"({total / elapsed:,.0f} req/s, batch size {batch_size})")
+    print(f"{'endpoint':<14}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for label, values in sorted(latencies.items()):
+        values = np.array(values) * 1000
+        print(f"{label:<14}{len(values):>8}{np.percentile(values, 50):>10.2f}"
+              f"{np.percentile(values, 99):>10.2f}{errors.get(label, 0):>8}")
+    all_values = np.concatenate([np.array(v) for v in latencies.values()]) * 1000
+    print(f"{'all':<14}{len(all_values):>8}{np.percentile(all_values, 50):>10.2f}"
+          f"{np.percentile(all_values, 99):>10.2f}{sum(errors.values()):>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the security budget API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.host, args.port, args.concurrency, args.duration, args.batch_size))
@@ -0,0 +1,81 @@
+import base64
+import json
+import os
+import numpy as np
+import streamlit as st
+from plotly.utils import PlotlyJSONEncoder
+import streamlit.components.v1 as components
+
+# Browser-side budget chart: recomputes the selection traces locally and syncs values on release
+_budget_chart = components.declare_component(
+    "budget_chart",
+    path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "budget_chart")
+)
+
+# Session state key of the component's last synced value
+CLIENT_CHART_KEY = "client_budget_chart"
+
+# Numeric arrays shorter than this stay plain JSON lists
+TYPED_ARRAY_MIN_LENGTH = 8
+
+
+def encode_typed_array(values):
+    """Base64 typed array in plotly.js's {"dtype", "bdata"} encoding
+
+    Integers that fit are sent as int32; floats as float32, whose 7 significant digits are well
+    beyond the chart's $0.01M display precision.
+    """
+    values = np.ascontiguousarray(values)
+    int32 = np.iinfo(np.int32)
+    if values.dtype.kind in "iu" and values.size and int32.min <= values.min() and values.max() <= int32.max:
+        values, dtype = values.astype("<i4"), "i4"
+    else:
+        values, dtype = values.astype("<f4"), "f4"
+    return {"dtype": dtype, "bdata": base64.b64encode(values.tobytes()).decode("ascii")}
+
+
+def encode_figure(fig):
+    """Figure dict for the browser chart with long numeric arrays sent as base64 typed arrays"""
+    def encode(value):
+        if isinstance(value, dict):
+            return {key: encode(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [encode(item) for item in value]
+        if (isinstance(value, np.ndarray) and value.ndim == 1 and value.dtype.kind in "iuf"
+                and len(value) >= TYPED_ARRAY_MIN_LENGTH):
+            return encode_typed_array(value)
+        return value
+    return json.loads(json.dumps(encode(fig.to_plotly_json()), cls=PlotlyJSONEncoder))
+
+
+def apply_client_chart_values():
+    """Copy values last synced from the browser chart into session state; call before the sidebar sliders"""
+    value = st.session_state.get(CLIENT_CHART_KEY)
+    if not value or value.get("seq") == st.session_state.get("client_chart_seq"):
+        return
+    st.session_state.client_chart_seq = value["seq"]
+    st.session_state.it_percentage = float(value["it_percentage"])
+    st.session_state.security_percentage = float(value["security_percentage"])
+    st.session_state.annual_revenue = int(value["annual_revenue"])
+
+
+def client_budget_chart(chart_fig, donut_fig, revenue_array, it_percentage, security_percentage,
+                        annual_revenue, preset):
+    """Render the budget chart and donut in the browser; sliders inside it rerun nothing until released"""
+    # The selection line is the first trace named "Your Selection"
+    user_trace_index = next(i for i, trace in enumerate(chart_fig.data) if trace.name.startswith("Your Selection"))
+    return _budget_chart(
+        chart_figure=encode_figure(chart_fig),
+        donut_figure=encode_figure(donut_fig),
+        user_trace_index=user_trace_index,
+        revenue_array=encode_typed_array(np.asarray(revenue_array)),
+        it_percentage=float(it_percentage),
+        security_percentage=float(security_percentage),
+        annual_revenue=float(annual_revenue),
+        it_min=float(preset["it_min"]),
+        it_max=float(preset["it_max"]),
+        security_min=float(preset["security_min"]),
+        security_max=float(preset["security_max"]),
+        key=CLIENT_CHART_KEY,
+        default=None
+    )
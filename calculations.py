@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+from data import (
+    REVENUE_TIERS,
+    REVENUE_TIER_COUNTS,
+    SECTOR_TO_INDUSTRY
+)
+from preset_registry import PRESETS
+
+# Security TAM the sector analysis is calibrated to ($180B in millions)
+TARGET_SECURITY_TAM = 180000
+
+# Security budget percentages (of IT) always shown in budget tables and charts
+STANDARD_SECURITY_PERCENTAGES = [5, 10, 15, 20]
+
+# Conservative average revenue assumed for the open-ended 1B+ tier (in millions)
+OPEN_TIER_AVERAGE_REVENUE = 1500
+
+
+def calculate_budgets(annual_revenue, it_percentage, security_percentage):
+    """Calculate IT and security budgets (same units as revenue); inputs broadcast like NumPy arrays"""
+    it_budget = np.asarray(annual_revenue, dtype=float) * (np.asarray(it_percentage, dtype=float) / 100)
+    security_budget = it_budget * (np.asarray(security_percentage, dtype=float) / 100)
+    return it_budget, security_budget
+
+
+def security_budget_surface(annual_revenue, it_low, it_high, security_low, security_high, step=0.1):
+    """Security budget over an IT % (rows) x security % (columns) grid, computed in one broadcast"""
+    it_values = np.round(np.arange(it_low, it_high + step / 2, step), 6)
+    security_values = np.round(np.arange(security_low, security_high + step / 2, step), 6)
+    _, surface = calculate_budgets(annual_revenue, it_values[:, None], security_values[None, :])
+    return it_values, security_values, surface
+
+
+def industry_budget_matrix(revenue_array, it_percentages, security_percentages):
+    """Security budgets (industries x levels x revenue points) from (industries x levels) percentages in one outer product"""
+    budget_fraction = np.asarray(it_percentages, dtype=float) / 100 * np.asarray(security_percentages, dtype=float) / 100
+    return np.multiply.outer(budget_fraction, np.asarray(revenue_array, dtype=float))
+
+
+def preset_arrays(industries, presets=None, default="Weighted Average"):
+    """Gather preset percentages for an array of industry names (unknown names use the default)"""
+    if presets is None:
+        return PRESETS.gather(industries, default=default)
+    preset_df = pd.DataFrame.from_dict(dict(presets), orient="index")
+    codes = preset_df.index.get_indexer(pd.Index(industries))
+    codes = np.where(codes < 0, preset_df.index.get_loc(default), codes)
+    return {column: preset_df[column].to_numpy(dtype=float)[codes] for column in preset_df.columns}
+
+
+def calculate_account_budgets(annual_revenue, industries, it_percentage=None, security_percentage=None):
+    """Vectorized budgets for many accounts; missing percentages fall back to each industry's typical value"""
+    annual_revenue = np.asarray(annual_revenue, dtype=float)
+    presets = preset_arrays(industries)
+    it_pct = presets["it_typical"] if it_percentage is None else np.asarray(it_percentage, dtype=float)
+    sec_pct = presets["security_typical"] if security_percentage is None else np.asarray(security_percentage, dtype=float)
+    it_budget, security_budget = calculate_budgets(annual_revenue, it_pct, sec_pct)
+    return {
+        "annual_revenue": annual_revenue,
+        "it_percentage": np.broadcast_to(it_pct, annual_revenue.shape),
+        "security_percentage": np.broadcast_to(sec_pct, annual_revenue.shape),
+        "it_budget": it_budget,
+        "security_budget": security_budget
+    }
+
+
+def budget_table_values(revenue_array, current_it, current_security, calculations=None):
+    """Numeric budget breakdown columns (label -> array) for the standard, user and saved security percentages"""
+    revenue = np.asarray(revenue_array, dtype=float)
+    it_budget = revenue * (current_it / 100)
+    columns = {"Annual Revenue": revenue}
+
+    # Standard security percentages plus the user's selection if it isn't one of them
+    for sec_percent in STANDARD_SECURITY_PERCENTAGES:
+        columns[f"{sec_percent}% of IT"] = it_budget * (sec_percent / 100)
+    if current_security not in STANDARD_SECURITY_PERCENTAGES:
+        columns[f"User ({current_security}% of IT)"] = it_budget * (current_security / 100)
+
+    # Saved calculations always use their own saved percentages
+    if calculations is not None and len(calculations) > 0:
+        user_budgets = np.outer(revenue, calculations.it_percentage / 100 * calculations.security_percentage / 100)
+        for label, column in zip(calculations.labels(), user_budgets.T):
+            columns[label] = column
+    return columns
+
+
+def format_revenue_range(low, high):
+    """Format a revenue tier (in millions) for display"""
+    if low >= 1000:
+        low_str = f"${low/1000:.1f}B"
+    else:
+        low_str = f"${low}M"
+
+    if high == float('inf'):
+        high_str = "+"
+    elif high >= 1000:
+        high_str = f"${high/1000:.1f}B"
+    else:
+        high_str = f"${high}M"
+
+    return f"{low_str} - {high_str}"
+
+
+def tier_average_revenue():
+    """Average revenue ($M) assumed for each of REVENUE_TIERS: the midpoint, or a conservative estimate for 1B+"""
+    lows = np.array([low for low, _ in REVENUE_TIERS], dtype=float)
+    highs = np.array([high for _, high in REVENUE_TIERS], dtype=float)
+    return np.where(np.isinf(highs), OPEN_TIER_AVERAGE_REVENUE, (lows + highs) / 2)
+
+
+def compute_tier_tam(it_percentage, security_percentage, counts=None):
+    """IT and security TAM per NAICS revenue tier, using tier midpoints as average revenue
+
+    counts defaults to the national tier counts; a (rows x tiers) array with per-row percentages
+    (e.g. selected NAICS codes, each at its own industry's budgets) is summed over rows.
+    """
+    if counts is None:
+        counts = np.array([REVENUE_TIER_COUNTS[tier] for tier in REVENUE_TIERS], dtype=np.int64)
+    counts = np.atleast_2d(counts)
+    avg_revenue = tier_average_revenue()
+    it_budget_tam, security_tam = calculate_budgets(
+        avg_revenue * counts,
+        np.asarray(it_percentage, dtype=float).reshape(-1, 1),
+        np.asarray(security_percentage, dtype=float).reshape(-1, 1)
+    )
+    counts, it_budget_tam, security_tam = counts.sum(axis=0), it_budget_tam.sum(axis=0), security_tam.sum(axis=0)
+
+    return pd.DataFrame({
+        "Revenue Tier": [format_revenue_range(low, high) for low, high in REVENUE_TIERS],
+        "Number of Companies": counts,
+        "Average Revenue ($M)": avg_revenue,
+        "IT Budget TAM ($M)": it_budget_tam,
+        "Security TAM ($M)": security_tam
+    })
+
+
+def tam_scaling_factor(security_budget, target_security_tam=TARGET_SECURITY_TAM):
+    """Factor scaling security budgets so their total matches the target TAM"""
+    # Calculate scaling factor to match the target security TAM
+    total_security_budget = np.sum(security_budget)
+    scaling_factor = 1.0
+    if total_security_budget > 0:
+        scaling_factor = target_security_tam / total_security_budget
+
+    # Apply scaling factor only if it is significantly different from 1.0
+    if abs(scaling_factor - 1.0) <= 0.01:
+        scaling_factor = 1.0
+    return scaling_factor
+
+
+def compute_sector_tam(naics_data, target_security_tam=TARGET_SECURITY_TAM):
+    """Sector TAM from the NAICS sector summary, with security budgets scaled to the target TAM"""
+    sectors = naics_data['sector_name']
+    presets = PRESETS.gather(sectors.map(SECTOR_TO_INDUSTRY), ("it_typical", "security_typical"))
+    it_pct, sec_pct = presets["it_typical"], presets["security_typical"]
+    revenue = naics_data['Revenue'].to_numpy(dtype=float)
+    it_budget, security_budget = calculate_budgets(revenue, it_pct, sec_pct)
+
+    scaling_factor = tam_scaling_factor(security_budget, target_security_tam)
+
+    return pd.DataFrame({
+        'Sector': sectors.to_numpy(),
+        'Coded Companies': naics_data['CodedCompanies'].to_numpy(dtype=float),
+        'Uncoded Companies': naics_data['UncodedCompanies'].to_numpy(dtype=float),
+        'Total Companies': naics_data['Companies'].to_numpy(dtype=float),
+        'Revenue ($M)': revenue,
+        'IT Budget ($M)': it_budget,
+        'Security Budget ($M)': security_budget * scaling_factor
+    })
@@ -1,6 +1,13 @@
+import hashlib
+import json
 import streamlit as st
 import numpy as np
 import pandas as pd
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from session_memory import CustomIndustryTable
+from preset_registry import PRESETS, PRESET_FIELDS, DEFAULT_INDUSTRY, PresetView
+from metrics import DATA_LOAD_SECONDS, timed, track_cache
+from naics_vintages import NAICS_SOURCE_GLOB, VintageStore
 
 # Define NAICS revenue tiers based on official business statistics
 NAICS_REVENUE_TIERS = {
@@ -16,6 +23,37 @@ NAICS_REVENUE_TIERS = {
     "Uncoded records": 1935963
 }
 
+# Average revenue per company (in millions) assumed for each sector summary tier column
+NAICS_REVENUE_MULTIPLIERS = {
+    'uncoded_records': 0.25,  # Assume uncoded records are small businesses (under 500k)
+    'under_500k': 0.25,       # midpoint of 0-500k (in millions)
+    '500k_1m': 0.75,          # midpoint of 500k-1m (in millions)
+    '1m_2.5m': 1.75,          # midpoint of 1m-2.5m (in millions)
+    '2.5m_5m': 3.75,          # midpoint of 2.5m-5m (in millions)
+    '5m_10m': 7.5,            # midpoint of 5m-10m (in millions)
+    '10m_100m': 55,           # midpoint of 10m-100m (in millions)
+    '100m_500m': 300,         # midpoint of 100m-500m (in millions)
+    '500m_1b': 750,           # midpoint of 500m-1b (in millions)
+    '1b_plus': 1500           # conservative estimate for 1b+ (in millions)
+}
+
+# Sector summary column for each workbook tier column
+NAICS_SUMMARY_COLUMNS = {
+    "Uncoded records": "uncoded_records",
+    "Under 500,000": "under_500k",
+    "500,000 - 999,999": "500k_1m",
+    "1,000,000 - 2,499,999": "1m_2.5m",
+    "2,500,000 - 4,999,999": "2.5m_5m",
+    "5,000,000 - 9,999,999": "5m_10m",
+    "10,000,000 - 99,999,999": "10m_100m",
+    "100,000,000 - 499,999,999": "100m_500m",
+    "500,000,000 - 999,999,999": "500m_1b",
+    "1,000,000,000+": "1b_plus"
+}
+
+# Session state key of the NAICS vintage picked in the sidebar
+NAICS_VINTAGE_KEY = "naics_vintage"
+
 # Define revenue tiers for analysis
 REVENUE_TIERS = [
     (0, 0.5),           # Under 500,000
@@ -66,149 +104,87 @@ NAICS_SECTORS = [
     {"code": "92", "name": "Public Administration"}
 ]
 
-# Define industry-specific IT budget percentages based on updated industry data
-INDUSTRY_IT_SPEND = {
-    "Weighted Average": {"min": 4, "max": 7, "typical": 5.5},
-    "Financial Services": {"min": 7, "max": 11, "typical": 9.0},
-    "Healthcare": {"min": 4, "max": 6, "typical": 5.0},
-    "Retail": {"min": 2, "max": 4, "typical": 3.0},
-    "Technology": {"min": 8, "max": 15, "typical": 11.5},
-    "Manufacturing": {"min": 2, "max": 4, "typical": 3.0},
-    "Government/Public Sector": {"min": 5, "max": 8, "typical": 6.5},
-    "Education": {"min": 3, "max": 6, "typical": 4.5},
-    "Energy & Utilities": {"min": 3, "max": 5, "typical": 4.0},
-    "Transportation & Logistics": {"min": 2, "max": 5, "typical": 3.5},
-    "Custom": None  # For user-defined values
-}
+# Industry benchmark percentages live in a versioned data file (industry_presets.json), loaded
+# into a columnar registry; these are live read-only views that follow reloads of the file
+INDUSTRY_IT_SPEND = PresetView(PRESETS, {"min": "it_min", "max": "it_max", "typical": "it_typical"})
+INDUSTRY_SECURITY_SPEND = PresetView(
+    PRESETS, {"min": "security_min", "max": "security_max", "typical": "security_typical"}
+)
+INDUSTRY_PRESETS = PresetView(PRESETS, {field: field for field in PRESET_FIELDS})
+
+def industry_content_hash(custom_industries):
+    """Content hash of the preset and custom industry set, used as a cache key for derived tables and charts"""
+    digest = hashlib.sha1(PRESETS.content_hash.encode())
+    if isinstance(custom_industries, CustomIndustryTable):
+        digest.update(custom_industries.fingerprint())
+    else:
+        digest.update(json.dumps(dict(custom_industries), sort_keys=True).encode())
+    return digest.hexdigest()
 
-# Define industry-specific security budget percentages (as % of IT spend)
-INDUSTRY_SECURITY_SPEND = {
-    "Weighted Average": {"min": 7, "max": 12, "typical": 9.5},
-    "Financial Services": {"min": 10, "max": 15, "typical": 12.5},
-    "Healthcare": {"min": 7, "max": 10, "typical": 8.5},
-    "Retail": {"min": 5, "max": 8, "typical": 6.5},
-    "Technology": {"min": 10, "max": 20, "typical": 15.0},
-    "Manufacturing": {"min": 5, "max": 10, "typical": 7.5},
-    "Government/Public Sector": {"min": 8, "max": 12, "typical": 10.0},
-    "Education": {"min": 5, "max": 8, "typical": 6.5},
-    "Energy & Utilities": {"min": 6, "max": 10, "typical": 8.0},
-    "Transportation & Logistics": {"min": 5, "max": 8, "typical": 6.5},
-    "Custom": None  # For user-defined values
+# NAICS 2-digit sector codes and the sector names used in the NAICS data summary
+NAICS_TO_SECTOR = {
+    "11": "Agriculture, Forestry, Fishing and Hunting",
+    "21": "Mining",
+    "22": "Utilities",
+    "23": "Construction",
+    "31": "Manufacturing",
+    "32": "Manufacturing",
+    "33": "Manufacturing",
+    "42": "Wholesale Trade",
+    "44": "Retail Trade",
+    "45": "Retail Trade",
+    "48": "Transportation and Warehousing",
+    "49": "Transportation and Warehousing",
+    "51": "Information",
+    "52": "Finance and Insurance",
+    "53": "Real Estate Rental and Leasing",
+    "54": "Professional, Scientific, and Technical Services",
+    "55": "Management of Companies and Enterprises",
+    "56": "Administrative and Support Services",
+    "61": "Educational Services",
+    "62": "Health Care and Social Assistance",
+    "71": "Arts, Entertainment, and Recreation",
+    "72": "Accommodation and Food Services",
+    "81": "Other Services",
+    "92": "Public Administration"
 }
 
-# Create industry presets dictionary for the UI
-INDUSTRY_PRESETS = {
-    "Financial Services": {
-        "it_min": INDUSTRY_IT_SPEND["Financial Services"]["min"],
-        "it_typical": INDUSTRY_IT_SPEND["Financial Services"]["typical"],
-        "it_max": INDUSTRY_IT_SPEND["Financial Services"]["max"],
-        "security_min": INDUSTRY_SECURITY_SPEND["Financial Services"]["min"],
-        "security_typical": INDUSTRY_SECURITY_SPEND["Financial Services"]["typical"],
-        "security_max": INDUSTRY_SECURITY_SPEND["Financial Services"]["max"],
-    },
-    "Healthcare": {
-        "it_min": INDUSTRY_IT_SPEND["Healthcare"]["min"],
-        "it_typical": INDUSTRY_IT_SPEND["Healthcare"]["typical"],
-        "it_max": INDUSTRY_IT_SPEND["Healthcare"]["max"],
-        "security_min": INDUSTRY_SECURITY_SPEND["Healthcare"]["min"],
-        "security_typical": INDUSTRY_SECURITY_SPEND["Healthcare"]["typical"],
-        "security_max": INDUSTRY_SECURITY_SPEND["Healthcare"]["max"],
-    },
-    "Retail": {
-        "it_min": INDUSTRY_IT_SPEND["Retail"]["min"],
-        "it_typical": INDUSTRY_IT_SPEND["Retail"]["typical"],
-        "it_max": INDUSTRY_IT_SPEND["Retail"]["max"],
-        "security_min": INDUSTRY_SECURITY_SPEND["Retail"]["min"],
-        "security_typical": INDUSTRY_SECURITY_SPEND["Retail"]["typical"],
-        "security_max": INDUSTRY_SECURITY_SPEND["Retail"]["max"],
-    },
-    "Technology": {
-        "it_min": INDUSTRY_IT_SPEND["Technology"]["min"],
-        "it_typical": INDUSTRY_IT_SPEND["Technology"]["typical"],
-        "it_max": INDUSTRY_IT_SPEND["Technology"]["max"],
-        "security_min": INDUSTRY_SECURITY_SPEND["Technology"]["min"],
-        "security_typical": INDUSTRY_SECURITY_SPEND["Technology"]["typical"],
-        "security_max": INDUSTRY_SECURITY_SPEND["Technology"]["max"],
-    },
-    "Manufacturing": {
-        "it_min": INDUSTRY_IT_SPEND["Manufacturing"]["min"],
-        "it_typical": INDUSTRY_IT_SPEND["Manufacturing"]["typical"],
-        "it_max": INDUSTRY_IT_SPEND["Manufacturing"]["max"],
-        "security_min": INDUSTRY_SECURITY_SPEND["Manufacturing"]["min"],
-        "security_typical": INDUSTRY_SECURITY_SPEND["Manufacturing"]["typical"],
-        "security_max": INDUSTRY_SECURITY_SPEND["Manufacturing"]["max"],
-    },
-    "Government/Public Sector": {
-        "it_min": INDUSTRY_IT_SPEND["Government/Public Sector"]["min"],
-        "it_typical": INDUSTRY_IT_SPEND["Government/Public Sector"]["typical"],
-        "it_max": INDUSTRY_IT_SPEND["Government/Public Sector"]["max"],
-        "security_min": INDUSTRY_SECURITY_SPEND["Government/Public Sector"]["min"],
-        "security_typical": INDUSTRY_SECURITY_SPEND["Government/Public Sector"]["typical"],
-        "security_max": INDUSTRY_SECURITY_SPEND["Government/Public Sector"]["max"],
-    },
-    "Education": {
-        "it_min": INDUSTRY_IT_SPEND["Education"]["min"],
-        "it_typical": INDUSTRY_IT_SPEND["Education"]["typical"],
-        "it_max": INDUSTRY_IT_SPEND["Education"]["max"],
-        "security_min": INDUSTRY_SECURITY_SPEND["Education"]["min"],
-        "security_typical": INDUSTRY_SECURITY_SPEND["Education"]["typical"],
-        "security_max": INDUSTRY_SECURITY_SPEND["Education"]["max"],
-    },
-    "Energy & Utilities": {
-        "it_min": INDUSTRY_IT_SPEND["Energy & Utilities"]["min"],
-        "it_typical": INDUSTRY_IT_SPEND["Energy & Utilities"]["typical"],
-        "it_max": INDUSTRY_IT_SPEND["Energy & Utilities"]["max"],
-        "security_min": INDUSTRY_SECURITY_SPEND["Energy & Utilities"]["min"],
-        "security_typical": INDUSTRY_SECURITY_SPEND["Energy & Utilities"]["typical"],
-        "security_max": INDUSTRY_SECURITY_SPEND["Energy & Utilities"]["max"],
-    },
-    "Transportation & Logistics": {
-        "it_min": INDUSTRY_IT_SPEND["Transportation & Logistics"]["min"],
-        "it_typical": INDUSTRY_IT_SPEND["Transportation & Logistics"]["typical"],
-        "it_max": INDUSTRY_IT_SPEND["Transportation & Logistics"]["max"],
-        "security_min": INDUSTRY_SECURITY_SPEND["Transportation & Logistics"]["min"],
-        "security_typical": INDUSTRY_SECURITY_SPEND["Transportation & Logistics"]["typical"],
-        "security_max": INDUSTRY_SECURITY_SPEND["Transportation & Logistics"]["max"],
-    },
-    "Weighted Average": {
-        "it_min": INDUSTRY_IT_SPEND["Weighted Average"]["min"],
-        "it_typical": INDUSTRY_IT_SPEND["Weighted Average"]["typical"],
-        "it_max": INDUSTRY_IT_SPEND["Weighted Average"]["max"],
-        "security_min": INDUSTRY_SECURITY_SPEND["Weighted Average"]["min"],
-        "security_typical": INDUSTRY_SECURITY_SPEND["Weighted Average"]["typical"],
-        "security_max": INDUSTRY_SECURITY_SPEND["Weighted Average"]["max"],
-    },
+# Map sector names to industry categories
+SECTOR_TO_INDUSTRY = {
+    "Agriculture, Forestry, Fishing and Hunting": "Weighted Average",
+    "Mining": "Energy & Utilities",
+    "Utilities": "Energy & Utilities",
+    "Construction": "Weighted Average",
+    "Manufacturing": "Manufacturing",
+    "Wholesale Trade": "Retail",
+    "Retail Trade": "Retail",
+    "Transportation and Warehousing": "Transportation & Logistics",
+    "Information": "Technology",
+    "Finance and Insurance": "Financial Services",
+    "Real Estate Rental and Leasing": "Weighted Average",
+    "Professional, Scientific, and Technical Services": "Technology",
+    "Management of Companies and Enterprises": "Weighted Average",
+    "Administrative and Support Services": "Weighted Average",
+    "Educational Services": "Education",
+    "Health Care and Social Assistance": "Healthcare",
+    "Arts, Entertainment, and Recreation": "Weighted Average",
+    "Accommodation and Food Services": "Weighted Average",
+    "Other Services": "Weighted Average",
+    "Public Administration": "Government/Public Sector"
 }
 
+# Preset industries read by sector-level results (every sector's industry plus the default)
+SECTOR_INDUSTRIES = tuple(sorted(set(SECTOR_TO_INDUSTRY.values()) | {DEFAULT_INDUSTRY}))
+
+def sector_preset_key():
+    """Preset cache key for sector-level results; changes only when one of SECTOR_INDUSTRIES changes"""
+    return PRESETS.dependency_key(SECTOR_INDUSTRIES)
+
 # Function to map sector names to industry categories for IT percentages
 def get_industry_it_percent(sector_name):
     """Get the IT budget percentage for a given sector"""
-    # Map sector names to industry categories
-    sector_to_industry = {
-        "Agriculture, Forestry, Fishing and Hunting": "Weighted Average",
-        "Mining": "Energy & Utilities",
-        "Utilities": "Energy & Utilities",
-        "Construction": "Weighted Average",
-        "Manufacturing": "Manufacturing",
-        "Wholesale Trade": "Retail",
-        "Retail Trade": "Retail",
-        "Transportation and Warehousing": "Transportation & Logistics",
-        "Information": "Technology",
-        "Finance and Insurance": "Financial Services",
-        "Real Estate Rental and Leasing": "Weighted Average",
-        "Professional, Scientific, and Technical Services": "Technology",
-        "Management of Companies and Enterprises": "Weighted Average",
-        "Administrative and Support Services": "Weighted Average",
-        "Educational Services": "Education",
-        "Health Care and Social Assistance": "Healthcare",
-        "Arts, Entertainment, and Recreation": "Weighted Average",
-        "Accommodation and Food Services": "Weighted Average",
-        "Other Services": "Weighted Average",
-        "Public Administration": "Government/Public Sector"
-    }
-    
     # Get the industry category for the sector
-    industry = sector_to_industry.get(sector_name, "Weighted Average")
+    industry = SECTOR_TO_INDUSTRY.get(sector_name, "Weighted Average")
     
     # Return the typical IT percentage for the industry
     return INDUSTRY_IT_SPEND[industry]["typical"]
@@ -216,32 +192,8 @@ def get_industry_it_percent(sector_name):
 # Function to map sector names to industry categories for security percentages
 def get_industry_security_percent(sector_name):
     """Get the security budget percentage for a given sector"""
-    # Map sector names to industry categories
-    sector_to_industry = {
-        "Agriculture, Forestry, Fishing and Hunting": "Weighted Average",
-        "Mining": "Energy & Utilities",
-        "Utilities": "Energy & Utilities",
-        "Construction": "Weighted Average",
-        "Manufacturing": "Manufacturing",
-        "Wholesale Trade": "Retail",
-        "Retail Trade": "Retail",
-        "Transportation and Warehousing": "Transportation & Logistics",
-        "Information": "Technology",
-        "Finance and Insurance": "Financial Services",
-        "Real Estate Rental and Leasing": "Weighted Average",
-        "Professional, Scientific, and Technical Services": "Technology",
-        "Management of Companies and Enterprises": "Weighted Average",
-        "Administrative and Support Services": "Weighted Average",
-        "Educational Services": "Education",
-        "Health Care and Social Assistance": "Healthcare",
-        "Arts, Entertainment, and Recreation": "Weighted Average",
-        "Accommodation and Food Services": "Weighted Average",
-        "Other Services": "Weighted Average",
-        "Public Administration": "Government/Public Sector"
-    }
-    
     # Get the industry category for the sector
-    industry = sector_to_industry.get(sector_name, "Weighted Average")
+    industry = SECTOR_TO_INDUSTRY.get(sector_name, "Weighted Average")
     
     # Return the typical security percentage for the industry
     return INDUSTRY_SECURITY_SPEND[industry]["typical"]
@@ -280,176 +232,66 @@ def initialize_session_state():
     if 'selected_industry' not in st.session_state:
         st.session_state.selected_industry = default_industry
     
-    # Initialize calculation history
-    if 'user_calculations' not in st.session_state:
-        st.session_state.user_calculations = []
+    # Initialize calculation history (saved calculations live in the scenario store)
+    if 'scenario_page' not in st.session_state:
+        st.session_state.scenario_page = 0
     if 'custom_industries' not in st.session_state:
-        st.session_state.custom_industries = {}
+        st.session_state.custom_industries = CustomIndustryTable()
+
+@track_cache(st.cache_resource)
+def get_vintage_store():
+    """NAICS vintage store with every release workbook ingested (unchanged releases are not re-parsed)"""
+    store = VintageStore(NAICS_REVENUE_TIERS)
+    store.ingest()
+    return store
+
+def selected_vintage():
+    """This session's NAICS vintage: the one picked in the sidebar, else the latest"""
+    store = get_vintage_store()
+    vintage = st.session_state.get(NAICS_VINTAGE_KEY) if get_script_run_ctx() is not None else None
+    return vintage if store.fingerprint(vintage) is not None else store.latest()
+
+def vintage_key(vintage=None):
+    """(vintage, content fingerprint) for caching anything derived from a vintage's counts"""
+    vintage = vintage or selected_vintage()
+    store = get_vintage_store()
+    return (vintage, store.fingerprint(vintage))
 
-def load_naics_revenue_data():
-    """Load and process NAICS revenue data from Excel file"""
+def load_naics_revenue_data(vintage=None):
+    """Sector summary of companies, revenue and tier counts for a NAICS vintage (default: this session's)"""
+    return _load_naics_revenue_data(vintage_key(vintage))
+
+@track_cache(st.cache_data, name="load_naics_revenue_data")
+@timed(DATA_LOAD_SECONDS, "load_naics_revenue_data")
+def _load_naics_revenue_data(key):
+    table = _load_naics_code_table(key)
+    if table is None:
+        return None
     try:
-        # Read the Excel file with the correct sheet name, skipping header rows
-        df = pd.read_excel('usbusinesses.xlsx', sheet_name='AnnualSales-Jan-2024', skiprows=2)
-        
-        # Extract NAICS codes (first column)
-        naics_codes = df.iloc[:, 0].astype(str)
-        
-        # Clean NAICS codes: remove whitespace and non-numeric characters
-        naics_codes = naics_codes.str.strip().str.replace(r'[^0-9]', '', regex=True)
+        # Company counts per sector summary tier column
+        tier_counts = table[list(NAICS_SUMMARY_COLUMNS)].rename(columns=NAICS_SUMMARY_COLUMNS)
+        tier_counts = tier_counts[list(NAICS_REVENUE_MULTIPLIERS)]
         
-        # Get the top-level NAICS code (first 2 digits)
-        # Make sure to handle any non-numeric values
-        df['top_naics'] = naics_codes.str.extract(r'^(\d{2})').fillna('00')
+        # Sector names from the top-level NAICS code (first 2 digits); sectors like Manufacturing span 31-33
+        sector_names = table.index.str[:2].map(NAICS_TO_SECTOR).fillna("Other")
+        tier_counts = tier_counts.groupby(sector_names.to_numpy()).sum()
         
-        # Define the revenue tier columns (columns 3-11)
-        # Note: Column 2 is "Uncoded records" which we need to include
-        revenue_columns = [
-            'uncoded_records',  # Uncoded records (column 2)
-            'under_500k',       # Under 500,000
-            '500k_1m',          # 500,000 - 999,999
-            '1m_2.5m',          # 1,000,000 - 2,499,999
-            '2.5m_5m',          # 2,500,000 - 4,999,999
-            '5m_10m',           # 5,000,000 - 9,999,999
-            '10m_100m',         # 10,000,000 - 99,999,999
-            '100m_500m',        # 100,000,000 - 499,999,999
-            '500m_1b',          # 500,000,000 - 999,999,999
-            '1b_plus'           # 1,000,000,000+
-        ]
+        uncoded = tier_counts['uncoded_records']
+        companies = tier_counts.sum(axis=1)
+        sector_summary = pd.DataFrame({
+            'sector_name': tier_counts.index,
+            'Companies': companies.to_numpy(),
+            'CodedCompanies': (companies - uncoded).to_numpy(),
+            'UncodedCompanies': uncoded.to_numpy(),
+            # Revenue contribution of each tier at its assumed average revenue
+            'Revenue': tier_counts.to_numpy() @ np.array(list(NAICS_REVENUE_MULTIPLIERS.values()), dtype=float)
+        })
         
-        # Map the revenue columns from the Excel file to our defined columns
-        excel_columns = [
-            'Uncoded records',
-            'Under 500,000',
-            '500,000 - 999,999',
-            '1,000,000 - 2,499,999',
-            '2,500,000 - 4,999,999',
-            '5,000,000 - 9,999,999',
-            '10,000,000 - 99,999,999',
-            '100,000,000 - 499,999,999',
-            '500,000,000 - 999,999,999',
-            '1,000,000,000+'
-        ]
-        
-        # Map Excel columns to our defined columns
-        for i, (col_name, excel_col) in enumerate(zip(revenue_columns, excel_columns)):
-            if excel_col in df.columns:
-                # Convert to numeric, replacing any non-numeric values with 0
-                df[col_name] = pd.to_numeric(df[excel_col], errors='coerce').fillna(0)
-            else:
-                df[col_name] = 0
-        
-        # Calculate revenue multipliers (in millions of dollars)
-        revenue_multipliers = {
-            'uncoded_records': 0.25,  # Assume uncoded records are small businesses (under 500k)
-            'under_500k': 0.25,       # midpoint of 0-500k (in millions)
-            '500k_1m': 0.75,          # midpoint of 500k-1m (in millions)
-            '1m_2.5m': 1.75,          # midpoint of 1m-2.5m (in millions)
-            '2.5m_5m': 3.75,          # midpoint of 2.5m-5m (in millions)
-            '5m_10m': 7.5,            # midpoint of 5m-10m (in millions)
-            '10m_100m': 55,           # midpoint of 10m-100m (in millions)
-            '100m_500m': 300,         # midpoint of 100m-500m (in millions)
-            '500m_1b': 750,           # midpoint of 500m-1b (in millions)
-            '1b_plus': 1500           # conservative estimate for 1b+ (in millions)
-        }
-        
-        # Sum all businesses by NAICS code (first 2 digits)
-        # This uses the raw data directly without any aggregation steps
-        sector_data = {}
-        
-        # Process each row in the dataframe
-        for idx, row in df.iterrows():
-            naics = row['top_naics']
-            if naics not in sector_data:
-                sector_data[naics] = {
-                    'Companies': 0, 
-                    'CodedCompanies': 0,
-                    'UncodedCompanies': 0,
-                    'Revenue': 0.0
-                }
-            
-            # Sum the companies across all revenue tiers
-            for col in revenue_columns:
-                if col in df.columns:
-                    companies = row[col]
-                    
-                    # Track coded vs uncoded companies separately
-                    if col == 'uncoded_records':
-                        sector_data[naics]['UncodedCompanies'] += companies
-                    else:
-                        sector_data[naics]['CodedCompanies'] += companies
-                    
-                    # Add to total companies
-                    sector_data[naics]['Companies'] += companies
-                    
-                    # Calculate revenue contribution
-                    sector_data[naics]['Revenue'] += companies * revenue_multipliers[col]
-        
-        # Convert the dictionary to a DataFrame
-        naics_summary = pd.DataFrame([
-            {
-                'top_naics': k, 
-                'Companies': v['Companies'], 
-                'CodedCompanies': v['CodedCompanies'],
-                'UncodedCompanies': v['UncodedCompanies'],
-                'Revenue': v['Revenue']
-            }
-            for k, v in sector_data.items()
-        ])
-        
-        # Map to sector names
-        naics_to_sector = {
-            "11": "Agriculture, Forestry, Fishing and Hunting",
-            "21": "Mining",
-            "22": "Utilities",
-            "23": "Construction",
-            "31": "Manufacturing",
-            "32": "Manufacturing",
-            "33": "Manufacturing",
-            "42": "Wholesale Trade",
-            "44": "Retail Trade",
-            "45": "Retail Trade",
-            "48": "Transportation and Warehousing",
-            "49": "Transportation and Warehousing",
-            "51": "Information",
-            "52": "Finance and Insurance",
-            "53": "Real Estate Rental and Leasing",
-            "54": "Professional, Scientific, and Technical Services",
-            "55": "Management of Companies and Enterprises",
-            "56": "Administrative and Support Services",
-            "61": "Educational Services",
-            "62": "Health Care and Social Assistance",
-            "71": "Arts, Entertainment, and Recreation",
-            "72": "Accommodation and Food Services",
-            "81": "Other Services",
-            "92": "Public Administration"
-        }
-        
-        # Add sector names
-        naics_summary['sector_name'] = naics_summary['top_naics'].map(naics_to_sector)
-        
-        # Fill any missing sector names with "Other"
-        naics_summary['sector_name'] = naics_summary['sector_name'].fillna("Other")
-        
-        # Combine rows with the same sector name (e.g., Manufacturing for 31, 32, 33)
-        sector_summary = naics_summary.groupby('sector_name').agg({
-            'Companies': 'sum',
-            'CodedCompanies': 'sum',
-            'UncodedCompanies': 'sum',
-            'Revenue': 'sum'
-        }).reset_index()
+        # Company counts per revenue tier column, so TAM assumptions can be varied without reloading
+        sector_summary = sector_summary.join(tier_counts, on='sector_name')
         
         # Add the top_naics column back for reference
-        sector_summary['top_naics'] = sector_summary['sector_name'].map({v: k for k, v in naics_to_sector.items()})
-        
-        # For sectors with multiple NAICS codes (like Manufacturing), use the first one
-        for sector in sector_summary['sector_name']:
-            if sector_summary[sector_summary['sector_name'] == sector].shape[0] > 0 and pd.isna(sector_summary.loc[sector_summary['sector_name'] == sector, 'top_naics'].iloc[0]):
-                for code, name in naics_to_sector.items():
-                    if name == sector:
-                        sector_summary.loc[sector_summary['sector_name'] == sector, 'top_naics'] = code
-                        break
-        
+        sector_summary['top_naics'] = sector_summary['sector_name'].map({v: k for k, v in NAICS_TO_SECTOR.items()})
         return sector_summary
     except Exception as e:
         st.error(f"Error loading NAICS data: {str(e)}")
@@ -457,6 +299,34 @@ def load_naics_revenue_data():
         st.error(traceback.format_exc())
         return None
 
+def load_naics_code_table(vintage=None):
+    """Description and company counts per revenue tier for every NAICS code in a vintage (default: this session's)"""
+    return _load_naics_code_table(vintage_key(vintage))
+
+@track_cache(st.cache_data, name="load_naics_code_table")
+@timed(DATA_LOAD_SECONDS, "load_naics_code_table")
+def _load_naics_code_table(key):
+    vintage, _ = key
+    try:
+        if vintage is None:
+            raise ValueError(f"No NAICS workbook with a revenue tier sheet matches {NAICS_SOURCE_GLOB}")
+        snapshot = get_vintage_store().snapshot(vintage)
+        table = pd.DataFrame(snapshot.counts.astype(float), columns=list(NAICS_REVENUE_TIERS),
+                             index=pd.Index(snapshot.codes, name="NAICS Code"))
+        table.insert(0, "Description", snapshot.descriptions)
+        return table
+    except Exception as e:
+        st.error(f"Error loading NAICS code data: {str(e)}")
+        return None
+
+def load_naics_tier_cube(vintage=None):
+    """Company counts per NAICS sector (rows) and revenue tier column for a vintage"""
+    table = load_naics_code_table(vintage)
+    if table is None:
+        return None
+    sectors = table.index.str[:2].map(NAICS_TO_SECTOR).fillna("Other")
+    return table[list(NAICS_REVENUE_TIERS)].groupby(sectors.to_numpy()).sum()
+
 # Generate revenue array for charts
 def generate_revenue_array(max_chart_revenue=500):
     revenue_array = np.arange(50, max_chart_revenue + 100, 100).astype(int)
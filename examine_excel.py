@@ -1,33 +1,38 @@
-import pandas as pd
 import sys
+import openpyxl
+from data import NAICS_REVENUE_TIERS
+from naics_vintages import HEADER_SCAN_ROWS, detect_layout, read_sheet, vintage_id
 
 def examine_excel_file(file_path):
-    """Examine the structure of an Excel file and print detailed information"""
+    """Print the detected NAICS layout of every sheet in an Excel file"""
     try:
-        # Get all sheet names
-        xls = pd.ExcelFile(file_path)
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
         print(f"Excel file: {file_path}")
-        print(f"Available sheets: {xls.sheet_names}")
-        
-        # Examine the target sheet
-        sheet_name = 'AnnualSales-Jan-2024'
-        print(f"\nExamining sheet: {sheet_name}")
-        
-        # Try different skiprows values
-        for skip_rows in [0, 1, 2, 3, 4]:
-            print(f"\nReading with skiprows={skip_rows}:")
-            try:
-                df = pd.read_excel(file_path, sheet_name=sheet_name, skiprows=skip_rows)
-                print(f"  Shape: {df.shape}")
-                print(f"  Columns: {df.columns.tolist()}")
-                print(f"  First few rows:")
-                print(df.head(3).to_string())
-            except Exception as e:
-                print(f"  Error: {str(e)}")
-        
+        print(f"Available sheets: {workbook.sheetnames}")
+
+        for sheet_name in workbook.sheetnames:
+            sheet = workbook[sheet_name]
+            header_rows = list(sheet.iter_rows(max_row=HEADER_SCAN_ROWS, values_only=True))
+            layout = detect_layout(sheet_name, header_rows, NAICS_REVENUE_TIERS)
+            print(f"\nSheet: {sheet_name}")
+            if layout is None:
+                print("  No revenue tier header found in the first "
+                      f"{HEADER_SCAN_ROWS} rows (not a NAICS revenue release)")
+                continue
+            codes, descriptions, counts = read_sheet(
+                sheet.iter_rows(min_row=layout.header_row + 2, values_only=True), layout
+            )
+            print(f"  Vintage: {vintage_id(sheet_name, file_path)}")
+            print(f"  Header row: {layout.header_row + 1} (skiprows={layout.header_row})")
+            print(f"  Code column: {layout.code_column}, description column: {layout.description_column}")
+            print(f"  Tier columns: {dict(zip(NAICS_REVENUE_TIERS, layout.tier_columns))}")
+            print(f"  NAICS code rows: {len(codes):,}, companies: {counts.sum():,}")
+            for code, description in list(zip(codes, descriptions))[:3]:
+                print(f"    {code} {description}")
+        workbook.close()
     except Exception as e:
         print(f"Failed to examine Excel file: {str(e)}")
 
 if __name__ == "__main__":
-    file_path = "usbusinesses.xlsx"
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "usbusinesses.xlsx"
     examine_excel_file(file_path)
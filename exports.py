@@ -0,0 +1,126 @@
+import tempfile
+import numpy as np
+import pandas as pd
+import streamlit as st
+from calculations import budget_table_values
+from metrics import track_cache
+
+# Rows generated and written per chunk (one Parquet row group per chunk)
+EXPORT_CHUNK_ROWS = 100_000
+
+# Excel's hard limit on rows per worksheet (including the header row)
+XLSX_MAX_ROWS = 1_048_576
+
+# Export formats: file extension and MIME type
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/octet-stream"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+# Exports larger than this spill from memory to a temporary file while being written
+SPOOL_MAX_BYTES = 16 * 1024 * 1024
+
+
+def iter_budget_table_chunks(revenue_array, current_it, current_security, calculations=None,
+                             chunk_rows=EXPORT_CHUNK_ROWS):
+    """Generate the numeric budget table in row chunks, computed from the revenue grid slice by slice"""
+    revenue = np.asarray(revenue_array, dtype=float)
+    revenue = revenue[revenue > 0]
+    for start in range(0, len(revenue), chunk_rows):
+        columns = budget_table_values(revenue[start:start + chunk_rows], current_it, current_security, calculations)
+        chunk = {"Annual Revenue ($M)": columns.pop("Annual Revenue"), "IT Budget (%)": current_it}
+        chunk.update({f"{label} ($M)": values for label, values in columns.items()})
+        yield pd.DataFrame(chunk)
+
+
+def iter_frame_chunks(df, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Split an existing DataFrame into row chunks"""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def write_csv(chunks, fileobj):
+    """Write chunks as CSV, header from the first chunk"""
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pacsv.CSVWriter(fileobj, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_parquet(chunks, fileobj):
+    """Write chunks as Parquet, one row group per chunk"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(fileobj, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_xlsx(chunks, fileobj):
+    """Write chunks as XLSX with openpyxl's constant-memory write-only mode"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet, header, rows_in_sheet = None, None, 0
+    for chunk in chunks:
+        if header is None:
+            header = list(chunk.columns)
+        for row in chunk.itertuples(index=False, name=None):
+            # Start a continuation sheet when Excel's row limit is reached
+            if sheet is None or rows_in_sheet >= XLSX_MAX_ROWS:
+                sheet = workbook.create_sheet(f"Export {len(workbook.worksheets) + 1}")
+                sheet.append(header)
+                rows_in_sheet = 1
+            sheet.append(row)
+            rows_in_sheet += 1
+    if sheet is None:
+        workbook.create_sheet("Export 1")
+    workbook.save(fileobj)
+
+
+WRITERS = {"CSV": write_csv, "Parquet": write_parquet, "Excel": write_xlsx}
+
+
+def export_bytes(chunks, fmt):
+    """Stream chunks through the format's writer and return the finished file"""
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+        WRITERS[fmt](chunks, spool)
+        spool.seek(0)
+        return spool.read()
+
+
+@track_cache(st.cache_data, max_entries=16, show_spinner=False)
+def export_budget_table(revenue_array, current_it, current_security, calc_it, calc_security, calc_offset, fmt):
+    """Budget table export, cached until the inputs or the visible saved calculations change"""
+    calculations = None
+    if len(calc_it) > 0:
+        from scenario_store import ScenarioPage
+        calculations = ScenarioPage(
+            [(0, "", it, sec, 0.0, 0.0) for it, sec in zip(calc_it, calc_security)],
+            offset=calc_offset
+        )
+    return export_bytes(iter_budget_table_chunks(revenue_array, current_it, current_security, calculations), fmt)
+
+
+@track_cache(st.cache_data, max_entries=16, show_spinner=False)
+def export_frame(df, fmt):
+    """Export of an already computed table, cached on its contents"""
+    return export_bytes(iter_frame_chunks(df), fmt)
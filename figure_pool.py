@@ -0,0 +1,223 @@
+import multiprocessing.context
+import os
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+import streamlit.logger
+from metrics import CACHE_EVICTIONS, FIGURE_BUILD_SECONDS
+
+# CPUs this process may run on (respects taskset / container CPU pinning where supported)
+AVAILABLE_CPUS = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+# Worker processes building figures; with 1 or fewer, figures are built inline in the script thread
+FIGURE_POOL_WORKERS = int(os.environ.get("FIGURE_POOL_WORKERS", min(4, AVAILABLE_CPUS)))
+
+# Built figures kept for reuse across reruns and sessions
+MAX_CACHED_FIGURES = 64
+
+# Charts waiting for their figures in the current script run (per script thread)
+_deferred = threading.local()
+
+# Serializes worker starts, which briefly swap out the process-wide __main__ module
+_main_swap_lock = threading.Lock()
+
+
+class _WorkerProcess(multiprocessing.context.SpawnProcess):
+    """Spawned worker that does not re-run the app script
+
+    Streamlit runs the app script as __main__, and spawned processes re-run __main__ on startup.
+    """
+
+    def start(self):
+        # Script runs of other sessions set __main__ concurrently: only put ours back if it is still
+        # the placeholder, so a newer session's module is never replaced by a stale one
+        with _main_swap_lock:
+            main = sys.modules["__main__"]
+            placeholder = sys.modules["__main__"] = types.ModuleType("__main__")
+            try:
+                super().start()
+            finally:
+                if sys.modules.get("__main__") is placeholder:
+                    sys.modules["__main__"] = main
+
+
+class _WorkerContext(multiprocessing.context.SpawnContext):
+    Process = _WorkerProcess
+
+
+def _init_worker(template):
+    # Workers start from a fresh interpreter, so use the app's default template
+    pio.templates.default = template
+    # Builder modules are imported outside a Streamlit runtime; skip its warnings about that
+    streamlit.logger.set_log_level("error")
+
+
+def _build(builder, args, kwargs):
+    start = time.perf_counter()
+    fig = builder(*args, **kwargs)
+    return fig.to_dict(), time.perf_counter() - start
+
+
+@st.cache_resource
+def get_figure_pool():
+    """Process-wide pool of figure builder processes (None when figures are built inline)"""
+    if FIGURE_POOL_WORKERS <= 1:
+        return None
+    return ProcessPoolExecutor(FIGURE_POOL_WORKERS, mp_context=_WorkerContext(),
+                               initializer=_init_worker, initargs=(pio.templates.default,))
+
+
+class FigureFuture(Future):
+    """Future of a built figure that keeps its task, so it can be rebuilt inline if the pool breaks"""
+
+    def __init__(self, builder, args, kwargs):
+        super().__init__()
+        self.task = (builder, args, kwargs)
+
+    def build_inline(self):
+        builder, args, kwargs = self.task
+        start = time.perf_counter()
+        try:
+            return builder(*args, **kwargs)
+        finally:
+            FIGURE_BUILD_SECONDS.observe(time.perf_counter() - start, builder.__name__)
+
+    def figure(self):
+        try:
+            return self.result()
+        except BrokenProcessPool:
+            get_figure_pool.clear()
+            return self.build_inline()
+        except CancelledError:
+            # Cancelled by an earlier, interrupted run
+            return self.build_inline()
+
+
+def submit_figure(builder, *args, **kwargs):
+    """Start building a figure and return a FigureFuture for it
+
+    The builder must be a module-level function of plain data: it runs in a worker process, and the
+    figure comes back as a dict that is rebuilt here without re-validation.
+    """
+    future = FigureFuture(builder, args, kwargs)
+    pool = get_figure_pool()
+    if pool is None:
+        try:
+            future.set_result(future.build_inline())
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def done(built):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            spec, elapsed = built.result()
+        except Exception as e:
+            future.set_exception(e)
+            return
+        FIGURE_BUILD_SECONDS.observe(elapsed, builder.__name__)
+        future.set_result(go.Figure(spec, _validate=False))
+
+    try:
+        built = pool.submit(_build, builder, args, kwargs)
+    except BrokenProcessPool:
+        get_figure_pool.clear()
+        future.set_result(future.build_inline())
+        return future
+    # Charts of an interrupted rerun are cancelled so their builds don't queue up
+    future.add_done_callback(lambda f: f.cancelled() and built.cancel())
+    built.add_done_callback(done)
+    return future
+
+
+class FigureCache:
+    """Built figures by (builder, key), least recently used evicted first"""
+
+    def __init__(self, max_entries=MAX_CACHED_FIGURES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            figure = self._entries.get(key)
+            if figure is not None:
+                self._entries.move_to_end(key)
+            return figure
+
+    def put(self, key, figure):
+        with self._lock:
+            self._entries[key] = figure
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                CACHE_EVICTIONS.inc("figures")
+
+
+@st.cache_resource
+def get_figure_cache():
+    """Process-wide cache of built figures"""
+    return FigureCache()
+
+
+def cached_figure(key, builder, *args, **kwargs):
+    """The cached figure for key, else a FigureFuture that caches its figure once built
+
+    The key must cover everything the figure depends on. Only built figures are cached, never
+    futures, so a build cancelled by an interrupted run is simply started again by the next one.
+    """
+    cache = get_figure_cache()
+    key = (builder.__name__, key)
+    figure = cache.get(key)
+    if figure is not None:
+        return figure
+    future = submit_figure(builder, *args, **kwargs)
+
+    def store(built):
+        if not built.cancelled() and built.exception() is None:
+            cache.put(key, built.result())
+
+    future.add_done_callback(store)
+    return future
+
+
+def plotly_chart(figure, **options):
+    """st.plotly_chart for a figure or a FigureFuture
+
+    Inside deferred_charts() the chart's place on the page is reserved now and the chart is drawn
+    once its figure is built; elsewhere this waits for the figure.
+    """
+    if not isinstance(figure, FigureFuture):
+        st.plotly_chart(figure, **options)
+        return
+    charts = getattr(_deferred, "charts", None)
+    if charts is None:
+        st.plotly_chart(figure.figure(), **options)
+    else:
+        charts.append((st.empty(), figure, options))
+
+
+@contextmanager
+def deferred_charts():
+    """Draw the charts requested inside the block at its end, each as soon as its figure is ready"""
+    _deferred.charts = []
+    try:
+        yield
+        pending = {figure: (placeholder, options) for placeholder, figure, options in _deferred.charts}
+        for figure in as_completed(pending):
+            placeholder, options = pending[figure]
+            placeholder.plotly_chart(figure.figure(), **options)
+    finally:
+        # A rerun or stop leaves figures unbuilt; drop them
+        for _, figure, _ in _deferred.charts:
+            figure.cancel()
+        _deferred.charts = None
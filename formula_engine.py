@@ -0,0 +1,223 @@
+import os
+import re
+from graphlib import TopologicalSorter, CycleError
+import numpy as np
+import streamlit as st
+from openpyxl import load_workbook
+from openpyxl.formula import Tokenizer
+from openpyxl.formula.tokenizer import Token
+from openpyxl.utils import column_index_from_string, get_column_letter
+from metrics import WORKBOOK_PARSES, track_cache
+
+# Workbook holding the original spreadsheet assumption model
+ASSUMPTION_MODEL_PATH = "calculator.xlsx"
+ASSUMPTION_MODEL_SHEET = "Assumption Calculation"
+
+CELL_REF = re.compile(r"^\$?([A-Z]{1,3})\$?(\d+)$")
+
+COMPARISON_OPERATORS = {"=": "==", "<>": "!=", "<": "<", ">": ">", "<=": "<=", ">=": ">="}
+
+
+class FormulaError(ValueError):
+    """Raised when a workbook formula can't be compiled into a vectorized expression"""
+
+
+def _xl_sum(*args):
+    return sum(args[1:], args[0])
+
+
+def _xl_min(*args):
+    return np.minimum.reduce(np.broadcast_arrays(*args))
+
+
+def _xl_max(*args):
+    return np.maximum.reduce(np.broadcast_arrays(*args))
+
+
+def _xl_average(*args):
+    return _xl_sum(*args) / len(args)
+
+
+# Excel functions supported in compiled formulas
+FUNCTIONS = {
+    "SUM": _xl_sum,
+    "MIN": _xl_min,
+    "MAX": _xl_max,
+    "AVERAGE": _xl_average,
+    "ABS": np.abs,
+    "ROUND": lambda value, digits=0: np.round(value, int(digits)),
+    "IF": lambda condition, if_true, if_false=0: np.where(condition, if_true, if_false),
+}
+
+
+def _number(value):
+    """Parse a header or parameter cell as a number, or None"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    try:
+        return float(str(value).replace(",", "").strip())
+    except (TypeError, ValueError):
+        return None
+
+
+class AssumptionModel:
+    """Spreadsheet assumption model compiled into one vectorized function over the revenue axis
+
+    Layout: row 1 holds the revenue axis in its numeric header columns; every other row has a
+    label (column A), an optional scalar parameter (e.g. column B) and one formula per axis column.
+    Formulas may reference their own axis column in any row and any parameter cell.
+    """
+
+    def __init__(self, labels, parameters, parameter_cells, axis_values, source, function):
+        self.labels = labels
+        self.parameters = parameters
+        self.parameter_cells = parameter_cells
+        self.axis_values = axis_values
+        self.source = source
+        self._function = function
+
+    def evaluate(self, revenue=None, overrides=None):
+        """Evaluate every row over a revenue array; overrides are keyed by row label or parameter cell"""
+        revenue = self.axis_values if revenue is None else np.asarray(revenue, dtype=float)
+        params = dict(self.parameters)
+        for key, value in (overrides or {}).items():
+            cell = self.parameter_cells.get(key, key)
+            if cell not in params:
+                raise KeyError(f"Unknown model parameter: {key}")
+            params[cell] = float(value)
+        return self._function(revenue, params)
+
+    def parameter(self, label):
+        """Current parameter value of a row"""
+        return self.parameters[self.parameter_cells[label]]
+
+
+def _compile_formula(formula, row, column, axis_columns, axis_row, parameter_columns):
+    """Translate one cell formula into a Python expression over row vectors and parameters"""
+    parts, dependencies = [], set()
+    for token in Tokenizer(formula).items:
+        if token.type == Token.WSPACE:
+            continue
+        if token.type == Token.OPERAND and token.subtype == Token.RANGE:
+            match = CELL_REF.match(token.value.upper())
+            if not match:
+                raise FormulaError(f"Unsupported reference {token.value} in {get_column_letter(column)}{row}")
+            ref_column = column_index_from_string(match.group(1))
+            ref_row = int(match.group(2))
+            if ref_column in axis_columns:
+                if ref_column != column:
+                    raise FormulaError(f"Cross-column reference {token.value} in {get_column_letter(column)}{row}")
+                if ref_row == axis_row:
+                    parts.append("revenue")
+                else:
+                    parts.append(f"r{ref_row}")
+                    dependencies.add(ref_row)
+            elif ref_column in parameter_columns:
+                parts.append(f"params[{match.group(1) + match.group(2)!r}]")
+            else:
+                raise FormulaError(f"Reference {token.value} outside the model in {get_column_letter(column)}{row}")
+        elif token.type == Token.OPERAND and token.subtype == Token.NUMBER:
+            parts.append(repr(float(token.value)))
+        elif token.type == Token.OPERAND and token.subtype == Token.LOGICAL:
+            parts.append("True" if token.value.upper() == "TRUE" else "False")
+        elif token.type == Token.FUNC and token.subtype == Token.OPEN:
+            name = token.value[:-1].upper()
+            if name not in FUNCTIONS:
+                raise FormulaError(f"Unsupported function {name} in {get_column_letter(column)}{row}")
+            parts.append(f"fn_{name}(")
+        elif token.type in (Token.FUNC, Token.PAREN):
+            parts.append(token.value)
+        elif token.type == Token.SEP and token.subtype == Token.ARG:
+            parts.append(", ")
+        elif token.type == Token.OP_IN:
+            if token.value in COMPARISON_OPERATORS:
+                parts.append(f" {COMPARISON_OPERATORS[token.value]} ")
+            elif token.value in "+-*/^":
+                parts.append(" ** " if token.value == "^" else f" {token.value} ")
+            else:
+                raise FormulaError(f"Unsupported operator {token.value} in {get_column_letter(column)}{row}")
+        elif token.type == Token.OP_PRE:
+            parts.append(token.value)
+        elif token.type == Token.OP_POST and token.value == "%":
+            parts.append(" / 100")
+        else:
+            raise FormulaError(f"Unsupported token {token.value!r} in {get_column_letter(column)}{row}")
+    return "".join(parts), frozenset(dependencies)
+
+
+def compile_assumption_sheet(worksheet, axis_row=1, label_column=1):
+    """Compile an assumption worksheet into an AssumptionModel"""
+    header = {cell.column: cell.value for cell in worksheet[axis_row] if cell.value is not None}
+    axis = {column: _number(value) for column, value in header.items() if column != label_column}
+    axis_columns = sorted(column for column, value in axis.items() if value is not None)
+    if not axis_columns:
+        raise FormulaError(f"No numeric revenue axis found in row {axis_row}")
+    parameter_columns = {column for column in range(1, worksheet.max_column + 1)
+                         if column not in axis_columns and column != label_column}
+
+    labels, parameters, parameter_cells, expressions, graph = {}, {}, {}, {}, {}
+    for row in worksheet.iter_rows(min_row=axis_row + 1):
+        row_number = row[0].row
+        cells = {cell.column: cell.value for cell in row if cell.value is not None}
+        if not cells:
+            continue
+        label = str(cells.get(label_column, f"Row {row_number}")).strip()
+        labels[row_number] = label
+
+        # Scalar parameter cells (constants) for this row
+        for column in parameter_columns:
+            value = _number(cells.get(column))
+            if value is not None:
+                cell_name = f"{get_column_letter(column)}{row_number}"
+                parameters[cell_name] = value
+                parameter_cells.setdefault(label, cell_name)
+
+        # One formula per axis column; they must all compile to the same vector expression
+        compiled = set()
+        for column in axis_columns:
+            value = cells.get(column)
+            if isinstance(value, str) and value.startswith("="):
+                compiled.add(_compile_formula(value, row_number, column, axis_columns, axis_row, parameter_columns))
+            elif _number(value) is not None:
+                compiled.add((f"np.full(revenue.shape, {_number(value)!r})", frozenset()))
+            else:
+                compiled.add(("np.zeros(revenue.shape)", frozenset()))
+        if len(compiled) > 1:
+            raise FormulaError(f"Row {row_number} ({label}) uses different formulas across revenue columns")
+        expression, dependencies = compiled.pop()
+        expressions[row_number] = expression
+        graph[row_number] = set(dependencies)
+
+    # Order rows so every row is computed after the rows it references
+    try:
+        order = list(TopologicalSorter(graph).static_order())
+    except CycleError as e:
+        raise FormulaError(f"Circular reference between rows {e.args[1]}")
+    missing = [row for row in order if row not in expressions]
+    if missing:
+        raise FormulaError(f"Formulas reference empty rows {missing}")
+
+    # Generate and compile a single function evaluating the whole model
+    lines = ["def evaluate(revenue, params):"]
+    lines += [f"    r{row} = {expressions[row]}" for row in order]
+    lines.append("    return {" + ", ".join(f"{labels[row]!r}: r{row}" for row in sorted(expressions)) + "}")
+    source = "\n".join(lines)
+    namespace = {"np": np, **{f"fn_{name}": function for name, function in FUNCTIONS.items()}}
+    exec(compile(source, f"<{worksheet.title}>", "exec"), namespace)
+
+    axis_values = np.array([axis[column] for column in axis_columns], dtype=float)
+    return AssumptionModel(list(labels.values()), parameters, parameter_cells, axis_values, source,
+                           namespace["evaluate"])
+
+
+def load_assumption_model(path=ASSUMPTION_MODEL_PATH, sheet_name=ASSUMPTION_MODEL_SHEET):
+    """Load and compile an assumption workbook sheet"""
+    WORKBOOK_PARSES.inc(os.path.basename(path))
+    workbook = load_workbook(path, data_only=False)
+    return compile_assumption_sheet(workbook[sheet_name])
+
+
+@track_cache(st.cache_resource)
+def get_assumption_model(path=ASSUMPTION_MODEL_PATH, sheet_name=ASSUMPTION_MODEL_SHEET):
+    """Compiled assumption model, loaded once per process"""
+    return load_assumption_model(path, sheet_name)
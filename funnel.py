@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+from data import NAICS_REVENUE_TIERS
+from market_solver import required_revenue
+from preset_registry import PRESETS
+
+# Employee band edges offered for the company size filter (0 and inf leave that side open)
+EMPLOYEE_BAND_EDGES = {
+    "0": 0, "10": 10, "50": 50, "100": 100, "250": 250, "500": 500,
+    "1,000": 1_000, "5,000": 5_000, "10,000": 10_000, "No limit": float("inf")
+}
+
+# Revenue per employee ($K) used to turn an employee band into a revenue window
+DEFAULT_REVENUE_PER_EMPLOYEE = 250
+
+# Default penetration assumptions (%)
+DEFAULT_REACHABLE_SHARE = 20.0
+DEFAULT_WIN_RATE = 10.0
+
+TIER_LABELS = [tier for tier in NAICS_REVENUE_TIERS if tier != "Uncoded records"]
+
+
+class StageResult:
+    """Companies and revenue ($M) per sector and tier after a stage, plus the revenue window ($M) per sector"""
+
+    def __init__(self, companies, revenue, window):
+        self.companies = companies
+        self.revenue = revenue
+        self.window = window
+
+
+def _ratio(numerator, denominator):
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+
+def sector_stage(funnel, upstream, sectors):
+    """Keep only the selected sectors"""
+    mask = np.isin(funnel.sectors, list(sectors)).astype(float)[:, None]
+    return mask, mask, upstream.window
+
+
+def tier_stage(funnel, upstream, tiers):
+    """Keep only the selected revenue tiers"""
+    mask = np.isin(TIER_LABELS, list(tiers)).astype(float)[None, :]
+    return mask, mask, upstream.window
+
+
+def _window_stage(funnel, upstream, low, high):
+    """Narrow the revenue window and keep each cell's share of companies and revenue inside it"""
+    low = np.maximum(upstream.window[0], low)
+    high = np.minimum(upstream.window[1], high)
+    before_companies, before_revenue = funnel.distribution.tier_between(*upstream.window)
+    after_companies, after_revenue = funnel.distribution.tier_between(low, high)
+    return _ratio(after_companies, before_companies), _ratio(after_revenue, before_revenue), (low, high)
+
+
+def company_size_stage(funnel, upstream, min_employees, max_employees, revenue_per_employee):
+    """Keep companies whose revenue matches the employee band at the given revenue per employee ($K)"""
+    return _window_stage(funnel, upstream, min_employees * revenue_per_employee / 1000,
+                         max_employees * revenue_per_employee / 1000)
+
+
+def price_fit_stage(funnel, upstream, price, max_budget_share):
+    """Keep companies that can fit the price ($) in the given share of their security budget"""
+    it_pct, sec_pct = funnel.percentages()
+    return _window_stage(funnel, upstream, required_revenue(price, max_budget_share, it_pct, sec_pct), np.inf)
+
+
+def penetration_stage(funnel, upstream, share):
+    """Keep a flat share (%) of the companies, e.g. those reachable through current channels"""
+    weight = np.asarray(share, dtype=float) / 100
+    return weight, weight, upstream.window
+
+
+# Ordered funnel stages: (name, market reached after the stage, stage function)
+FUNNEL_STAGES = [
+    ("Sectors", "SAM", sector_stage),
+    ("Revenue Tiers", "SAM", tier_stage),
+    ("Company Size", "SAM", company_size_stage),
+    ("Price Fit", "SAM", price_fit_stage),
+    ("Reachable Share", "SOM", penetration_stage),
+    ("Win Rate", "SOM", penetration_stage)
+]
+
+
+class MarketFunnel:
+    """TAM -> SAM -> SOM over a sector x revenue tier cube of companies and revenue
+
+    Each stage multiplies the cube by company and revenue weights (masks for sector and tier filters,
+    in-window shares for revenue filters, flat shares for penetration). Results are kept after every
+    stage, so changing one stage's parameters recomputes only that stage and the ones after it.
+    """
+
+    def __init__(self, solver):
+        self.sectors = list(solver.segments)
+        self.industries = list(solver.industries)
+        self.distribution = solver.distribution
+        self.tam = StageResult(solver.distribution.tier_counts,
+                               solver.distribution.tier_between(0, np.inf)[1],
+                               (np.zeros(len(self.sectors)), np.full(len(self.sectors), np.inf)))
+        self._params = []
+        self._results = []
+        self.recomputed = 0
+
+    def percentages(self):
+        """Typical IT and security percentages of each sector's industry (from the live preset registry)"""
+        presets = PRESETS.gather(self.industries, ("it_typical", "security_typical"))
+        return presets["it_typical"], presets["security_typical"]
+
+    def update(self, params):
+        """Apply one parameter tuple per stage; returns the result after every stage"""
+        params = [tuple(stage_params) for stage_params in params]
+        start = 0
+        while start < min(len(params), len(self._params)) and params[start] == self._params[start]:
+            start += 1
+        del self._params[start:], self._results[start:]
+        for index in range(start, len(params)):
+            upstream = self._results[-1] if self._results else self.tam
+            company_weight, revenue_weight, window = FUNNEL_STAGES[index][2](self, upstream, *params[index])
+            self._params.append(params[index])
+            self._results.append(StageResult(upstream.companies * company_weight,
+                                             upstream.revenue * revenue_weight, window))
+        self.recomputed = len(params) - start
+        return self._results
+
+    def security_budget(self, result):
+        """Security budget ($M) per sector and tier of a stage result"""
+        it_pct, sec_pct = self.percentages()
+        return result.revenue * (it_pct * sec_pct / 10_000)[:, None]
+
+    def summary(self):
+        """Companies, revenue and security budget after each stage, starting with the TAM"""
+        rows = [("TAM", "TAM", self.tam)] + [
+            (name, market, result) for (name, market, _), result in zip(FUNNEL_STAGES, self._results)
+        ]
+        return pd.DataFrame({
+            "Stage": [name for name, _, _ in rows],
+            "Market": [market for _, market, _ in rows],
+            "Companies": [result.companies.sum() for _, _, result in rows],
+            "Revenue ($M)": [result.revenue.sum() for _, _, result in rows],
+            "Security Budget ($M)": [self.security_budget(result).sum() for _, _, result in rows]
+        })
+
+    def by_sector(self):
+        """Companies and security budget per sector at TAM, SAM and SOM"""
+        markets = {"TAM": self.tam}
+        for (_, market, _), result in zip(FUNNEL_STAGES, self._results):
+            markets[market] = result
+        frame = pd.DataFrame({"Sector": self.sectors})
+        for market, result in markets.items():
+            frame[f"{market} Companies"] = result.companies.sum(axis=1)
+            frame[f"{market} Security Budget ($M)"] = self.security_budget(result).sum(axis=1)
+        return frame
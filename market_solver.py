@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+import data
+from data import NAICS_REVENUE_TIERS, REVENUE_TIER_COUNTS, REVENUE_TIERS, SECTOR_TO_INDUSTRY
+from revenue_distribution import build_revenue_distribution
+from preset_registry import PRESETS, DEFAULT_INDUSTRY
+from metrics import track_cache
+
+# Default largest share (%) of a company's security budget one product can take
+DEFAULT_MAX_BUDGET_SHARE = 10.0
+
+# Largest number of price points accepted by a batch sweep
+MAX_SWEEP_PRICES = 100_000
+
+
+def required_revenue(price, max_budget_share, it_percentage, security_percentage):
+    """Minimum annual revenue ($M) at which a price ($) fits in the given share of the security budget"""
+    budget_fraction = (np.asarray(it_percentage, dtype=float) / 100
+                       * np.asarray(security_percentage, dtype=float) / 100
+                       * np.asarray(max_budget_share, dtype=float) / 100)
+    return np.asarray(price, dtype=float) / 1e6 / budget_fraction
+
+
+class MarketSolver:
+    """Inverse price -> addressable market solver over per-segment revenue distributions
+
+    Each query converts the price into a revenue threshold per segment and reads companies and
+    revenue above it from the distribution's precomputed CDF tables.
+    """
+
+    def __init__(self, segments, industries, distribution):
+        self.segments = list(segments)
+        self.industries = list(industries)
+        self.distribution = distribution
+
+    def percentages(self):
+        """Typical IT and security percentages of each segment's industry (from the live preset registry)"""
+        presets = PRESETS.gather(self.industries, ("it_typical", "security_typical"))
+        return presets["it_typical"], presets["security_typical"]
+
+    def solve(self, price, max_budget_share=DEFAULT_MAX_BUDGET_SHARE):
+        """Revenue threshold, addressable companies and revenue per segment for one price point"""
+        it_pct, sec_pct = self.percentages()
+        threshold = required_revenue(price, max_budget_share, it_pct, sec_pct)
+        companies = self.distribution.companies_above(threshold)
+        return {
+            "threshold_revenue": threshold,
+            "companies": companies,
+            "revenue": self.distribution.revenue_above(threshold),
+            "acv_market": companies * price / 1e6
+        }
+
+    def sweep(self, prices, max_budget_share=DEFAULT_MAX_BUDGET_SHARE):
+        """Addressable companies and revenue (prices x segments) for many price points at once"""
+        prices = np.asarray(prices, dtype=float).ravel()
+        it_pct, sec_pct = self.percentages()
+        threshold = required_revenue(prices[:, None], max_budget_share, it_pct[None, :], sec_pct[None, :])
+        companies = self.distribution.companies_above(threshold)
+        return {
+            "prices": prices,
+            "companies": companies,
+            "revenue": self.distribution.revenue_above(threshold),
+            "acv_market": companies * prices[:, None] / 1e6
+        }
+
+
+def build_market_solver(tier_cube=None, shape="pareto"):
+    """Solver over NAICS sectors from the workbook tier cube, or national tier counts when it's unavailable"""
+    if tier_cube is None:
+        counts = np.array([[REVENUE_TIER_COUNTS[tier] for tier in REVENUE_TIERS]], dtype=float)
+        segments, industries = ["All Businesses"], [DEFAULT_INDUSTRY]
+    else:
+        tier_columns = [column for column in NAICS_REVENUE_TIERS if column != "Uncoded records"]
+        counts = tier_cube[tier_columns].to_numpy(dtype=float)
+        # Uncoded records are assumed to be small businesses (under $500K), as in the sector TAM
+        counts[:, 0] += tier_cube["Uncoded records"].to_numpy(dtype=float)
+        segments = list(tier_cube.index)
+        industries = [SECTOR_TO_INDUSTRY.get(sector, DEFAULT_INDUSTRY) for sector in segments]
+    distribution = build_revenue_distribution(segments, counts, REVENUE_TIERS, shape)
+    return MarketSolver(segments, industries, distribution)
+
+
+def get_market_solver(shape="pareto", vintage=None):
+    """Market solver over a NAICS vintage (default: this session's), built once per process, shape and vintage"""
+    return _get_market_solver(shape, data.vintage_key(vintage))
+
+
+@track_cache(st.cache_resource, name="get_market_solver")
+def _get_market_solver(shape, vintage_key):
+    return build_market_solver(data.load_naics_tier_cube(vintage_key[0]), shape)
+
+
+def industry_thresholds(price, max_budget_share=DEFAULT_MAX_BUDGET_SHARE):
+    """Minimum revenue per preset industry for a price point"""
+    industries = list(PRESETS.snapshot().names)
+    presets = PRESETS.gather(industries, ("it_typical", "security_typical"))
+    return pd.DataFrame({
+        "Industry": industries,
+        "IT Budget (%)": presets["it_typical"],
+        "Security Budget (% of IT)": presets["security_typical"],
+        "Minimum Revenue ($M)": required_revenue(price, max_budget_share,
+                                                 presets["it_typical"], presets["security_typical"])
+    })
@@ -0,0 +1,221 @@
+import bisect
+import functools
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local Prometheus endpoint served from a sidecar thread; METRICS_PORT=0 disables it
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "9464"))
+
+# Histogram buckets (seconds) from a fast cache hit to a cold workbook parse
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+logger = logging.getLogger(__name__)
+
+
+class Metric:
+    """Base for metrics keyed by a tuple of label values (in labelnames order)"""
+    type = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+        REGISTRY.append(self)
+
+    def _labels(self, values):
+        if not values:
+            return ""
+        pairs = ",".join(f'{name}="{str(value)}"' for name, value in zip(self.labelnames, values))
+        return "{" + pairs + "}"
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, self._labels(key), value) for key, value in sorted(self._values.items())]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines += [f"{name}{labels} {value:g}" for name, labels, value in self.samples()]
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._function = None
+
+    def set(self, value, *labels):
+        with self._lock:
+            self._values[labels] = value
+
+    def set_function(self, function):
+        """Read the (unlabelled) value from a callable at scrape time"""
+        self._function = function
+
+    def samples(self):
+        if self._function is not None:
+            return [(self.name, "", float(self._function()))]
+        return super().samples()
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    @contextmanager
+    def time(self, *labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def samples(self):
+        # Buckets are stored per bin and accumulated on scrape
+        with self._lock:
+            entries = [(key, list(counts), total) for key, (counts, total) in sorted(self._values.items())]
+        samples = []
+        for key, counts, total in entries:
+            labels = self._labels(key)
+            prefix = labels[:-1] + "," if labels else "{"
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                samples.append((f"{self.name}_bucket", f'{prefix}le="{le}"}}', cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+REGISTRY = []
+
+RERUNS = Counter("calculator_reruns_total", "Script reruns")
+RERUN_SECONDS = Histogram("calculator_rerun_seconds", "Full script rerun time")
+PAGE_SECONDS = Histogram("calculator_page_render_seconds", "Time spent in each page's show()", ["page"])
+DATA_LOAD_SECONDS = Histogram("calculator_data_load_seconds", "Uncached data loader run time", ["loader"])
+WORKBOOK_PARSES = Counter("calculator_workbook_parses_total", "Excel workbooks read from disk", ["workbook"])
+FIGURE_BUILD_SECONDS = Histogram("calculator_figure_build_seconds", "Figure build time per builder", ["builder"])
+CACHE_HITS = Counter("calculator_cache_hits_total", "Cached function calls answered from the cache", ["cache"])
+CACHE_MISSES = Counter("calculator_cache_misses_total", "Cached function calls that ran the function", ["cache"])
+CACHE_EVICTIONS = Counter("calculator_cache_evictions_total", "Entries evicted from caches", ["cache"])
+ACTIVE_SESSIONS = Gauge("calculator_active_sessions", "Browser sessions seen within the session expiry window")
+
+
+def render():
+    """All metrics in the Prometheus text exposition format"""
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+def timed(histogram, *labels):
+    """Decorator recording each call's duration in a histogram"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start, *labels)
+        return wrapper
+    return decorator
+
+
+_cache_state = threading.local()
+
+
+def track_cache(cache_decorator, name=None, **options):
+    """Apply st.cache_data / st.cache_resource (with options) and count hits and misses"""
+    def decorator(function):
+        label = name or function.__name__
+
+        @functools.wraps(function)
+        def compute(*args, **kwargs):
+            _cache_state.missed = True
+            return function(*args, **kwargs)
+
+        cached = cache_decorator(**options)(compute) if options else cache_decorator(compute)
+
+        @functools.wraps(function)
+        def lookup(*args, **kwargs):
+            # Restore the flag afterwards so cached calls nested in a miss don't mask it
+            previous = getattr(_cache_state, "missed", False)
+            _cache_state.missed = False
+            try:
+                result = cached(*args, **kwargs)
+                (CACHE_MISSES if _cache_state.missed else CACHE_HITS).inc(label)
+                return result
+            finally:
+                _cache_state.missed = previous
+
+        lookup.clear = cached.clear
+        return lookup
+    return decorator
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server_lock = threading.Lock()
+_server = None
+
+
+def start_metrics_server(host=METRICS_HOST, port=METRICS_PORT):
+    """Serve /metrics from a daemon thread once per process; returns the server or None if disabled"""
+    global _server
+    if not port:
+        return None
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, port), MetricsHandler)
+            except OSError as e:
+                # Another replica on this host already owns the port
+                logger.warning("Metrics endpoint not started on %s:%d: %s", host, port, e)
+                _server = False
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+            logger.info("Serving metrics on http://%s:%d/metrics", host, port)
+        return _server or None
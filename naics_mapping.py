@@ -0,0 +1,140 @@
+import functools
+import numpy as np
+import pandas as pd
+from data import NAICS_TO_SECTOR, SECTOR_TO_INDUSTRY
+from preset_registry import PRESETS, DEFAULT_INDUSTRY
+
+# NAICS codes are 2 (sector) to 6 (national industry) digits
+NAICS_MIN_DIGITS = 2
+NAICS_MAX_DIGITS = 6
+
+# More specific NAICS prefixes whose IT/security profile differs from their sector's.
+# The longest matching prefix wins, so e.g. 3341 inherits 334 unless it is listed itself.
+NAICS_INDUSTRY_OVERRIDES = {
+    "211": "Energy & Utilities",          # Oil and gas extraction
+    "324": "Energy & Utilities",          # Petroleum and coal products manufacturing
+    "334": "Technology",                  # Computer and electronic product manufacturing
+    "486": "Energy & Utilities",          # Pipeline transportation
+    "491": "Government/Public Sector",    # Postal service
+    "5111": "Weighted Average",           # Newspaper, periodical and book publishers
+    "512": "Weighted Average",            # Motion picture and sound recording
+    "5313": "Financial Services",         # Real estate services (brokers, managers)
+    "5416": "Weighted Average",           # Management and technical consulting
+    "5611": "Weighted Average",           # Office administrative services
+    "5615": "Transportation & Logistics", # Travel arrangement and reservation services
+    "6111": "Education",                  # Elementary and secondary schools
+    "6113": "Education",                  # Colleges and universities
+}
+
+# Powers of ten for counting digits of integer codes
+_POWERS_OF_TEN = 10 ** np.arange(NAICS_MAX_DIGITS + 12, dtype=np.int64)
+
+
+def normalize_naics_codes(codes):
+    """Parse NAICS codes (ints, floats or strings like ' 541511', '31-33') into (int64 values, digit counts)
+
+    Invalid codes get 0 digits; codes longer than 6 digits are truncated to their 6-digit prefix.
+    """
+    codes = codes.to_numpy() if isinstance(codes, (pd.Series, pd.Index)) else np.asarray(codes)
+    codes = codes.ravel()
+    if codes.dtype.kind in "iu":
+        values = codes.astype(np.int64)
+        valid = values > 0
+    else:
+        if codes.dtype.kind == "f":
+            numeric = codes.astype(np.float64)
+        else:
+            numeric = pd.to_numeric(pd.Series(codes, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+            # Rare non-numeric spellings (ranges like "31-33", "NAICS 5415") use their leading digits
+            failed = np.flatnonzero(np.isnan(numeric))
+            if len(failed):
+                leading = pd.Series(codes[failed], dtype=object).astype(str).str.extract(r"^\D*(\d+)", expand=False)
+                numeric[failed] = pd.to_numeric(leading, errors="coerce").to_numpy(dtype=np.float64)
+        valid = np.isfinite(numeric) & (numeric > 0) & (numeric == np.floor(numeric))
+        values = np.where(valid, numeric, 0).astype(np.int64)
+
+    digits = np.searchsorted(_POWERS_OF_TEN, values, side="right").astype(np.int64)
+    long_codes = digits > NAICS_MAX_DIGITS
+    if long_codes.any():
+        values[long_codes] //= _POWERS_OF_TEN[digits[long_codes] - NAICS_MAX_DIGITS]
+        digits[long_codes] = NAICS_MAX_DIGITS
+    digits[~valid | (digits < NAICS_MIN_DIGITS)] = 0
+    return values, digits
+
+
+class NaicsMapping:
+    """Compiled longest-prefix NAICS -> industry table
+
+    One dense int16 table per code length (100 sector slots up to 1,000,000 six-digit slots) is
+    stored back to back, so resolving any mix of 2-6 digit codes is a single array gather.
+    """
+
+    def __init__(self, industries, table, offsets):
+        self.industries = industries
+        self._table = table
+        self._offsets = offsets
+
+    @property
+    def nbytes(self):
+        return self._table.nbytes
+
+    def industry_ids(self, codes):
+        """Index into self.industries for every code, -1 where no prefix matches"""
+        return self.industry_ids_for_values(*normalize_naics_codes(codes))
+
+    def industry_ids_for_values(self, values, digits):
+        """industry_ids for codes already parsed by normalize_naics_codes"""
+        positions = np.where(digits > 0, self._offsets[digits] + values, 0)
+        return self._table[positions]
+
+    def industries_for(self, codes, default=None):
+        """Industry name for every code (default where no prefix matches)"""
+        return self.industries_for_ids(self.industry_ids(codes), default)
+
+    def industries_for_ids(self, ids, default=None):
+        names = np.array(self.industries + [default], dtype=object)
+        return names[ids]
+
+    def percentages(self, codes, fields=("it_typical", "security_typical"), default=DEFAULT_INDUSTRY):
+        """Preset percentage arrays (field -> array) for every code; unmatched codes use the default industry"""
+        return self.percentages_for_ids(self.industry_ids(codes), fields, default)
+
+    def percentages_for_ids(self, ids, fields=("it_typical", "security_typical"), default=DEFAULT_INDUSTRY):
+        # One row per known industry plus the default in the last slot, which id -1 selects
+        per_industry = PRESETS.gather(self.industries + [default], fields)
+        return {field: values[ids] for field, values in per_industry.items()}
+
+
+def compile_naics_mapping(sectors=None, overrides=None):
+    """Build the dense lookup table from 2-digit sector industries and longer prefix overrides"""
+    if sectors is None:
+        sectors = {code: SECTOR_TO_INDUSTRY.get(name, DEFAULT_INDUSTRY) for code, name in NAICS_TO_SECTOR.items()}
+    overrides = NAICS_INDUSTRY_OVERRIDES if overrides is None else overrides
+
+    prefixes = {**sectors, **overrides}
+    for prefix in prefixes:
+        if not (prefix.isdigit() and NAICS_MIN_DIGITS <= len(prefix) <= NAICS_MAX_DIGITS):
+            raise ValueError(f"NAICS prefix must be 2-6 digits: {prefix!r}")
+    industries = sorted(set(prefixes.values()))
+    industry_id = {name: i for i, name in enumerate(industries)}
+
+    # Each length's table starts as its parent table repeated per extra digit, then applies that length's prefixes
+    tables = [np.full(1, -1, dtype=np.int16)]  # Slot 0 answers invalid codes
+    parent = np.full(10 ** (NAICS_MIN_DIGITS - 1), -1, dtype=np.int16)
+    for length in range(NAICS_MIN_DIGITS, NAICS_MAX_DIGITS + 1):
+        level = np.repeat(parent, 10)
+        for prefix, industry in prefixes.items():
+            if len(prefix) == length:
+                level[int(prefix)] = industry_id[industry]
+        tables.append(level)
+        parent = level
+
+    offsets = np.zeros(NAICS_MAX_DIGITS + 1, dtype=np.int64)
+    offsets[NAICS_MIN_DIGITS:] = np.cumsum([len(table) for table in tables])[:-1]
+    return NaicsMapping(industries, np.concatenate(tables), offsets)
+
+
+@functools.lru_cache(maxsize=1)
+def get_naics_mapping():
+    """Default NAICS mapping, compiled once per process"""
+    return compile_naics_mapping()
@@ -0,0 +1,148 @@
+import bisect
+import re
+import numpy as np
+import streamlit as st
+from data import NAICS_SECTORS, load_naics_code_table, vintage_key
+from metrics import track_cache
+
+# Words too common in NAICS titles to narrow a search
+STOPWORDS = {"and", "the", "of", "for", "in", "on", "or", "to", "except"}
+
+# Smallest trigram (Dice) similarity for a misspelled word to match a title word
+FUZZY_THRESHOLD = 0.5
+
+# Scores per query word: code prefix, exact title word, title word prefix (fuzzy matches score their similarity)
+CODE_SCORE, WORD_SCORE, PREFIX_SCORE = 4.0, 3.0, 2.0
+
+
+def _words(text):
+    return [word for word in re.findall(r"[a-z0-9]+", text.lower()) if word not in STOPWORDS]
+
+
+def _trigrams(word):
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NaicsSearchIndex:
+    """In-memory search over NAICS sectors and detailed codes by code prefix or title words
+
+    Code prefixes resolve through a flattened trie (every prefix of every code maps to its entries,
+    already in display order). Title words go through an inverted index; partially typed words match
+    by prefix on the sorted vocabulary and misspelled ones through a trigram index of the vocabulary.
+    """
+
+    def __init__(self, codes, names, code_keys):
+        self.codes = list(codes)
+        self.names = list(names)
+        self.labels = [f"{code} - {name}" for code, name in zip(self.codes, self.names)]
+        self.entry_ids = {label: i for i, label in enumerate(self.labels)}
+        self._code_keys = [tuple(keys) for keys in code_keys]
+
+        # Sectors (shorter codes) first, then NAICS order
+        order = sorted(range(len(self.codes)), key=lambda i: (len(self._code_keys[i][0]), self._code_keys[i][0]))
+        self._rank = np.empty(len(order), dtype=np.int64)
+        self._rank[order] = np.arange(len(order))
+
+        prefixes = {}
+        for i in order:
+            for key in self._code_keys[i]:
+                for length in range(1, len(key) + 1):
+                    entries = prefixes.setdefault(key[:length], [])
+                    if not entries or entries[-1] != i:
+                        entries.append(i)
+        self._prefixes = prefixes
+
+        postings = {}
+        for i, name in enumerate(self.names):
+            for word in set(_words(name)):
+                postings.setdefault(word, []).append(i)
+        self._postings = postings
+        self._vocabulary = sorted(postings)
+        self._word_trigrams = [_trigrams(word) for word in self._vocabulary]
+        trigram_index = {}
+        for position, trigrams in enumerate(self._word_trigrams):
+            for trigram in trigrams:
+                trigram_index.setdefault(trigram, []).append(position)
+        self._trigram_index = trigram_index
+
+    def __len__(self):
+        return len(self.codes)
+
+    def _word_scores(self, word):
+        """Best score per entry for one query word"""
+        if word.isdigit():
+            return dict.fromkeys(self._prefixes.get(word, ()), CODE_SCORE)
+        scores = dict.fromkeys(self._postings.get(word, ()), WORD_SCORE)
+        start = bisect.bisect_left(self._vocabulary, word)
+        stop = bisect.bisect_left(self._vocabulary, word + "\x7f", start)
+        for vocabulary_word in self._vocabulary[start:stop]:
+            for i in self._postings[vocabulary_word]:
+                scores.setdefault(i, PREFIX_SCORE)
+        if scores or len(word) < 3:
+            return scores
+
+        # No exact or prefix match: fall back to similar words
+        trigrams = _trigrams(word)
+        shared = {}
+        for trigram in trigrams:
+            for position in self._trigram_index.get(trigram, ()):
+                shared[position] = shared.get(position, 0) + 1
+        for position, count in shared.items():
+            similarity = 2 * count / (len(trigrams) + len(self._word_trigrams[position]))
+            if similarity >= FUZZY_THRESHOLD:
+                for i in self._postings[self._vocabulary[position]]:
+                    scores[i] = max(scores.get(i, 0), similarity)
+        return scores
+
+    def search(self, query, limit=20):
+        """Entry ids ranked by match quality; entries matching every query word come first"""
+        words = _words(query)
+        if not words:
+            return []
+        totals, matched = {}, {}
+        for word in words:
+            for i, score in self._word_scores(word).items():
+                totals[i] = totals.get(i, 0) + score
+                matched[i] = matched.get(i, 0) + 1
+        ranked = sorted(totals, key=lambda i: (-matched[i], -totals[i], self._rank[i]))
+        return ranked[:limit]
+
+    def sectors(self):
+        """Entry ids of the 2-digit sectors in NAICS order"""
+        return [i for i in np.argsort(self._rank) if len(self._code_keys[i][0]) == 2]
+
+    def code_rows(self, entry_ids, row_codes):
+        """Positions in row_codes (detailed codes) covered by any of the entries, without double counting"""
+        row_codes = np.asarray(row_codes, dtype=str)
+        covered = np.zeros(len(row_codes), dtype=bool)
+        for i in entry_ids:
+            for key in self._code_keys[i]:
+                covered |= np.char.startswith(row_codes, key)
+        return np.flatnonzero(covered)
+
+
+def build_naics_search_index(code_table=None):
+    """Index over the NAICS sectors plus every detailed code in the workbook"""
+    codes, names, code_keys = [], [], []
+    for sector in NAICS_SECTORS:
+        # Range sectors like "31-33" match each 2-digit code they span
+        first, _, last = sector["code"].partition("-")
+        codes.append(sector["code"])
+        names.append(sector["name"])
+        code_keys.append([str(code) for code in range(int(first), int(last or first) + 1)])
+    if code_table is not None:
+        codes += list(code_table.index)
+        names += list(code_table["Description"])
+        code_keys += [[code] for code in code_table.index]
+    return NaicsSearchIndex(codes, names, code_keys)
+
+
+def get_naics_search_index(vintage=None):
+    """NAICS search index for a vintage (default: this session's), built once per process and vintage"""
+    return _get_naics_search_index(vintage_key(vintage))
+
+
+@track_cache(st.cache_resource, name="get_naics_search_index")
+def _get_naics_search_index(key):
+    return build_naics_search_index(load_naics_code_table(key[0]))
@@ -0,0 +1,322 @@
+import copy
+import glob
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import numpy as np
+import openpyxl
+from metrics import DATA_LOAD_SECONDS, WORKBOOK_PARSES
+
+# Where ingested vintages are kept, and which workbooks are scanned for NAICS releases
+VINTAGE_DIR = os.environ.get("NAICS_VINTAGE_DIR", "naics_vintages")
+NAICS_SOURCE_GLOB = os.environ.get("NAICS_SOURCE_GLOB", "usbusinesses*.xlsx")
+
+# Bump when the snapshot layout changes so stale stores are re-ingested
+SNAPSHOT_FORMAT = 1
+
+# Rows searched for the header row of a sheet
+HEADER_SCAN_ROWS = 20
+
+MONTHS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_header(value):
+    """Header text with whitespace collapsed (the workbook has labels like "1,000,000,000+ ")"""
+    return " ".join(str(value).split()) if value is not None else ""
+
+
+def vintage_id(*names):
+    """Sortable vintage id ("2024-01") from the first name containing a month and year, else the last name"""
+    for name in names:
+        match = re.search(r"([A-Za-z]{3})[A-Za-z]*[-_ ]?(\d{4})", name)
+        if match and match.group(1).lower() in MONTHS:
+            return f"{match.group(2)}-{MONTHS.index(match.group(1).lower()) + 1:02d}"
+    return names[-1]
+
+
+def vintage_label(vintage):
+    """Display label for a vintage id ("Jan 2024")"""
+    match = re.fullmatch(r"(\d{4})-(\d{2})", vintage)
+    return f"{MONTHS[int(match.group(2)) - 1].title()} {match.group(1)}" if match else vintage
+
+
+class SheetLayout:
+    """Where a NAICS count table sits in a worksheet"""
+
+    def __init__(self, sheet, header_row, code_column, description_column, tier_columns):
+        self.sheet = sheet
+        self.header_row = header_row
+        self.code_column = code_column
+        self.description_column = description_column
+        self.tier_columns = tier_columns
+
+
+def detect_layout(sheet_name, rows, tiers):
+    """Find the header row holding every tier label among the top rows, plus the code and description columns"""
+    wanted = {normalize_header(tier): tier for tier in tiers}
+    for index, row in enumerate(rows):
+        headers = [normalize_header(cell) for cell in row]
+        found = {wanted[header]: column for column, header in enumerate(headers) if header in wanted}
+        if len(found) < len(wanted):
+            continue
+        code_column = next((column for column, header in enumerate(headers) if re.search(r"code", header, re.I)), 0)
+        description_column = next(
+            (column for column, header in enumerate(headers) if re.search(r"description|title", header, re.I)),
+            code_column + 1
+        )
+        return SheetLayout(sheet_name, index, code_column, description_column, [found[tier] for tier in tiers])
+    return None
+
+
+def read_sheet(rows, layout):
+    """Codes, descriptions and (rows x tiers) counts of the NAICS code rows among the rows below the header"""
+    codes, descriptions, counts = [], [], []
+    for row in rows:
+        code = str(row[layout.code_column]).strip() if row[layout.code_column] is not None else ""
+        # Keep rows with a real NAICS code (drops the Grand Total and blank rows)
+        if not re.fullmatch(r"\d{2,6}", code):
+            continue
+        codes.append(code)
+        descriptions.append(str(row[layout.description_column] or "").strip())
+        counts.append([row[column] if isinstance(row[column], (int, float)) else 0 for column in layout.tier_columns])
+    return np.array(codes), np.array(descriptions), np.array(counts, dtype=np.int64).reshape(-1, len(layout.tier_columns))
+
+
+def file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class NaicsSnapshot:
+    """One vintage as columns: sorted codes, descriptions and (codes x tiers) company counts"""
+
+    def __init__(self, codes, descriptions, counts):
+        self.codes = codes
+        self.descriptions = descriptions
+        self.counts = counts
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.descriptions.nbytes + self.counts.nbytes
+
+
+class NaicsDelta:
+    """Change in company counts per code and tier between two vintages, over the union of their codes"""
+
+    def __init__(self, codes, descriptions, older, newer):
+        self.codes = codes
+        self.descriptions = descriptions
+        self.older = older
+        self.newer = newer
+
+    @property
+    def change(self):
+        return self.newer - self.older
+
+    def status(self):
+        """Added, removed or kept per code"""
+        in_older, in_newer = self.older.any(axis=1), self.newer.any(axis=1)
+        return np.where(~in_older & in_newer, "Added", np.where(in_older & ~in_newer, "Removed", "Kept"))
+
+
+def compute_delta(older, newer):
+    """Align two snapshots on the union of their (sorted) codes in one vectorized pass"""
+    codes = np.union1d(older.codes, newer.codes)
+    aligned = []
+    for snapshot in (older, newer):
+        counts = np.zeros((len(codes), snapshot.counts.shape[1]), dtype=np.int64)
+        counts[np.searchsorted(codes, snapshot.codes)] = snapshot.counts
+        aligned.append(counts)
+    descriptions = np.empty(len(codes), dtype=object)
+    descriptions[np.searchsorted(codes, older.codes)] = older.descriptions
+    descriptions[np.searchsorted(codes, newer.codes)] = newer.descriptions
+    return NaicsDelta(codes, descriptions.astype(str), *aligned)
+
+
+class VintageStore:
+    """Versioned NAICS count snapshots ingested from every release workbook
+
+    Each vintage is stored once as a compressed columnar .npz keyed by the digest of its source
+    workbook, so re-scanning only parses new or changed files. Deltas between consecutive vintages
+    are stored too and only recomputed for pairs whose snapshots changed. If the directory is not
+    writable the store keeps everything in memory.
+
+    The manifest is never changed in place: ingest() builds a new one and swaps it in, so readers in
+    other sessions always see a complete manifest, and files are named by content fingerprint so a
+    reader holding the previous manifest still finds the files it names.
+    """
+
+    def __init__(self, tiers, directory=VINTAGE_DIR):
+        self.tiers = list(tiers)
+        self.directory = directory
+        self._memory = {}
+        self._snapshots = {}
+        self._retired = set()
+        self._lock = threading.Lock()
+        self.manifest = {"format": SNAPSHOT_FORMAT, "tiers": self.tiers, "sources": {}, "vintages": {}, "deltas": {}}
+        try:
+            with open(os.path.join(directory, "manifest.json")) as f:
+                manifest = json.load(f)
+            if manifest.get("format") == SNAPSHOT_FORMAT and manifest.get("tiers") == self.tiers:
+                self.manifest = manifest
+        except (OSError, ValueError):
+            pass
+
+    def _save(self, name, **arrays):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            np.savez_compressed(os.path.join(self.directory, name), **arrays)
+        except OSError as e:
+            logger.warning("Keeping %s in memory: %s", name, e)
+            self._memory[name] = arrays
+
+    def _load(self, name):
+        if name in self._memory:
+            return self._memory[name]
+        with np.load(os.path.join(self.directory, name)) as arrays:
+            return {key: arrays[key] for key in arrays.files}
+
+    def _save_manifest(self, manifest):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, "manifest.json"), "w") as f:
+                json.dump(manifest, f, indent=2)
+        except OSError as e:
+            logger.warning("NAICS vintage manifest not saved: %s", e)
+
+    @staticmethod
+    def _files(manifest):
+        return ({entry["file"] for entry in manifest["vintages"].values()}
+                | {entry["file"] for entry in manifest["deltas"].values()})
+
+    def _delete_retired(self):
+        """Delete the files dropped from the manifest by the previous ingest"""
+        for name in self._retired:
+            self._memory.pop(name, None)
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning("Could not remove %s: %s", name, e)
+        self._retired = set()
+
+    def ingest(self, paths=None):
+        """Ingest new or changed release workbooks; returns the ids of the vintages (re)written"""
+        paths = sorted(glob.glob(NAICS_SOURCE_GLOB)) if paths is None else list(paths)
+        written = []
+        with self._lock, DATA_LOAD_SECONDS.time("ingest_naics_vintages"):
+            manifest = copy.deepcopy(self.manifest)
+            for path in paths:
+                digest = file_digest(path)
+                source = manifest["sources"].get(path)
+                if source is not None and source["sha256"] == digest and all(
+                        vintage in manifest["vintages"] for vintage in source["vintages"]):
+                    continue
+                if not written:
+                    # Readers have had a whole ingest to move off the files replaced last time
+                    self._delete_retired()
+                written += self._ingest_workbook(manifest, path, digest)
+            if written:
+                self._update_deltas(manifest)
+                self._save_manifest(manifest)
+                self._retired = self._files(self.manifest) - self._files(manifest)
+                self.manifest = manifest
+                fingerprints = {entry["fingerprint"] for entry in manifest["vintages"].values()}
+                for key in [key for key in list(self._snapshots) if key not in fingerprints]:
+                    self._snapshots.pop(key, None)
+        return written
+
+    def _ingest_workbook(self, manifest, path, digest):
+        # A changed workbook replaces every vintage it produced before
+        for vintage in [v for v, entry in manifest["vintages"].items() if entry["source"] == path]:
+            del manifest["vintages"][vintage]
+        WORKBOOK_PARSES.inc(os.path.basename(path))
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        written = []
+        try:
+            for sheet_name in workbook.sheetnames:
+                sheet = workbook[sheet_name]
+                layout = detect_layout(sheet_name, list(sheet.iter_rows(max_row=HEADER_SCAN_ROWS, values_only=True)),
+                                       self.tiers)
+                if layout is None:
+                    logger.info("Skipping sheet %s in %s: no revenue tier header", sheet_name, path)
+                    continue
+                codes, descriptions, counts = read_sheet(
+                    sheet.iter_rows(min_row=layout.header_row + 2, values_only=True), layout
+                )
+                # Sorted codes make lookups and vintage alignment a searchsorted
+                order = np.argsort(codes, kind="stable")
+                vintage = vintage_id(sheet_name, os.path.basename(path))
+                fingerprint = hashlib.sha256(f"{digest}:{sheet_name}".encode()).hexdigest()[:16]
+                file_name = f"vintage-{vintage}-{fingerprint}.npz"
+                self._save(file_name, codes=codes[order], descriptions=descriptions[order],
+                           counts=counts[order].astype(np.int32))
+                manifest["vintages"][vintage] = {
+                    "file": file_name, "source": path, "sheet": sheet_name, "fingerprint": fingerprint,
+                    "header_row": layout.header_row, "rows": int(len(codes))
+                }
+                written.append(vintage)
+        finally:
+            workbook.close()
+        manifest["sources"][path] = {"sha256": digest, "vintages": written}
+        return written
+
+    def _update_deltas(self, manifest):
+        vintages = sorted(manifest["vintages"])
+        deltas = {}
+        for older, newer in zip(vintages, vintages[1:]):
+            key = f"{older}..{newer}"
+            fingerprints = [manifest["vintages"][older]["fingerprint"], manifest["vintages"][newer]["fingerprint"]]
+            entry = manifest["deltas"].get(key)
+            if entry is None or entry["fingerprints"] != fingerprints:
+                delta = compute_delta(self._read_snapshot(manifest["vintages"][older]),
+                                      self._read_snapshot(manifest["vintages"][newer]))
+                entry = {"file": f"delta-{older}-{newer}-{fingerprints[0][:8]}{fingerprints[1][:8]}.npz",
+                         "fingerprints": fingerprints}
+                self._save(entry["file"], codes=delta.codes, descriptions=delta.descriptions,
+                           older=delta.older.astype(np.int32), newer=delta.newer.astype(np.int32))
+            deltas[key] = entry
+        manifest["deltas"] = deltas
+
+    def vintages(self):
+        """Ingested vintage ids, oldest first"""
+        return sorted(self.manifest["vintages"])
+
+    def latest(self):
+        vintages = self.vintages()
+        return vintages[-1] if vintages else None
+
+    def fingerprint(self, vintage):
+        """Content fingerprint of a vintage, or None if it isn't ingested"""
+        entry = self.manifest["vintages"].get(vintage)
+        return entry["fingerprint"] if entry is not None else None
+
+    def _read_snapshot(self, entry):
+        # Cached by fingerprint, so a replaced vintage is never served from its old snapshot
+        key = entry["fingerprint"]
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            arrays = self._load(entry["file"])
+            snapshot = self._snapshots[key] = NaicsSnapshot(arrays["codes"], arrays["descriptions"], arrays["counts"])
+        return snapshot
+
+    def snapshot(self, vintage):
+        """Columnar snapshot of a vintage (kept in memory after the first load)"""
+        return self._read_snapshot(self.manifest["vintages"][vintage])
+
+    def delta(self, older, newer):
+        """Vintage-over-vintage change, read from the store for consecutive vintages"""
+        manifest = self.manifest
+        entry = manifest["deltas"].get(f"{older}..{newer}")
+        if entry is None:
+            return compute_delta(self._read_snapshot(manifest["vintages"][older]),
+                                 self._read_snapshot(manifest["vintages"][newer]))
+        arrays = self._load(entry["file"])
+        return NaicsDelta(arrays["codes"], arrays["descriptions"], arrays["older"].astype(np.int64),
+                          arrays["newer"].astype(np.int64))
@@ -1,8 +1,31 @@
+import hashlib
 import streamlit as st
 import numpy as np
+import pandas as pd
 import plotly.graph_objects as go
-from data import INDUSTRY_PRESETS, generate_revenue_array, CHART_COLORS
-from utils import create_security_budget_chart, create_budget_table, highlight_selected_revenue
+from plotly.subplots import make_subplots
+from data import (INDUSTRY_PRESETS, generate_revenue_array, CHART_COLORS, industry_content_hash, load_naics_revenue_data,
+                  sector_preset_key, vintage_key)
+from calculations import compute_sector_tam, industry_budget_matrix, security_budget_surface
+from preset_registry import PRESETS
+from utils import create_security_budget_chart, create_budget_table, highlight_selected_revenue, show_export_controls
+from exports import export_budget_table, export_frame
+from session_memory import derived_cache
+from scenario_store import get_scenario_store, get_scenario_owner, SCENARIO_PAGE_SIZE
+from pages.industry_benchmarks import build_industry_table
+from budget_component import apply_client_chart_values, client_budget_chart
+from metrics import track_cache
+from projections import DEFAULT_PROJECTION_YEARS, GROWTH_COLUMNS, current_growth_assumptions, project_company_budget
+from prospects import get_portfolio_cache, industry_tam, score_prospects
+from figure_pool import cached_figure, plotly_chart, submit_figure
+from scenario_diff import get_scenario_diff, scenario_label, scenario_rows
+
+# Budget levels compared across industries: (label, IT field, security field)
+COMPARISON_LEVELS = [
+    ("Minimum", "it_min", "security_min"),
+    ("Typical", "it_typical", "security_typical"),
+    ("Maximum", "it_max", "security_max")
+]
 
 def create_budget_donut_chart(annual_revenue, it_percentage, security_percentage):
     """Create a donut chart showing budget breakdown"""
@@ -44,6 +67,415 @@ def create_budget_donut_chart(annual_revenue, it_percentage, security_percentage
     
     return fig
 
+@track_cache(st.cache_data, max_entries=64, show_spinner=False)
+def get_sensitivity_surface(industry, annual_revenue, preset_key):
+    """Security budget over the industry's full IT x security preset ranges at 0.1% steps
+
+    Cached per industry and revenue; preset_key changes only when this industry's preset does.
+    """
+    preset = INDUSTRY_PRESETS[industry]
+    return security_budget_surface(
+        annual_revenue, preset["it_min"], preset["it_max"], preset["security_min"], preset["security_max"]
+    )
+
+
+def create_sensitivity_heatmap(it_values, security_values, surface, it_percentage, security_percentage, preset):
+    """Heatmap of security budget over IT % x security %, marking the current and typical selections"""
+    fig = go.Figure()
+    fig.add_trace(go.Heatmap(
+        x=security_values,
+        y=it_values,
+        z=surface,
+        colorscale=[[0, '#FFDAE8'], [0.5, '#96E4B0'], [1, '#008581']],
+        colorbar=dict(title='Security<br>Budget ($M)'),
+        hovertemplate='IT Budget: %{y:.1f}% of revenue<br>'
+                      'Security Budget: %{x:.1f}% of IT<br>'
+                      '<b>$%{z:,.3f}M</b><extra></extra>'
+    ))
+    fig.add_trace(go.Scatter(
+        x=[preset["security_typical"]],
+        y=[preset["it_typical"]],
+        mode='markers',
+        name='Industry Typical',
+        marker=dict(symbol='diamond', size=12, color='white', line=dict(color='black', width=1)),
+        hovertemplate='Industry typical<extra></extra>'
+    ))
+    fig.add_trace(go.Scatter(
+        x=[security_percentage],
+        y=[it_percentage],
+        mode='markers',
+        name='Your Selection',
+        marker=dict(symbol='x', size=12, color=CHART_COLORS["user_selection"]),
+        hovertemplate='Your selection<extra></extra>'
+    ))
+    fig.update_layout(
+        xaxis=dict(title='Security Budget (% of IT)', ticksuffix='%'),
+        yaxis=dict(title='IT Budget (% of Revenue)', ticksuffix='%'),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        height=450,
+        margin=dict(l=60, r=30, t=60, b=50)
+    )
+    return fig
+
+
+def create_budget_projection_chart(projection_df):
+    """Line chart of projected IT and security budgets per year"""
+    fig = go.Figure()
+    lines = [("IT Budget ($M)", CHART_COLORS["lower_bound"]), ("Security Budget ($M)", CHART_COLORS["user_selection"])]
+    for column, color in lines:
+        fig.add_trace(go.Scatter(
+            x=projection_df.index, y=projection_df[column], name=column, mode="lines+markers",
+            line=dict(color=color), hovertemplate="%{x}: $%{y:,.2f}M"
+        ))
+    fig.update_layout(
+        xaxis=dict(title="Year", tickformat="d", dtick=1),
+        yaxis=dict(title="Budget ($M)"),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        height=350,
+        margin=dict(t=40, b=40)
+    )
+    return fig
+
+
+@track_cache(st.cache_resource, max_entries=32)
+def get_industry_comparison(content_hash, revenue_points, _custom_industries):
+    """Heatmap inputs and numeric table of min/typical/max security budgets for every industry and revenue point
+
+    Cached until the preset+custom industry content hash or the revenue points change.
+    """
+    table = build_industry_table(INDUSTRY_PRESETS, _custom_industries)
+    industries = table["Industry"].tolist()
+    revenue = np.asarray(revenue_points, dtype=float)
+    budgets = industry_budget_matrix(
+        revenue,
+        table[[it_field for _, it_field, _ in COMPARISON_LEVELS]].to_numpy(),
+        table[[sec_field for _, _, sec_field in COMPARISON_LEVELS]].to_numpy()
+    )
+    revenue_labels = [f"${value:,.0f}M" for value in revenue]
+    
+    # One row per industry and level, one column per revenue point
+    levels = [label for label, _, _ in COMPARISON_LEVELS]
+    comparison_df = pd.DataFrame(budgets.reshape(-1, len(revenue)), columns=revenue_labels)
+    comparison_df.insert(0, "Level", np.tile(levels, len(industries)))
+    comparison_df.insert(0, "Industry", np.repeat(industries, len(levels)))
+    return (industries, revenue_labels, budgets), comparison_df
+
+
+def create_industry_comparison_chart(industries, revenue_labels, budgets):
+    """Faceted heatmap of (industries x levels x revenue points) security budgets, one facet per level"""
+    fig = make_subplots(
+        rows=1, cols=len(COMPARISON_LEVELS), shared_yaxes=True, horizontal_spacing=0.02,
+        subplot_titles=[label for label, _, _ in COMPARISON_LEVELS]
+    )
+    for column, (label, _, _) in enumerate(COMPARISON_LEVELS):
+        fig.add_trace(
+            go.Heatmap(
+                x=revenue_labels,
+                y=industries,
+                z=budgets[:, column, :],
+                coloraxis='coloraxis',
+                hovertemplate=f'%{{y}} ({label.lower()})<br>Revenue: %{{x}}<br>'
+                              'Security Budget: $%{z:,.2f}M<extra></extra>'
+            ),
+            row=1, col=column + 1
+        )
+    fig.update_layout(
+        coloraxis=dict(
+            colorscale=[[0, '#FFDAE8'], [0.5, '#96E4B0'], [1, '#008581']],
+            colorbar=dict(title='Security<br>Budget ($M)')
+        ),
+        height=max(400, 22 * len(industries) + 150),
+        margin=dict(l=10, r=10, t=60, b=50)
+    )
+    fig.update_yaxes(autorange='reversed')
+    return fig
+
+
+def create_scenario_diff_chart(labels, revenue, delta, sectors, tam_delta, baseline):
+    """Budget difference from the baseline scenario per revenue point (top) and security TAM difference per sector (bottom)"""
+    fig = make_subplots(
+        rows=2, cols=1, vertical_spacing=0.3,
+        subplot_titles=[f"Security Budget vs {labels[baseline]}", "Security TAM Difference by Sector"]
+    )
+    for index, label in enumerate(labels):
+        if index == baseline:
+            continue
+        fig.add_trace(go.Scatter(
+            x=revenue, y=delta[index], name=label, legendgroup=label, mode="lines+markers",
+            hovertemplate="Revenue: $%{x:,.0f}M<br>Difference: $%{y:,.2f}M<extra></extra>"
+        ), row=1, col=1)
+        fig.add_trace(go.Bar(
+            x=sectors, y=tam_delta[index], name=label, legendgroup=label, showlegend=False,
+            hovertemplate="%{x}<br>Difference: $%{y:,.0f}M<extra></extra>"
+        ), row=2, col=1)
+    fig.update_xaxes(title_text="Annual Revenue ($M)", row=1, col=1)
+    fig.update_yaxes(title_text="Difference ($M)", row=1, col=1)
+    fig.update_yaxes(title_text="TAM Difference ($M)", row=2, col=1)
+    fig.update_layout(
+        barmode="group",
+        height=750,
+        legend=dict(orientation="h", yanchor="bottom", y=1.05, xanchor="right", x=1),
+        margin=dict(t=80, b=40)
+    )
+    return fig
+
+
+def show_server_charts(fig, donut_fig, annual_revenue, it_percentage, security_percentage):
+    """Display the budget metrics, donut and security budget chart rendered by the server"""
+    # Calculate budgets
+    it_budget = annual_revenue * (it_percentage / 100)
+    security_budget = it_budget * (security_percentage / 100)
+    
+    # Display metrics in columns
+    metric_col1, metric_col2, metric_col3 = st.columns(3)
+    
+    with metric_col1:
+        st.metric(
+            "Annual Revenue",
+            f"${annual_revenue:.2f}M"
+        )
+        
+    with metric_col2:
+        st.metric(
+            "IT Budget",
+            f"${it_budget:.2f}M",
+            f"↑ {it_percentage}% of Revenue"
+        )
+        
+    with metric_col3:
+        st.metric(
+            "Security Budget",
+            f"${security_budget:.2f}M",
+            f"↑ {security_percentage}% of IT Budget"
+        )
+    
+    # Add donut chart
+    plotly_chart(donut_fig, use_container_width=True)
+    
+    # Add explanation of the donut chart
+    st.markdown("""
+    Understanding the Budget Breakdown:
+    - The outer ring shows how your total revenue is divided
+    - Green section: Security budget (% of IT budget)
+    - Teal section: IT budget (other than security)
+    - Gray section: Revenue
+    - Hover over sections to see detailed values
+    """)
+    
+    st.divider()
+    
+    # Security Budget Chart section
+    st.subheader("Security Budget Chart")
+    st.markdown("""
+    This chart visualizes security budgets across different revenue points:
+    - **Grouped Bars**: Show security budgets at different percentages around your selected value
+    - **Trend Lines**: Display industry typical ranges
+    - **Hover**: Mouse over elements to see detailed values
+    """)
+    
+    # Display the chart
+    plotly_chart(
+        fig, 
+        use_container_width=True,
+        config={
+            'displayModeBar': True,
+            'responsive': True,
+            'displaylogo': False,
+            'modeBarButtonsToRemove': ['lasso2d', 'select2d'],
+            'toImageButtonOptions': {'format': 'png', 'filename': 'security_budget_chart'},
+        }
+    )
+
+
+def score_uploaded_prospects(uploaded):
+    """Scored portfolio of an uploaded prospect CSV, reused across sessions by file hash"""
+    # Hash each upload once per session
+    session_derived = derived_cache()
+    digest_key = ("prospect_digest", uploaded.file_id)
+    if digest_key not in session_derived:
+        for key in [k for k in session_derived if k[0] == "prospect_digest"]:
+            del session_derived[key]
+        session_derived[digest_key] = hashlib.sha256(uploaded.getbuffer()).hexdigest()
+    cache_key = (session_derived[digest_key], PRESETS.content_hash)
+    cache = get_portfolio_cache()
+    portfolio = cache.get(cache_key)
+    if portfolio is not None:
+        return portfolio
+
+    # Score chunk by chunk, streaming the running totals to the page
+    progress = st.progress(0.0, text="Scoring accounts...")
+    running_totals = st.empty()
+
+    def report(partial):
+        progress.progress(min(uploaded.tell() / max(uploaded.size, 1), 1.0),
+                          text=f"Scored {partial.rows:,} rows...")
+        running_totals.caption(f"So far: {partial.accounts:,} accounts, "
+                               f"${partial.security_budget:,.1f}M total security budget")
+
+    uploaded.seek(0)
+    try:
+        portfolio = score_prospects(uploaded, on_chunk=report)
+    except ValueError as e:
+        st.error(f"Could not read the prospect list: {e}")
+        return None
+    finally:
+        progress.empty()
+        running_totals.empty()
+    cache.put(cache_key, portfolio)
+    return portfolio
+
+
+def show_prospect_list():
+    """Upload a CSV of target accounts and compare their security budgets with sector TAM"""
+    st.subheader("Prospect List")
+    st.markdown("""
+    Upload a CSV of target accounts with an annual revenue column (in $M) and optionally account name, industry,
+    NAICS code and IT / security percentage columns. Accounts are matched to industry presets by industry name,
+    then by NAICS code; per-account percentages override the industry typical values.
+    """)
+    uploaded = st.file_uploader("Prospect CSV", type=["csv"], key="prospect_upload")
+    if uploaded is None:
+        return
+    portfolio = score_uploaded_prospects(uploaded)
+    if portfolio is None:
+        return
+
+    naics_data = load_naics_revenue_data()
+    sector_tam = compute_sector_tam(naics_data) if naics_data is not None else None
+    total_tam = sector_tam["Security Budget ($M)"].sum() if sector_tam is not None else 0
+
+    accounts_col, budget_col, share_col = st.columns(3)
+    with accounts_col:
+        st.metric("Accounts Scored", f"{portfolio.accounts:,}")
+    with budget_col:
+        st.metric("Portfolio Security Budget", f"${portfolio.security_budget:,.1f}M")
+    with share_col:
+        st.metric("Share of Security TAM",
+                  f"{portfolio.security_budget / total_tam * 100:.2f}%" if total_tam > 0 else "N/A")
+    if portfolio.skipped:
+        st.caption(f"Skipped {portfolio.skipped:,} of {portfolio.rows:,} rows without a positive annual revenue.")
+
+    money_format = st.column_config.NumberColumn(format="$%.2fM")
+    industry_df = portfolio.by_industry()
+    if sector_tam is not None:
+        industry_df["Security TAM ($M)"] = industry_df["Industry"].map(industry_tam(sector_tam))
+        industry_df["Share of TAM (%)"] = industry_df["Security Budget ($M)"] / industry_df["Security TAM ($M)"] * 100
+    st.markdown("**By Industry**")
+    st.dataframe(
+        industry_df,
+        hide_index=True,
+        use_container_width=True,
+        column_config={column: money_format for column in industry_df.columns if column.endswith("($M)")}
+    )
+    show_export_controls("prospect_industries", lambda fmt: export_frame(industry_df, fmt),
+                         key="prospect_industry_export")
+
+    if "naics" in portfolio.columns:
+        sector_df = portfolio.by_sector()
+        if sector_tam is not None:
+            sector_df["Security TAM ($M)"] = sector_df["Sector"].map(sector_tam.set_index("Sector")["Security Budget ($M)"])
+            sector_df["Share of TAM (%)"] = sector_df["Security Budget ($M)"] / sector_df["Security TAM ($M)"] * 100
+        with st.expander("By NAICS Sector"):
+            st.dataframe(
+                sector_df,
+                hide_index=True,
+                use_container_width=True,
+                column_config={column: money_format for column in sector_df.columns if column.endswith("($M)")}
+            )
+            show_export_controls("prospect_sectors", lambda fmt: export_frame(sector_df, fmt),
+                                 key="prospect_sector_export")
+
+    top_accounts = portfolio.top_accounts
+    with st.expander(f"Largest {len(top_accounts):,} Accounts by Security Budget"):
+        st.dataframe(
+            top_accounts,
+            hide_index=True,
+            use_container_width=True,
+            column_config={column: money_format for column in top_accounts.columns if column.endswith("($M)")}
+        )
+        show_export_controls("prospect_accounts", lambda fmt: export_frame(top_accounts, fmt),
+                             key="prospect_accounts_export")
+
+
+def show_scenario_diff(store, owner, calculations, revenue_array):
+    """Compare two or more saved calculations across the chart revenue points and NAICS sectors"""
+    st.subheader("Compare Saved Calculations")
+    st.markdown("""
+    Pick two or more saved calculations (from any page of the history) to see how their security budgets differ
+    from a baseline at every chart revenue point and in every NAICS sector's security TAM.
+    """)
+    # Selections are labelled by store id, so picks from other pages stay selectable
+    selected_ids = [int(label[1:].split(" ", 1)[0]) for label in st.session_state.get("scenario_diff_selection", [])]
+    selection_key = ("scenario_diff", owner, tuple(selected_ids), store.count(owner))
+    session_derived = derived_cache()
+    if selection_key not in session_derived:
+        for key in [k for k in session_derived if k[0] == "scenario_diff"]:
+            del session_derived[key]
+        session_derived[selection_key] = store.fetch_ids(owner, selected_ids)
+    selected = {row[0]: row for row in scenario_rows(session_derived[selection_key])}
+
+    options = [scenario_label(*row) for row in selected.values()]
+    options += [label for label in (scenario_label(*row) for row in scenario_rows(calculations)) if label not in options]
+    # Drop picks that were deleted from the store
+    st.session_state.scenario_diff_selection = [
+        scenario_label(*selected[scenario_id]) for scenario_id in selected_ids if scenario_id in selected
+    ]
+    picked = st.multiselect("Saved calculations", options, key="scenario_diff_selection")
+    if len(picked) < 2:
+        st.info("Select at least two saved calculations to compare.")
+        return
+    if st.session_state.get("scenario_diff_baseline") not in picked:
+        st.session_state.pop("scenario_diff_baseline", None)
+    baseline_label = st.selectbox("Baseline", picked, key="scenario_diff_baseline")
+
+    scenarios = tuple(selected[int(label[1:].split(" ", 1)[0])] for label in picked)
+    diff = get_scenario_diff(scenarios, tuple(revenue_array.tolist()), picked.index(baseline_label),
+                             sector_preset_key(), vintage_key())
+
+    money_format = st.column_config.NumberColumn(format="$%.2fM")
+    summary_df = diff.summary()
+    st.dataframe(
+        summary_df,
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            **{column: money_format for column in summary_df.columns if column.endswith("($M)")},
+            "Security Budget (% of revenue)": st.column_config.NumberColumn(format="%.3f%%"),
+            "Difference vs Baseline (%)": st.column_config.NumberColumn(format="%+.1f%%")
+        }
+    )
+    st.caption("""
+    Budgets scale with revenue, so budget lines never cross above $0. The crossover revenue is where each
+    calculation's budget reaches the baseline's budget at the baseline's saved revenue.
+    """)
+    points = len(diff.revenue)
+    plotly_chart(
+        submit_figure(create_scenario_diff_chart, diff.labels, diff.revenue, diff.delta[:, :points], diff.sectors,
+                      diff.delta[:, points:], diff.baseline),
+        use_container_width=True,
+        config={'displaylogo': False}
+    )
+
+    with st.expander("Differences by Revenue Point"):
+        revenue_df = diff.by_revenue()
+        st.dataframe(revenue_df, hide_index=True, use_container_width=True,
+                     column_config={column: money_format for column in revenue_df.columns if column.endswith("($M)")})
+        show_export_controls("scenario_diff_revenue", lambda fmt: export_frame(revenue_df, fmt),
+                             key="scenario_diff_revenue_export")
+    if diff.sectors:
+        with st.expander("Differences by NAICS Sector"):
+            sector_df = diff.by_sector()
+            st.dataframe(sector_df, hide_index=True, use_container_width=True,
+                         column_config={column: money_format for column in sector_df.columns if column.endswith("($M)")})
+            show_export_controls("scenario_diff_sectors", lambda fmt: export_frame(sector_df, fmt),
+                                 key="scenario_diff_sector_export")
+    with st.expander("Crossover Revenues"):
+        st.markdown("Revenue ($M) at which each calculation (rows) reaches the budget another calculation "
+                    "(columns) has at its saved revenue.")
+        crossover_df = diff.crossover()
+        st.dataframe(crossover_df.style.format("${:,.1f}M", na_rep="-"), use_container_width=True)
+
+
 def show():
     """Display the Budget Calculator page with interactive elements"""
     
@@ -55,11 +487,17 @@ def show():
         </style>
     """, unsafe_allow_html=True)
     
+    # Values last set in the browser-side chart take effect before the sliders are created
+    apply_client_chart_values()
+    
     # Budget Controls in Sidebar
     with st.sidebar:
         st.header("Budget Controls")
         
         # Industry selection - changed from selectbox to radio buttons
+        # (fall back to the default if a preset reload removed the selected industry)
+        if st.session_state.selected_industry not in INDUSTRY_PRESETS:
+            st.session_state.selected_industry = "Weighted Average"
         selected_industry = st.radio(
             "Select Industry",
             options=list(INDUSTRY_PRESETS.keys()),
@@ -113,6 +551,34 @@ def show():
             key="max_chart_revenue_slider"
         )
         st.session_state.max_chart_revenue = max_chart_revenue
+        
+        # Recompute the budget chart in the browser while dragging instead of rerunning the page
+        client_chart = st.toggle(
+            "Browser-side chart",
+            key="client_chart_mode",
+            help="Adjust the selection with controls inside the chart; the page updates when you release them"
+        )
+        
+        # Save the current calculation to the scenario store
+        store = get_scenario_store()
+        owner = get_scenario_owner()
+        if st.button("Save Current Calculation", use_container_width=True):
+            store.add(owner, selected_industry, it_percentage, security_percentage, annual_revenue)
+            st.toast("Calculation saved")
+    
+    # Load only the visible page of saved calculations
+    total_calculations = store.count(owner)
+    last_page = max(0, (total_calculations - 1) // SCENARIO_PAGE_SIZE)
+    if st.session_state.scenario_page > last_page:
+        st.session_state.scenario_page = last_page
+    page_key = ("scenario_page", owner, st.session_state.scenario_page, total_calculations)
+    session_derived = derived_cache()
+    if page_key not in session_derived:
+        # Keep only the latest page; it is reloaded from the store if evicted while idle
+        for key in [k for k in session_derived if k[0] == "scenario_page"]:
+            del session_derived[key]
+        session_derived[page_key] = store.fetch_page(owner, st.session_state.scenario_page, SCENARIO_PAGE_SIZE)
+    calculations = session_derived[page_key]
     
     # Main content area
     st.header("Interactive Security Budget Calculator")
@@ -121,64 +587,14 @@ def show():
     st.subheader("Calculated Budgets")
     st.markdown("Below are your calculated budgets based on the selected percentages. The delta values show the percentage relationship between each budget level.")
     
-    # Calculate budgets
-    it_budget = annual_revenue * (it_percentage / 100)
-    security_budget = it_budget * (security_percentage / 100)
-    
-    # Display metrics in columns
-    metric_col1, metric_col2, metric_col3 = st.columns(3)
-    
-    with metric_col1:
-        st.metric(
-            "Annual Revenue",
-            f"${annual_revenue:.2f}M"
-        )
-        
-    with metric_col2:
-        st.metric(
-            "IT Budget",
-            f"${it_budget:.2f}M",
-            f"↑ {it_percentage}% of Revenue"
-        )
-        
-    with metric_col3:
-        st.metric(
-            "Security Budget",
-            f"${security_budget:.2f}M",
-            f"↑ {security_percentage}% of IT Budget"
-        )
-    
-    # Add donut chart
-    donut_fig = create_budget_donut_chart(annual_revenue, it_percentage, security_percentage)
-    st.plotly_chart(donut_fig, use_container_width=True)
-    
-    # Add explanation of the donut chart
-    st.markdown("""
-    Understanding the Budget Breakdown:
-    - The outer ring shows how your total revenue is divided
-    - Green section: Security budget (% of IT budget)
-    - Teal section: IT budget (other than security)
-    - Gray section: Revenue
-    - Hover over sections to see detailed values
-    """)
-    
-    st.divider()
-    
-    # Security Budget Chart section
-    st.subheader("Security Budget Chart")
-    st.markdown("""
-    This chart visualizes security budgets across different revenue points:
-    - **Grouped Bars**: Show security budgets at different percentages around your selected value
-    - **Trend Lines**: Display industry typical ranges
-    - **Hover**: Mouse over elements to see detailed values
-    """)
-    
     # Generate revenue array for the chart
     revenue_array = generate_revenue_array(max_chart_revenue)
     x_positions = np.arange(len(revenue_array))
     
-    # Create the chart
-    fig = create_security_budget_chart(
+    # Start building the charts
+    donut_fig = submit_figure(create_budget_donut_chart, annual_revenue, it_percentage, security_percentage)
+    fig = submit_figure(
+        create_security_budget_chart,
         revenue_array=revenue_array,
         x_positions=x_positions,
         current_it=it_percentage,
@@ -190,39 +606,139 @@ def show():
         min_security_percentage=float(preset["security_min"]),
         max_security_percentage=float(preset["security_max"]),
         typical_security_percentage=float(preset["security_typical"]),
-        chart_colors=CHART_COLORS
+        chart_colors=CHART_COLORS,
+        calculations=calculations
     )
     
-    # Display the chart
-    st.plotly_chart(
-        fig, 
+    if client_chart:
+        st.markdown("""
+        The metrics and charts below update in your browser as you drag. The rest of the page
+        updates when you release a control.
+        """)
+        client_budget_chart(fig.figure(), donut_fig.figure(), revenue_array, it_percentage, security_percentage,
+                            annual_revenue, preset)
+    else:
+        show_server_charts(fig, donut_fig, annual_revenue, it_percentage, security_percentage)
+    
+    st.divider()
+    
+    # Sensitivity heatmap section
+    st.subheader("Budget Sensitivity")
+    st.markdown(f"""
+    Security budget at ${annual_revenue}M revenue for every IT and security percentage in the {selected_industry}
+    range (0.1% steps). Hover over the heatmap to explore the surface without moving the sliders.
+    """)
+    it_values, security_values, surface = get_sensitivity_surface(
+        selected_industry, annual_revenue, PRESETS.dependency_key([selected_industry])
+    )
+    plotly_chart(
+        submit_figure(create_sensitivity_heatmap, it_values, security_values, surface, it_percentage,
+                      security_percentage, preset),
         use_container_width=True,
-        config={
-            'displayModeBar': True,
-            'responsive': True,
-            'displaylogo': False,
-            'modeBarButtonsToRemove': ['lasso2d', 'select2d'],
-            'toImageButtonOptions': {'format': 'png', 'filename': 'security_budget_chart'},
-        }
+        config={'displaylogo': False, 'modeBarButtonsToRemove': ['lasso2d', 'select2d']}
     )
     
     st.divider()
     
+    # Multi-year projection section
+    st.subheader("Multi-Year Budget Projection")
+    assumptions = current_growth_assumptions().set_index("Industry")
+    growth_row = assumptions.loc[selected_industry] if selected_industry in assumptions.index \
+        else assumptions.loc["Weighted Average"]
+    growth = growth_row[list(GROWTH_COLUMNS.values())].to_numpy(dtype=float)
+    st.markdown(f"""
+    Revenue growing {growth[0]:g}%/yr, IT share {growth[1]:g}%/yr and security share {growth[2]:g}%/yr
+    (edit the growth assumptions on the Sector TAM Analysis page).
+    """)
+    years = st.session_state.get("projection_years", DEFAULT_PROJECTION_YEARS)
+    projection_df = project_company_budget(annual_revenue, it_percentage, security_percentage, growth, years)
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        plotly_chart(submit_figure(create_budget_projection_chart, projection_df), use_container_width=True,
+                     config={'displaylogo': False})
+    with col2:
+        st.dataframe(projection_df.style.format("${:,.2f}"), use_container_width=True)
+    
+    st.divider()
+    
+    # All-industry comparison section
+    st.subheader("Compare All Industries")
+    st.markdown("""
+    Minimum, typical and maximum security budgets for every preset and custom industry at each chart revenue point,
+    so industries can be compared without switching the industry selection.
+    """)
+    custom_industries = st.session_state.custom_industries
+    comparison_key = (industry_content_hash(custom_industries), tuple(revenue_array.tolist()))
+    comparison_inputs, comparison_df = get_industry_comparison(*comparison_key, custom_industries)
+    plotly_chart(cached_figure(comparison_key, create_industry_comparison_chart, *comparison_inputs),
+                 use_container_width=True, config={'displaylogo': False})
+    with st.expander("Comparison Table"):
+        st.dataframe(
+            comparison_df,
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                column: st.column_config.NumberColumn(column, format="$%.2fM")
+                for column in comparison_df.columns[2:]
+            }
+        )
+        show_export_controls("industry_comparison", lambda fmt: export_frame(comparison_df, fmt),
+                             key="industry_comparison_export")
+    
+    st.divider()
+    
     # Budget Table section
     st.subheader("Budget Breakdown Table")
     
     # Create a container with fixed height for the table
     table_container = st.container()
     with table_container:
-        df = create_budget_table(revenue_array, it_percentage, security_percentage)
+        df = create_budget_table(revenue_array, it_percentage, security_percentage, calculations)
         styled_df = df.style.apply(highlight_selected_revenue, axis=1)
         st.dataframe(styled_df, hide_index=True, use_container_width=True)
+        show_export_controls(
+            "security_budget_table",
+            lambda fmt: export_budget_table(
+                revenue_array, it_percentage, security_percentage,
+                calculations.it_percentage, calculations.security_percentage, calculations.offset, fmt
+            ),
+            key="budget_table_export"
+        )
     
     st.caption(f"""
     Table shows security budgets at different revenue tiers with {it_percentage}% IT budget.
     Your current revenue is highlighted. Security columns show budget at 5%, 10%, 15%, 20%, and your selected {security_percentage}% of IT budget.
     """)
     
+    # Saved calculations paging
+    if total_calculations > 0:
+        page_col, info_col, clear_col = st.columns([1, 2, 1])
+        with page_col:
+            st.number_input(
+                "Saved Calculations Page",
+                min_value=0,
+                max_value=last_page,
+                step=1,
+                key="scenario_page"
+            )
+        with info_col:
+            st.markdown(f"Showing saved calculations {calculations.offset + 1}-{calculations.offset + len(calculations)} "
+                        f"of {total_calculations} in the chart and table above.")
+        with clear_col:
+            if st.button("Clear Saved Calculations"):
+                store.clear(owner)
+                st.rerun()
+    
+        st.divider()
+        
+        # Scenario comparison section
+        show_scenario_diff(store, owner, calculations, revenue_array)
+    
+    st.divider()
+    
+    # Prospect list section
+    show_prospect_list()
+    
     st.divider()
     
     # Industry Context section
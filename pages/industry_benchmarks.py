@@ -2,144 +2,101 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import numpy as np
-from data import INDUSTRY_PRESETS
+from data import INDUSTRY_PRESETS, industry_content_hash
+from session_memory import CUSTOM_INDUSTRY_FIELDS
+from preset_registry import PRESETS
+from metrics import track_cache
+from figure_pool import cached_figure, plotly_chart
 
-def show():
-    """Display the Industry Benchmarks page with comparative charts and data"""
-    
-    st.header("Industry Budget Benchmarks")
-    
-    st.markdown("""
-    This tab provides benchmark data on IT and security spending across different industries. 
-    Use this information to understand typical customer budgets and align your pricing strategy.
-    """)
-    
-    # Display industry benchmarks
-    st.subheader("IT Budget as Percentage of Revenue")
-    
-    # Combine standard and custom industries for charts
-    all_industries = {**INDUSTRY_PRESETS}
-    for name, data in st.session_state.custom_industries.items():
-        all_industries[name] = {
-            "it_min": data["it_min"],
-            "it_typical": data["it_typical"],
-            "it_max": data["it_max"],
-            "security_min": data["security_min"],
-            "security_typical": data["security_typical"],
-            "security_max": data["security_max"]
-        }
-    
-    industry_it_chart_data = pd.DataFrame({
-        'Industry': list(all_industries.keys()),
-        'Min IT %': [all_industries[ind]['it_min'] for ind in all_industries],
-        'Typical IT %': [all_industries[ind]['it_typical'] for ind in all_industries],
-        'Max IT %': [all_industries[ind]['it_max'] for ind in all_industries],
-    })
-    
-    # Create horizontal bar chart for IT budget percentages
-    it_fig = go.Figure()
-    
-    it_fig.add_trace(go.Bar(
-        y=industry_it_chart_data['Industry'],
-        x=industry_it_chart_data['Max IT %'] - industry_it_chart_data['Min IT %'],
-        base=industry_it_chart_data['Min IT %'],
-        name='IT Budget Range',
-        marker_color='#96E4B0',  # Mint green
-        orientation='h',
-        text=[f"{min_val}% - {max_val}%" for min_val, max_val in 
-              zip(industry_it_chart_data['Min IT %'], industry_it_chart_data['Max IT %'])],
-        textposition='auto',
-        hovertemplate='%{y}: %{text}<extra></extra>'
-    ))
-    
-    it_fig.add_trace(go.Scatter(
-        y=industry_it_chart_data['Industry'],
-        x=industry_it_chart_data['Typical IT %'],
-        mode='markers',
-        name='Typical Value',
-        marker=dict(color='#008581', size=12, symbol='diamond'),  # Teal
-        hovertemplate='%{y}: %{x}%<extra>Typical</extra>'
-    ))
-    
-    it_fig.update_layout(
-        title='IT Budget Range by Industry (% of Revenue)',
-        xaxis_title='Percentage of Revenue',
-        yaxis=dict(
-            title='Industry',
-            categoryorder='total ascending'
-        ),
-        height=500,
-        margin=dict(l=10, r=10, t=80, b=50),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
-        ),
-        plot_bgcolor='white',
-        xaxis=dict(
-            showgrid=True,
-            gridcolor='lightgray',
-            ticksuffix='%',
-        )
-    )
-    
-    # Display the IT budget chart
-    st.plotly_chart(
-        it_fig, 
-        use_container_width=True,
-        config={
-            'displayModeBar': True,
-            'responsive': True,
-            'displaylogo': False,
-            'modeBarButtonsToRemove': ['lasso2d', 'select2d'],
-            'toImageButtonOptions': {'format': 'png', 'filename': 'it_budget_benchmarks'},
-        }
-    )
-    
-    # Create a similar chart for security budget percentages
-    st.subheader("Security Budget as Percentage of IT Spend")
-    industry_sec_chart_data = pd.DataFrame({
-        'Industry': list(all_industries.keys()),
-        'Min Security %': [all_industries[ind]['security_min'] for ind in all_industries],
-        'Typical Security %': [all_industries[ind]['security_typical'] for ind in all_industries],
-        'Max Security %': [all_industries[ind]['security_max'] for ind in all_industries],
-    })
-    
-    # Create horizontal bar chart for security budget percentages
-    sec_fig = go.Figure()
-    
-    sec_fig.add_trace(go.Bar(
-        y=industry_sec_chart_data['Industry'],
-        x=industry_sec_chart_data['Max Security %'] - industry_sec_chart_data['Min Security %'],
-        base=industry_sec_chart_data['Min Security %'],
-        name='Security Budget Range',
-        marker_color='#FFDAE8',  # Light pink
+# Preset industries in bubble chart order, with shortened names for better display
+BUBBLE_CHART_ORDER = [
+    ('Retail', 'Retail'),
+    ('Manufacturing', 'Manufacturing'),
+    ('Transportation', 'Transportation & Logistics'),
+    ('Energy', 'Energy & Utilities'),
+    ('Education', 'Education'),
+    ('Healthcare', 'Healthcare'),
+    ('Weighted Avg', 'Weighted Average'),
+    ('Government', 'Government/Public Sector'),
+    ('Financial', 'Financial Services'),
+    ('Technology', 'Technology')
+]
+
+BENCHMARK_FIELDS = list(CUSTOM_INDUSTRY_FIELDS)
+
+# Above this many industries the bubble chart labels use text traces instead of one annotation per label
+BUBBLE_ANNOTATION_LIMIT = 25
+
+# Rows per page of the reference table and the custom industry list
+REFERENCE_PAGE_SIZE = 50
+
+# Custom industries listed individually before switching to a table
+CUSTOM_LIST_LIMIT = 10
+
+
+def build_industry_table(presets, custom_industries):
+    """One columnar table of all preset and custom industries"""
+    preset_df = pd.DataFrame.from_dict(dict(presets), orient="index", columns=BENCHMARK_FIELDS)
+    preset_df["is_custom"] = False
+    
+    if hasattr(custom_industries, "columns"):
+        custom_names, custom_columns = custom_industries.columns()
+        custom_df = pd.DataFrame(custom_columns, index=custom_names, columns=BENCHMARK_FIELDS)
+    else:
+        custom_df = pd.DataFrame.from_dict(dict(custom_industries), orient="index", columns=BENCHMARK_FIELDS)
+    custom_df["is_custom"] = True
+    
+    # Custom industries override presets with the same name
+    table = pd.concat([preset_df[~preset_df.index.isin(custom_df.index)], custom_df])
+    table.index.name = "Industry"
+    table = table.reset_index()
+    
+    # Bubble chart order: presets in display order, then any other presets, then custom industries
+    short_names = {full: short for short, full in BUBBLE_CHART_ORDER}
+    order = {full: idx for idx, (_, full) in enumerate(BUBBLE_CHART_ORDER)}
+    table["Short Name"] = [
+        name if custom else short_names.get(name, name)
+        for name, custom in zip(table["Industry"], table["is_custom"])
+    ]
+    bubble_order = table["Industry"].map(order).where(~table["is_custom"])
+    table["bubble_order"] = bubble_order.fillna(len(order))  # Stable sort keeps the rest in table order
+    return table
+
+
+def create_range_chart(table, field, title, xaxis_title, range_name, range_color, typical_color):
+    """Horizontal range bar chart with typical markers for one benchmark (it or security)"""
+    low, typical, high = table[f"{field}_min"], table[f"{field}_typical"], table[f"{field}_max"]
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        y=table['Industry'],
+        x=high - low,
+        base=low,
+        name=range_name,
+        marker_color=range_color,
         orientation='h',
-        text=[f"{min_val}% - {max_val}%" for min_val, max_val in 
-              zip(industry_sec_chart_data['Min Security %'], industry_sec_chart_data['Max Security %'])],
+        text=[f"{min_val:g}% - {max_val:g}%" for min_val, max_val in zip(low, high)],
         textposition='auto',
         hovertemplate='%{y}: %{text}<extra></extra>'
     ))
     
-    sec_fig.add_trace(go.Scatter(
-        y=industry_sec_chart_data['Industry'],
-        x=industry_sec_chart_data['Typical Security %'],
+    fig.add_trace(go.Scatter(
+        y=table['Industry'],
+        x=typical,
         mode='markers',
         name='Typical Value',
-        marker=dict(color='#E4509A', size=12, symbol='diamond'),  # Dark pink
+        marker=dict(color=typical_color, size=12, symbol='diamond'),
         hovertemplate='%{y}: %{x}%<extra>Typical</extra>'
     ))
     
-    sec_fig.update_layout(
-        title='Security Budget Range by Industry (% of IT Budget)',
-        xaxis_title='Percentage of IT Budget',
+    fig.update_layout(
+        title=title,
+        xaxis_title=xaxis_title,
         yaxis=dict(
             title='Industry',
             categoryorder='total ascending'
         ),
-        height=500,
+        height=max(500, 22 * len(table) + 130),  # Keep bars readable as industries are added
         margin=dict(l=10, r=10, t=80, b=50),
         legend=dict(
             orientation="h",
@@ -155,83 +112,12 @@ def show():
             ticksuffix='%',
         )
     )
-    
-    # Display the security budget chart
-    st.plotly_chart(
-        sec_fig, 
-        use_container_width=True,
-        config={
-            'displayModeBar': True,
-            'responsive': True,
-            'displaylogo': False,
-            'modeBarButtonsToRemove': ['lasso2d', 'select2d'],
-            'toImageButtonOptions': {'format': 'png', 'filename': 'security_budget_benchmarks'},
-        }
-    )
-    
-    # Add bubble chart for industry benchmarks
-    st.subheader("Industry Budget Distribution")
-    st.markdown("""
-    This bubble chart shows the relationship between industries and their budget allocations.
-    - Bubble size represents the combined IT and security budget
-    - Larger bubbles indicate higher total investment in technology
-    """)
-    
-    # Create data for bubble chart
-    bubble_data = []
-    
-    # Define industries in desired order
-    industries = [
-        'Retail',
-        'Manufacturing',
-        'Transportation',  # Shortened for better display
-        'Energy',  # Shortened for better display
-        'Education',
-        'Healthcare',
-        'Weighted Avg',  # Shortened for better display
-        'Government',  # Shortened for better display
-        'Financial',  # Shortened for better display
-        'Technology'
-    ]
-    
-    # Add custom industries to the list
-    industries.extend(list(st.session_state.custom_industries.keys()))
-    
-    for industry in industries:
-        base_industry = industry
-        if industry == 'Transportation':
-            base_industry = 'Transportation & Logistics'
-        elif industry == 'Energy':
-            base_industry = 'Energy & Utilities'
-        elif industry == 'Weighted Avg':
-            base_industry = 'Weighted Average'
-        elif industry == 'Government':
-            base_industry = 'Government/Public Sector'
-        elif industry == 'Financial':
-            base_industry = 'Financial Services'
-            
-        # Check if it's a custom industry
-        if industry in st.session_state.custom_industries:
-            custom_data = st.session_state.custom_industries[industry]
-            bubble_data.append({
-                'Industry': industry,
-                'Full Industry': industry,
-                'IT Budget': custom_data['it_typical'],
-                'Security Budget': custom_data['security_typical']
-            })
-        elif base_industry in INDUSTRY_PRESETS:
-            it_typical = INDUSTRY_PRESETS[base_industry]['it_typical']
-            security_typical = INDUSTRY_PRESETS[base_industry]['security_typical']
-            
-            bubble_data.append({
-                'Industry': industry,
-                'Full Industry': base_industry,
-                'IT Budget': it_typical,
-                'Security Budget': security_typical
-            })
-    
-    # Convert to DataFrame
-    bubble_df = pd.DataFrame(bubble_data)
+    return fig
+
+
+def create_bubble_chart(table):
+    """Bubble chart of typical IT budget with bubble size from typical security budget"""
+    bubble_df = table.sort_values("bubble_order", kind="stable").reset_index(drop=True)
     
     # Create evenly spaced x-coordinates
     x_positions = np.arange(len(bubble_df))
@@ -239,52 +125,73 @@ def show():
     # Create bubble chart
     bubble_fig = go.Figure()
     
+    # Label with annotations for small sets; annotations are serialised and laid out one by one in
+    # the browser, so large sets use text traces instead
+    use_annotations = len(bubble_df) <= BUBBLE_ANNOTATION_LIMIT
+    
     # Add bubble trace
     bubble_fig.add_trace(go.Scatter(
         x=x_positions,
-        y=bubble_df['IT Budget'],
-        mode='markers',  # Removed text mode since we'll add industry names as annotations
+        y=bubble_df['it_typical'],
+        mode='markers' if use_annotations else 'markers+text',
         marker=dict(
-            size=bubble_df['Security Budget'] * 5,  # Size based on security budget
+            size=bubble_df['security_typical'] * 5,  # Size based on security budget
             color='rgba(147, 224, 220, 0.8)',  # Lighter turquoise with more opacity
             line=dict(color='rgba(147, 224, 220, 0.9)', width=1)
         ),
+        texttemplate=None if use_annotations else '%{y:.1f}%',
+        textposition='top center',
+        textfont=dict(size=14, color='rgba(0, 0, 0, 0.7)', family='Arial'),
         hovertemplate="<b>%{customdata[0]}</b><br>" +
                      "IT Budget: %{y:.1f}%<br>" +
                      "Security Budget: %{marker.size/5:.1f}%<extra></extra>",
-        customdata=bubble_df[['Full Industry']].values,
+        customdata=bubble_df[['Industry']].values,
         name=''
     ))
     
-    # Add annotations for IT budget values above bubbles
-    for idx, row in bubble_df.iterrows():
-        # Add IT Budget percentage above bubble
-        bubble_fig.add_annotation(
-            x=x_positions[idx],
-            y=row['IT Budget'],
-            text=f"{row['IT Budget']:.1f}%",
-            yshift=35,
-            showarrow=False,
-            font=dict(
-                size=14,
-                color='rgba(0, 0, 0, 0.7)',
-                family='Arial'
+    if use_annotations:
+        # Add annotations for IT budget values above bubbles
+        for idx, row in bubble_df.iterrows():
+            # Add IT Budget percentage above bubble
+            bubble_fig.add_annotation(
+                x=x_positions[idx],
+                y=row['it_typical'],
+                text=f"{row['it_typical']:.1f}%",
+                yshift=35,
+                showarrow=False,
+                font=dict(
+                    size=14,
+                    color='rgba(0, 0, 0, 0.7)',
+                    family='Arial'
+                )
             )
-        )
-        # Add industry name below bubble
-        bubble_fig.add_annotation(
-            x=x_positions[idx],
-            y=row['IT Budget'],
-            text=row['Industry'],
-            yshift=-35,  # Position below bubble
-            showarrow=False,
-            font=dict(
-                size=12,
-                color='rgba(0, 0, 0, 0.7)',
-                family='Arial'
-            ),
-            textangle=-45  # Angle the text for better readability
-        )
+            # Add industry name below bubble
+            bubble_fig.add_annotation(
+                x=x_positions[idx],
+                y=row['it_typical'],
+                text=row['Short Name'],
+                yshift=-35,  # Position below bubble
+                showarrow=False,
+                font=dict(
+                    size=12,
+                    color='rgba(0, 0, 0, 0.7)',
+                    family='Arial'
+                ),
+                textangle=-45  # Angle the text for better readability
+            )
+    else:
+        # Industry names below the bubbles: invisible markers of the same size offset the text
+        bubble_fig.add_trace(go.Scatter(
+            x=x_positions,
+            y=bubble_df['it_typical'],
+            mode='markers+text',
+            marker=dict(size=bubble_df['security_typical'] * 5, opacity=0),
+            text=bubble_df['Short Name'],
+            textposition='bottom center',
+            textfont=dict(size=12, color='rgba(0, 0, 0, 0.7)', family='Arial'),
+            hoverinfo='skip',
+            name=''
+        ))
     
     # Calculate y-axis range with nice intervals
     max_y = 15  # Fixed max for better visualization
@@ -359,10 +266,135 @@ def show():
         ),
         align='left'
     )
+    return bubble_fig
+
+
+def create_reference_table(table):
+    """Industry benchmark reference table with formatted ranges"""
+    return pd.DataFrame({
+        'Industry': table['Industry'],
+        'IT Budget (% of Revenue)': [f"{low:g}-{high:g}%" for low, high in zip(table['it_min'], table['it_max'])],
+        'Security Budget (% of IT)': [f"{low:g}-{high:g}%" for low, high in zip(table['security_min'], table['security_max'])]
+    })
+
+
+def parse_custom_industry_csv(csv_file):
+    """Read custom industries from a CSV with a name column plus one column per benchmark field"""
+    df = pd.read_csv(csv_file)
+    df.columns = [str(column).strip().lower() for column in df.columns]
+    missing = [column for column in ["name"] + BENCHMARK_FIELDS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+    
+    names = df["name"].astype(str).str.strip()
+    values = df[BENCHMARK_FIELDS].apply(pd.to_numeric, errors="coerce")
+    invalid = (names == "") | (names == "nan") | values.isna().any(axis=1)
+    if invalid.any():
+        rows = ", ".join(str(row + 2) for row in np.flatnonzero(invalid.to_numpy())[:5])
+        raise ValueError(f"Missing name or non-numeric values in row(s) {rows}")
+    
+    values = values.to_numpy(dtype=float)
+    it_min, it_typical, it_max, sec_min, sec_typical, sec_max = values.T
+    unordered = (it_min > it_typical) | (it_typical > it_max) | (sec_min > sec_typical) | (sec_typical > sec_max)
+    if unordered.any():
+        rows = ", ".join(str(row + 2) for row in np.flatnonzero(unordered)[:5])
+        raise ValueError(f"Minimum, typical and maximum must be in ascending order (row(s) {rows})")
+    return names.tolist(), values
+
+
+def show_paginated_table(df, key, page_size=REFERENCE_PAGE_SIZE):
+    """Display a table one page at a time once it has more rows than fit on a page"""
+    if len(df) > page_size:
+        page_count = (len(df) - 1) // page_size + 1
+        page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, key=key)
+        start = (page - 1) * page_size
+        st.caption(f"Showing rows {start + 1:,}-{min(start + page_size, len(df)):,} of {len(df):,}")
+        df = df.iloc[start:start + page_size]
+    st.dataframe(df, hide_index=True, use_container_width=True)
+
+
+@track_cache(st.cache_resource, max_entries=64)
+def get_benchmark_views(content_hash, _custom_industries):
+    """Industry table and reference table, memoized on the preset+custom content hash"""
+    table = build_industry_table(INDUSTRY_PRESETS, _custom_industries)
+    return {
+        "table": table,
+        "reference_table": create_reference_table(table)
+    }
+
+
+def get_benchmark_figures(content_hash, table):
+    """Benchmark figures, built once per preset+custom content hash (FigureFutures until first built)"""
+    return {
+        "it_fig": cached_figure(
+            (content_hash, "it"), create_range_chart, table, "it", 'IT Budget Range by Industry (% of Revenue)', 'Percentage of Revenue',
+            'IT Budget Range', '#96E4B0', '#008581'  # Mint green, teal
+        ),
+        "sec_fig": cached_figure(
+            (content_hash, "security"), create_range_chart, table, "security", 'Security Budget Range by Industry (% of IT Budget)', 'Percentage of IT Budget',
+            'Security Budget Range', '#FFDAE8', '#E4509A'  # Light pink, dark pink
+        ),
+        "bubble_fig": cached_figure(content_hash, create_bubble_chart, table)
+    }
+
+
+def show():
+    """Display the Industry Benchmarks page with comparative charts and data"""
+    
+    st.header("Industry Budget Benchmarks")
+    
+    st.markdown("""
+    This tab provides benchmark data on IT and security spending across different industries. 
+    Use this information to understand typical customer budgets and align your pricing strategy.
+    """)
+    
+    # All data and figures are derived once per preset+custom industry set
+    custom_industries = st.session_state.custom_industries
+    content_hash = industry_content_hash(custom_industries)
+    views = get_benchmark_views(content_hash, custom_industries)
+    figures = get_benchmark_figures(content_hash, views["table"])
+    
+    # Display industry benchmarks
+    st.subheader("IT Budget as Percentage of Revenue")
+    
+    # Display the IT budget chart
+    plotly_chart(
+        figures["it_fig"], 
+        use_container_width=True,
+        config={
+            'displayModeBar': True,
+            'responsive': True,
+            'displaylogo': False,
+            'modeBarButtonsToRemove': ['lasso2d', 'select2d'],
+            'toImageButtonOptions': {'format': 'png', 'filename': 'it_budget_benchmarks'},
+        }
+    )
+    
+    # Display the security budget chart
+    st.subheader("Security Budget as Percentage of IT Spend")
+    plotly_chart(
+        figures["sec_fig"], 
+        use_container_width=True,
+        config={
+            'displayModeBar': True,
+            'responsive': True,
+            'displaylogo': False,
+            'modeBarButtonsToRemove': ['lasso2d', 'select2d'],
+            'toImageButtonOptions': {'format': 'png', 'filename': 'security_budget_benchmarks'},
+        }
+    )
+    
+    # Add bubble chart for industry benchmarks
+    st.subheader("Industry Budget Distribution")
+    st.markdown("""
+    This bubble chart shows the relationship between industries and their budget allocations.
+    - Bubble size represents the combined IT and security budget
+    - Larger bubbles indicate higher total investment in technology
+    """)
     
     # Display the bubble chart
-    st.plotly_chart(
-        bubble_fig, 
+    plotly_chart(
+        figures["bubble_fig"], 
         use_container_width=True,
         config={
             'displayModeBar': False,
@@ -372,28 +404,10 @@ def show():
     
     # Display industry benchmark reference table
     st.subheader("Industry Benchmark Reference Table")
+    show_paginated_table(views["reference_table"], "reference_table_page")
     
-    # Create DataFrame for the table
-    table_data = []
-    
-    # Add standard industries
-    for industry in all_industries.keys():
-        if industry != "Custom":  # Skip the "Custom" placeholder
-            table_data.append({
-                'Industry': industry,
-                'IT Budget (% of Revenue)': f"{all_industries[industry]['it_min']}-{all_industries[industry]['it_max']}%",
-                'Security Budget (% of IT)': f"{all_industries[industry]['security_min']}-{all_industries[industry]['security_max']}%"
-            })
-    
-    # Create and display DataFrame
-    table_df = pd.DataFrame(table_data)
-    st.dataframe(
-        table_df,
-        hide_index=True,
-        use_container_width=True
-    )
-    
-    st.caption("*Source: Compiled from industry data from Gartner, IDC, Deloitte, Flexera and custom inputs*")
+    st.caption("*Source: Compiled from industry data from Gartner, IDC, Deloitte, Flexera and custom inputs "
+               f"(benchmark data version {PRESETS.version})*")
     
     # Move custom industry section to bottom as expandable
     with st.expander("➕ Add Custom Industry"):
@@ -439,21 +453,47 @@ def show():
             # Display custom industries
             if st.session_state.custom_industries:
                 st.markdown("##### Your Custom Industries")
-                for name, data in st.session_state.custom_industries.items():
-                    st.markdown(f"""
-                    **{name}**
-                    - IT Budget Range: {data['it_min']}% - {data['it_max']}%
-                    - Typical IT: {data['it_typical']}%
-                    - Security Budget Range: {data['security_min']}% - {data['security_max']}%
-                    - Typical Security: {data['security_typical']}%
-                    ---
-                    """)
+                if len(st.session_state.custom_industries) <= CUSTOM_LIST_LIMIT:
+                    for name, data in st.session_state.custom_industries.items():
+                        st.markdown(f"""
+                        **{name}**
+                        - IT Budget Range: {data['it_min']}% - {data['it_max']}%
+                        - Typical IT: {data['it_typical']}%
+                        - Security Budget Range: {data['security_min']}% - {data['security_max']}%
+                        - Typical Security: {data['security_typical']}%
+                        ---
+                        """)
+                else:
+                    names, columns = st.session_state.custom_industries.columns()
+                    show_paginated_table(pd.DataFrame({"Industry": names, **columns}), "custom_industry_page")
                 
                 if st.button("Clear All Custom Industries"):
-                    st.session_state.custom_industries = {}
+                    st.session_state.custom_industries.clear()
+                    # Empty the uploader too, so the cleared import is neither shown nor re-applied
+                    st.session_state.pop("custom_industry_csv_file_id", None)
+                    st.session_state.custom_industry_csv_uploads = st.session_state.get("custom_industry_csv_uploads", 0) + 1
                     st.rerun()
             else:
                 st.info("No custom industries added yet. Use the form on the left to add your first industry.")
+        
+        # Bulk import from CSV
+        st.markdown("##### Import from CSV")
+        st.caption(f"Columns: name, {', '.join(BENCHMARK_FIELDS)}. Existing industries with the same name are replaced.")
+        csv_file = st.file_uploader("Custom industries CSV", type="csv",
+                                    key=f"custom_industry_csv_{st.session_state.get('custom_industry_csv_uploads', 0)}")
+        if csv_file is not None:
+            # The uploader keeps its file across reruns, so only import each upload once
+            if st.session_state.get("custom_industry_csv_file_id") != csv_file.file_id:
+                try:
+                    names, values = parse_custom_industry_csv(csv_file)
+                except (ValueError, pd.errors.ParserError) as e:
+                    st.error(f"Could not import custom industries: {e}")
+                else:
+                    st.session_state.custom_industries.update_many(names, values)
+                    st.session_state.custom_industry_csv_file_id = csv_file.file_id
+                    st.rerun()
+            else:
+                st.success(f"Imported custom industries from {csv_file.name}")
     
     # References and methodology
     with st.expander("Methodology and References", expanded=False):
@@ -11,40 +11,208 @@ from data import (
     INDUSTRY_IT_SPEND,
     INDUSTRY_SECURITY_SPEND,
     NAICS_REVENUE_TIERS,
-    NAICS_SECTORS,
-    REVENUE_TIERS,
-    REVENUE_TIER_COUNTS
+    NAICS_TO_SECTOR,
+    NAICS_VINTAGE_KEY,
+    get_vintage_store,
+    load_naics_code_table,
+    vintage_key
 )
+from naics_vintages import NAICS_SOURCE_GLOB, vintage_label
+from calculations import compute_tier_tam
+from exports import export_frame
+from utils import show_export_controls
+from naics_mapping import get_naics_mapping
+from naics_search import get_naics_search_index
+from metrics import track_cache
+from figure_pool import plotly_chart, submit_figure
 
-# Load NAICS Data
-@st.cache_data
-def load_naics_data():
-    """Create a DataFrame from the NAICS sectors and revenue tiers"""
-    # Create expanded data for each NAICS sector across revenue tiers
-    expanded_data = []
+# Most search matches offered in the selection at once
+NAICS_SEARCH_LIMIT = 50
+
+
+def selected_code_tier_tam(search_index, labels):
+    """Tier TAM over the workbook codes covered by the selected sectors and codes (None without workbook data)"""
+    code_table = load_naics_code_table()
+    if code_table is None:
+        return None
+    rows = search_index.code_rows([search_index.entry_ids[label] for label in labels], code_table.index)
+    selected = code_table.iloc[rows]
+    presets = get_naics_mapping().percentages(selected.index)
+    tier_columns = [column for column in NAICS_REVENUE_TIERS if column != "Uncoded records"]
+    return compute_tier_tam(presets["it_typical"], presets["security_typical"],
+                            selected[tier_columns].to_numpy(dtype=float))
+
+
+def create_revenue_tier_chart(chart_df):
+    """Bar chart of businesses per revenue tier (log scale)"""
+    fig_naics = go.Figure()
     
-    for sector in NAICS_SECTORS:
-        # Distribute the companies across revenue tiers based on overall distribution
-        total_companies = sum(REVENUE_TIER_COUNTS.values())
-        
-        for low, high in REVENUE_TIERS:
-            # Get the count for this tier
-            tier_count = REVENUE_TIER_COUNTS[(low, high)]
-            # Calculate the sector's proportion of companies in this tier
-            sector_count = round(tier_count / len(NAICS_SECTORS))  # Evenly distribute across sectors
-            
-            if sector_count > 0:
-                expanded_data.append({
-                    "NAICS Code": sector["code"],
-                    "NAICS Name": sector["name"],
-                    "Sales ($Mil) Low": low,
-                    "Sales ($Mil) High": high if high != float('inf') else 100000,
-                    "Company Count": sector_count
-                })
+    # Add bars
+    fig_naics.add_trace(go.Bar(
+        x=chart_df["Revenue Range"],
+        y=chart_df["Number of Businesses"],
+        texttemplate="%{y:,.0f}",
+        textposition="outside",
+        marker_color="rgba(60, 120, 216, 0.7)",
+        name="Number of Businesses"
+    ))
+    
+    # Update layout
+    fig_naics.update_layout(
+        title="U.S. Business Distribution by Revenue Tier",
+        xaxis_title="Annual Revenue Range",
+        yaxis_title="Number of Businesses",
+        height=500,
+        font=dict(family="Arial, sans-serif", size=12),
+        plot_bgcolor='rgba(240, 240, 240, 0.8)',
+        showlegend=False,
+        margin=dict(t=50, b=100)  # Increase bottom margin for rotated labels
+    )
+    
+    # Rotate x-axis labels for better readability
+    fig_naics.update_xaxes(
+        tickangle=45,
+        tickfont=dict(size=10)
+    )
+    
+    # Use log scale for y-axis due to large range
+    fig_naics.update_yaxes(type="log")
+    
+    return fig_naics
+
+
+def create_tier_tam_bubble_chart(chart_data):
+    """Staggered bubbles of IT and security TAM per revenue tier, with company counts"""
+    fig = go.Figure()
+
+    # Calculate bubble sizes using sqrt scale for better visual representation
+    max_it_tam = chart_data["IT Budget TAM Numeric"].max()
+    max_sec_tam = chart_data["Security TAM Numeric"].max()
+    
+    chart_data["IT Bubble Size"] = chart_data["IT Budget TAM Numeric"].apply(
+        lambda x: 40 + (60 * np.sqrt(x) / np.sqrt(max_it_tam)) if x > 0 else 20
+    )
+    chart_data["Security Bubble Size"] = chart_data["Security TAM Numeric"].apply(
+        lambda x: 30 + (50 * np.sqrt(x) / np.sqrt(max_sec_tam)) if x > 0 else 15
+    )
+
+    # Create y-axis positions for staggered layout
+    y_positions = np.arange(len(chart_data)) * 2  # Multiply by 2 for more spacing
+
+    # Add IT TAM bubbles
+    fig.add_trace(go.Scatter(
+        x=chart_data["Revenue Tier"],
+        y=y_positions,
+        mode="markers+text",
+        name="IT Budget TAM",
+        marker=dict(
+            size=chart_data["IT Bubble Size"],
+            color="rgba(65, 171, 93, 0.8)",
+            line=dict(width=2, color="rgba(65, 171, 93, 1)"),
+            symbol="circle",
+        ),
+        text=chart_data["IT Budget TAM ($M)"],
+        textposition="middle center",
+        textfont=dict(
+            size=11,
+            color="black",
+            family="Arial"
+        ),
+        hovertemplate="<b>%{x}</b><br>" +
+                     "IT TAM: %{text}<br>" +
+                     "Companies: %{customdata:,.0f}<extra></extra>",
+        customdata=chart_data["Number of Companies"]
+    ))
+
+    # Add Security TAM bubbles
+    fig.add_trace(go.Scatter(
+        x=chart_data["Revenue Tier"],
+        y=y_positions + 0.7,  # Offset for staggered appearance
+        mode="markers+text",
+        name="Security TAM",
+        marker=dict(
+            size=chart_data["Security Bubble Size"],
+            color="rgba(251, 180, 76, 0.8)",
+            line=dict(width=2, color="rgba(251, 180, 76, 1)"),
+            symbol="circle",
+        ),
+        text=chart_data["Security TAM ($M)"],
+        textposition="middle center",
+        textfont=dict(
+            size=10,
+            color="black",
+            family="Arial"
+        ),
+        hovertemplate="<b>%{x}</b><br>" +
+                     "Security TAM: %{text}<br>" +
+                     "Companies: %{customdata:,.0f}<extra></extra>",
+        customdata=chart_data["Number of Companies"]
+    ))
+
+    # Add company count as text
+    fig.add_trace(go.Scatter(
+        x=chart_data["Revenue Tier"],
+        y=y_positions + 0.35,  # Center between bubbles
+        mode="text",
+        customdata=chart_data["Number of Companies"],
+        texttemplate="%{customdata:,.0f} companies",
+        textposition="middle right",
+        textfont=dict(
+            size=10,
+            color="rgba(0,0,0,0.6)",
+            family="Arial"
+        ),
+        showlegend=False,
+        hoverinfo="skip"
+    ))
     
-    # Create DataFrame
-    df = pd.DataFrame(expanded_data)
-    return df
+    # Update layout for better readability
+    fig.update_layout(
+        title=dict(
+            text="TAM Analysis by Revenue Tier",
+            font=dict(size=16, family="Arial")
+        ),
+        xaxis=dict(
+            title="Revenue Range",
+            showgrid=True,
+            gridcolor="rgba(0,0,0,0.1)"
+        ),
+        yaxis=dict(
+            showticklabels=False,
+            showgrid=False,
+            zeroline=False
+        ),
+        height=700,
+        font=dict(family="Arial, sans-serif", size=12),
+        plot_bgcolor="white",
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1,
+            font=dict(size=12)
+        ),
+        margin=dict(t=80, b=60, l=40, r=40)
+    )
+
+    # Add annotation explaining the bubbles
+    fig.add_annotation(
+        text="Bubble size represents relative TAM value",
+        xref="paper",
+        yref="paper",
+        x=0.01,
+        y=0.99,
+        showarrow=False,
+        bgcolor="rgba(255, 255, 255, 0.9)",
+        bordercolor="rgba(0, 0, 0, 0.5)",
+        borderwidth=1,
+        borderpad=4,
+        font=dict(size=12, family="Arial")
+    )
+    
+    return fig
+
 
 def show():
     st.header("NAICS Industry Analysis")
@@ -57,9 +225,6 @@ def show():
     Data source: [NAICS Business Counts by Company Size](https://www.naics.com/business-lists/counts-by-company-size/)
     """)
 
-    # Load NAICS data
-    naics_df = load_naics_data()
-
     # Create columns for the two analyses
     col1, col2 = st.columns(2)
 
@@ -90,43 +255,8 @@ def show():
             st.metric("Coded Businesses", f"{coded_businesses:,.0f}")
         
         # Create bar chart (excluding uncoded records)
-        fig_naics = go.Figure()
-        
-        # Filter out uncoded records for the chart
         chart_df = naics_tiers_df[naics_tiers_df["Revenue Range"] != "Uncoded records"]
-        
-        # Add bars
-        fig_naics.add_trace(go.Bar(
-            x=chart_df["Revenue Range"],
-            y=chart_df["Number of Businesses"],
-            text=chart_df["Number of Businesses"].apply(lambda x: f"{x:,.0f}"),
-            textposition="outside",
-            marker_color="rgba(60, 120, 216, 0.7)",
-            name="Number of Businesses"
-        ))
-        
-        # Update layout
-        fig_naics.update_layout(
-            title="U.S. Business Distribution by Revenue Tier",
-            xaxis_title="Annual Revenue Range",
-            yaxis_title="Number of Businesses",
-            height=500,
-            font=dict(family="Arial, sans-serif", size=12),
-            plot_bgcolor='rgba(240, 240, 240, 0.8)',
-            showlegend=False,
-            margin=dict(t=50, b=100)  # Increase bottom margin for rotated labels
-        )
-        
-        # Rotate x-axis labels for better readability
-        fig_naics.update_xaxes(
-            tickangle=45,
-            tickfont=dict(size=10)
-        )
-        
-        # Use log scale for y-axis due to large range
-        fig_naics.update_yaxes(type="log")
-        
-        st.plotly_chart(fig_naics, use_container_width=True)
+        plotly_chart(submit_figure(create_revenue_tier_chart, chart_df), use_container_width=True)
         
         # Display the data table
         st.dataframe(
@@ -140,19 +270,37 @@ def show():
     with col2:
         st.subheader("Industry-Specific Analysis")
         
-        # Create options combining code and name
-        naics_options = [f"{sector['code']} - {sector['name']}" for sector in NAICS_SECTORS]
+        # Search all NAICS sectors and detailed codes; matches become options of the selection below
+        search_index = get_naics_search_index()
+        search_query = st.text_input(
+            "Search NAICS Codes or Industries",
+            key="naics_search_query",
+            placeholder="e.g. 5415, software, hospitals",
+            help="Search by code prefix or words in the industry name. Without a search, the 2-digit sectors are listed."
+        ).strip()
+        result_ids = search_index.search(search_query, NAICS_SEARCH_LIMIT) if search_query else search_index.sectors()
+        if search_query and not result_ids:
+            st.caption(f"No NAICS codes match '{search_query}'")
         
         # Store current selection in session state to handle the logic
         if 'naics_selection' not in st.session_state:
             st.session_state.naics_selection = ["All"]
+        st.session_state.naics_selection = [
+            option for option in st.session_state.naics_selection
+            if option == "All" or option in search_index.entry_ids
+        ]
+        
+        # Earlier picks stay selectable while the search results change
+        naics_options = list(dict.fromkeys(
+            ["All"] + st.session_state.naics_selection + [search_index.labels[i] for i in result_ids]
+        ))
         
         # Use multiselect instead of selectbox
         selected_naics_options = st.multiselect(
             "Select NAICS Industry Code(s)",
-            options=["All"] + sorted(naics_options),
+            options=naics_options,
             default=st.session_state.naics_selection,
-            help="Select 'All' to include all industries, or select specific industries."
+            help="Select 'All' to include all industries, or search for and select specific sectors or detailed codes."
         )
         
         # Update the session state
@@ -169,89 +317,28 @@ def show():
             selected_naics_options = ["All"]
             st.session_state.naics_selection = ["All"]
         
-        # Convert the selections to NAICS codes for filtering
+        tier_df = None
         if "All" in selected_naics_options:
-            selected_naics = "All"
-        else:
-            # Extract just the codes from the selections (split on first " - ")
-            selected_naics = [option.split(" - ")[0] for option in selected_naics_options]
-            
-        # Filter NAICS data based on selection
-        if selected_naics != "All":
-            if isinstance(selected_naics, list):
-                # Filter for multiple selected NAICS codes
-                naics_df_filtered = naics_df[naics_df["NAICS Code"].isin(selected_naics)]
-            else:
-                # Single NAICS code
-                naics_df_filtered = naics_df[naics_df["NAICS Code"] == selected_naics]
-        else:
-            naics_df_filtered = naics_df.copy()
-        
-        # Display industry names for selected NAICS codes
-        if selected_naics == "All":
             st.subheader("Analysis for all industries")
         else:
-            industry_names = []
-            for code in selected_naics:
-                name_matches = naics_df[naics_df["NAICS Code"] == code]["NAICS Name"]
-                if len(name_matches) > 0:
-                    industry_names.append(f"{code} - {name_matches.iloc[0]}")
-                else:
-                    industry_names.append(code)
-            
-            st.subheader(f"Analysis for selected industries: {', '.join(industry_names)}")
-        
-        # Group by revenue tiers and calculate totals
-        revenue_tiers = REVENUE_TIERS
-
-        # Format revenue range for display
-        def format_revenue_range(low, high):
-            if low >= 1000:
-                low_str = f"${low/1000:.1f}B"
+            st.subheader(f"Analysis for selected industries: {', '.join(selected_naics_options)}")
+            tier_df = selected_code_tier_tam(search_index, selected_naics_options)
+            if tier_df is None:
+                st.warning("NAICS code data is unavailable; showing all industries instead.")
             else:
-                low_str = f"${low}M"
-                
-            if high == float('inf'):
-                high_str = "+"
-            elif high >= 1000:
-                high_str = f"${high/1000:.1f}B"
-            else:
-                high_str = f"${high}M"
-                
-            return f"{low_str} - {high_str}"
-            
-        # Create dataframe for the table
-        tier_analysis = []
+                st.caption("Company counts of the selected codes, each at its mapped industry's typical IT and security budget.")
         
-        for low, high in revenue_tiers:
-            # Get the actual company count for this tier
-            company_count = REVENUE_TIER_COUNTS[(low, high)]
-            
-            # Calculate average revenue for TAM estimation
-            if high == float('inf'):
-                # For 1B+ companies, use a conservative estimate of 1.5B average
-                avg_revenue = 1500  # $1.5B in millions
-            else:
-                avg_revenue = (low + high) / 2
-            
-            # Calculate IT budget based on weighted average
-            avg_it_budget_pct = INDUSTRY_IT_SPEND["Weighted Average"]["typical"] / 100
-            avg_security_pct = INDUSTRY_SECURITY_SPEND["Weighted Average"]["typical"] / 100
-            
-            # Calculate TAM for this tier
-            it_budget_tam = avg_revenue * avg_it_budget_pct * company_count
-            security_tam = it_budget_tam * avg_security_pct
-            
-            tier_analysis.append({
-                "Revenue Tier": format_revenue_range(low, high),
-                "Number of Companies": int(company_count),
-                "Average Revenue ($M)": avg_revenue,
-                "IT Budget TAM ($M)": it_budget_tam,
-                "Security TAM ($M)": security_tam
-            })
+        # Selected codes are budgeted at their own industries' percentages, everything else at the weighted average
+        per_code_budgets = tier_df is not None
+        if tier_df is None:
+            # Calculate TAM per revenue tier based on weighted average IT and security spend
+            tier_df = compute_tier_tam(
+                INDUSTRY_IT_SPEND["Weighted Average"]["typical"],
+                INDUSTRY_SECURITY_SPEND["Weighted Average"]["typical"]
+            )
         
-        # Create the DataFrame
-        tier_df = pd.DataFrame(tier_analysis)
+        # Export the numeric tier table
+        tier_export_df = tier_df.copy()
         
         # Calculate totals
         total_companies = tier_df["Number of Companies"].sum()
@@ -283,6 +370,7 @@ def show():
         # Show the table
         st.subheader("Business Count by Revenue Tier (NAICS Standard Ranges)")
         st.dataframe(tier_df, use_container_width=True)
+        show_export_controls("naics_tier_tam", lambda fmt: export_frame(tier_export_df, fmt), key="naics_tier_export")
         
         # Create chart for visualization
         st.subheader("Distribution of Companies and TAM by Revenue Tier")
@@ -303,146 +391,119 @@ def show():
         )
         
         # Create scatter plot with bubbles
-        fig = go.Figure()
-
-        # Calculate bubble sizes using sqrt scale for better visual representation
-        max_it_tam = chart_data["IT Budget TAM Numeric"].max()
-        max_sec_tam = chart_data["Security TAM Numeric"].max()
-        
-        chart_data["IT Bubble Size"] = chart_data["IT Budget TAM Numeric"].apply(
-            lambda x: 40 + (60 * np.sqrt(x) / np.sqrt(max_it_tam)) if x > 0 else 20
-        )
-        chart_data["Security Bubble Size"] = chart_data["Security TAM Numeric"].apply(
-            lambda x: 30 + (50 * np.sqrt(x) / np.sqrt(max_sec_tam)) if x > 0 else 15
-        )
-
-        # Create y-axis positions for staggered layout
-        y_positions = np.arange(len(chart_data)) * 2  # Multiply by 2 for more spacing
-
-        # Add IT TAM bubbles
-        fig.add_trace(go.Scatter(
-            x=chart_data["Revenue Tier"],
-            y=y_positions,
-            mode="markers+text",
-            name="IT Budget TAM",
-            marker=dict(
-                size=chart_data["IT Bubble Size"],
-                color="rgba(65, 171, 93, 0.8)",
-                line=dict(width=2, color="rgba(65, 171, 93, 1)"),
-                symbol="circle",
-            ),
-            text=chart_data["IT Budget TAM ($M)"],
-            textposition="middle center",
-            textfont=dict(
-                size=11,
-                color="black",
-                family="Arial"
-            ),
-            hovertemplate="<b>%{x}</b><br>" +
-                         "IT TAM: %{text}<br>" +
-                         "Companies: %{customdata:,.0f}<extra></extra>",
-            customdata=chart_data["Number of Companies"]
-        ))
-
-        # Add Security TAM bubbles
-        fig.add_trace(go.Scatter(
-            x=chart_data["Revenue Tier"],
-            y=y_positions + 0.7,  # Offset for staggered appearance
-            mode="markers+text",
-            name="Security TAM",
-            marker=dict(
-                size=chart_data["Security Bubble Size"],
-                color="rgba(251, 180, 76, 0.8)",
-                line=dict(width=2, color="rgba(251, 180, 76, 1)"),
-                symbol="circle",
-            ),
-            text=chart_data["Security TAM ($M)"],
-            textposition="middle center",
-            textfont=dict(
-                size=10,
-                color="black",
-                family="Arial"
-            ),
-            hovertemplate="<b>%{x}</b><br>" +
-                         "Security TAM: %{text}<br>" +
-                         "Companies: %{customdata:,.0f}<extra></extra>",
-            customdata=chart_data["Number of Companies"]
-        ))
-
-        # Add company count as text
-        fig.add_trace(go.Scatter(
-            x=chart_data["Revenue Tier"],
-            y=y_positions + 0.35,  # Center between bubbles
-            mode="text",
-            text=chart_data["Number of Companies"].apply(lambda x: f"{x:,.0f} companies"),
-            textposition="middle right",
-            textfont=dict(
-                size=10,
-                color="rgba(0,0,0,0.6)",
-                family="Arial"
-            ),
-            showlegend=False,
-            hoverinfo="skip"
-        ))
-        
-        # Update layout for better readability
-        fig.update_layout(
-            title=dict(
-                text="TAM Analysis by Revenue Tier",
-                font=dict(size=16, family="Arial")
-            ),
-            xaxis=dict(
-                title="Revenue Range",
-                showgrid=True,
-                gridcolor="rgba(0,0,0,0.1)"
-            ),
-            yaxis=dict(
-                showticklabels=False,
-                showgrid=False,
-                zeroline=False
-            ),
-            height=700,
-            font=dict(family="Arial, sans-serif", size=12),
-            plot_bgcolor="white",
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1,
-                font=dict(size=12)
-            ),
-            margin=dict(t=80, b=60, l=40, r=40)
-        )
-
-        # Add annotation explaining the bubbles
-        fig.add_annotation(
-            text="Bubble size represents relative TAM value",
-            xref="paper",
-            yref="paper",
-            x=0.01,
-            y=0.99,
-            showarrow=False,
-            bgcolor="rgba(255, 255, 255, 0.9)",
-            bordercolor="rgba(0, 0, 0, 0.5)",
-            borderwidth=1,
-            borderpad=4,
-            font=dict(size=12, family="Arial")
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        plotly_chart(submit_figure(create_tier_tam_bubble_chart, chart_data), use_container_width=True)
         
         # Add explanation
+        if per_code_budgets:
+            total_revenue = (tier_export_df["Number of Companies"] * tier_export_df["Average Revenue ($M)"]).sum()
+            it_share = total_it_tam / total_revenue * 100 if total_revenue > 0 else 0
+            security_share = total_security_tam / total_it_tam * 100 if total_it_tam > 0 else 0
+            basis = "each selected code's mapped industry"
+            assumptions = f"""
+        TAM calculations use the typical IT and security percentages of each selected NAICS code's mapped industry
+        (the weighted average for codes without a mapping). Across the selection this works out to:
+        - IT Budget: {it_share:.2f}% of revenue
+        - Security Budget: {security_share:.2f}% of IT budget
+        """
+        else:
+            basis = "weighted average"
+            assumptions = f"""
+        TAM calculations use industry averages of:
+        - IT Budget: {INDUSTRY_IT_SPEND["Weighted Average"]["typical"]}% of revenue
+        - Security Budget: {INDUSTRY_SECURITY_SPEND["Weighted Average"]["typical"]}% of IT budget
+        """
         st.markdown(f"""
         ### Understanding the Analysis
         
         - **Revenue Tier**: Standard NAICS revenue ranges for companies
         - **Number of Companies**: Count of companies in this revenue tier
         - **Average Revenue**: Midpoint of the revenue range (for TAM calculations)
-        - **IT Budget TAM**: Total Addressable Market for IT budget (based on weighted average IT spend %)
-        - **Security TAM**: Total Addressable Market for security budget (based on weighted average security spend %)
-        
-        TAM calculations use industry averages of:
-        - IT Budget: {INDUSTRY_IT_SPEND["Weighted Average"]["typical"]}% of revenue
-        - Security Budget: {INDUSTRY_SECURITY_SPEND["Weighted Average"]["typical"]}% of IT budget
-        """) 
\ No newline at end of file
+        - **IT Budget TAM**: Total Addressable Market for IT budget (based on {basis} IT spend %)
+        - **Security TAM**: Total Addressable Market for security budget (based on {basis} security spend %)
+        {assumptions}""")
+    
+    show_vintage_comparison()
+
+
+def show_vintage_picker():
+    """Sidebar choice of the NAICS data vintage used by every NAICS and TAM view"""
+    store = get_vintage_store()
+    vintages = store.vintages()[::-1]
+    with st.sidebar.expander("NAICS Data Vintage"):
+        if vintages:
+            st.selectbox("Vintage", vintages, key=NAICS_VINTAGE_KEY,
+                         help="Company counts release used for NAICS and TAM analysis (latest by default).")
+        if st.button("Check for New Releases", key="naics_vintage_rescan"):
+            added = store.ingest()
+            st.toast(f"Ingested {', '.join(vintage_label(v) for v in added)}" if added else "No new NAICS releases")
+
+
+@track_cache(st.cache_data, max_entries=16, show_spinner=False)
+def get_vintage_comparison(older_key, newer_key):
+    """Tier, sector and code level changes in company counts between two vintages"""
+    delta = get_vintage_store().delta(older_key[0], newer_key[0])
+    tiers = list(NAICS_REVENUE_TIERS)
+    tier_df = pd.DataFrame({
+        "Revenue Tier": tiers,
+        vintage_label(older_key[0]): delta.older.sum(axis=0),
+        vintage_label(newer_key[0]): delta.newer.sum(axis=0),
+        "Change": delta.change.sum(axis=0)
+    })
+    
+    sectors = pd.Series(delta.codes).str[:2].map(NAICS_TO_SECTOR).fillna("Other").to_numpy()
+    sector_df = pd.DataFrame({
+        "Sector": sectors,
+        "Older": delta.older.sum(axis=1),
+        "Newer": delta.newer.sum(axis=1)
+    }).groupby("Sector").sum()
+    sector_df["Change"] = sector_df["Newer"] - sector_df["Older"]
+    sector_df = sector_df.rename(columns={"Older": vintage_label(older_key[0]), "Newer": vintage_label(newer_key[0])})
+    
+    code_df = pd.DataFrame({
+        "NAICS Code": delta.codes,
+        "Description": delta.descriptions,
+        "Status": delta.status(),
+        "Change": delta.change.sum(axis=1)
+    })
+    code_df = code_df[(code_df["Change"] != 0) | (code_df["Status"] != "Kept")]
+    return tier_df, sector_df.reset_index(), code_df.reindex(code_df["Change"].abs().sort_values(ascending=False).index)
+
+
+def show_vintage_comparison():
+    """Vintage-over-vintage change in company counts"""
+    st.subheader("Data Vintages")
+    store = get_vintage_store()
+    vintages = store.vintages()
+    if len(vintages) < 2:
+        st.info(f"One NAICS vintage ingested ({', '.join(vintage_label(v) for v in vintages) or 'none'}). "
+                f"Add new releases as workbooks matching `{NAICS_SOURCE_GLOB}` to compare vintages.")
+        return
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        older = st.selectbox("Compare", vintages, index=len(vintages) - 2,
+                             key="vintage_compare_older")
+    with col2:
+        newer = st.selectbox("With", vintages, index=len(vintages) - 1,
+                             key="vintage_compare_newer")
+    if older == newer:
+        st.warning("Pick two different vintages to compare.")
+        return
+    
+    tier_df, sector_df, code_df = get_vintage_comparison(vintage_key(older), vintage_key(newer))
+    total_change = tier_df["Change"].sum()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Change in Companies", f"{total_change:+,.0f}")
+    col2.metric("Codes Added", f"{(code_df['Status'] == 'Added').sum():,}")
+    col3.metric("Codes Removed", f"{(code_df['Status'] == 'Removed').sum():,}")
+    
+    count_format = {column: "{:,.0f}" for column in tier_df.columns[1:]}
+    tab1, tab2, tab3 = st.tabs(["By Revenue Tier", "By Sector", "By NAICS Code"])
+    with tab1:
+        st.dataframe(tier_df.style.format(count_format), hide_index=True, use_container_width=True)
+    with tab2:
+        st.dataframe(sector_df.style.format(count_format), hide_index=True, use_container_width=True)
+    with tab3:
+        st.dataframe(code_df.style.format({"Change": "{:+,.0f}"}), hide_index=True, use_container_width=True)
+        show_export_controls("naics_vintage_changes", lambda fmt: export_frame(code_df, fmt),
+                             key="naics_vintage_export")
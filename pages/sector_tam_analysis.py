@@ -1,6 +1,19 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import data
+from calculations import compute_sector_tam
+from exports import export_frame
+from revenue_distribution import DISTRIBUTION_SHAPES
+from market_solver import DEFAULT_MAX_BUDGET_SHARE, MAX_SWEEP_PRICES, get_market_solver, industry_thresholds
+from session_memory import derived_cache
+from sensitivity import get_tam_sensitivity
+from funnel import (DEFAULT_REACHABLE_SHARE, DEFAULT_REVENUE_PER_EMPLOYEE, DEFAULT_WIN_RATE, EMPLOYEE_BAND_EDGES,
+                    TIER_LABELS, MarketFunnel)
+from projections import (DEFAULT_PROJECTION_YEARS, GROWTH_EDITOR_KEY, PROJECTION_YEARS, assumption_key,
+                         current_growth_assumptions, default_growth_assumptions, get_tam_projection)
+from utils import show_export_controls
+from figure_pool import plotly_chart, submit_figure
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
@@ -18,76 +31,23 @@ def show():
     # Add title for the section
     st.write("### Total Addressable Market (TAM) by Sector")
     
-    # Calculate TAM for each sector
-    sector_tam = []
-    total_it_budget = 0
-    total_security_budget = 0
-    total_revenue = 0
-    total_companies = 0
-    
-    for _, row in naics_data.iterrows():
-        sector = row['sector_name']
-        companies = row['Companies']
-        coded_companies = row['CodedCompanies']
-        uncoded_companies = row['UncodedCompanies']
-        revenue = row['Revenue']  # in millions
-        
-        # Apply industry-specific IT and security percentages
-        it_percent = data.get_industry_it_percent(sector)
-        security_percent = data.get_industry_security_percent(sector)
-        
-        # Calculate IT and security budgets
-        it_budget = revenue * it_percent / 100
-        security_budget = it_budget * security_percent / 100
-        
-        # Add to totals
-        total_revenue += revenue
-        total_companies += companies
-        total_it_budget += it_budget
-        total_security_budget += security_budget
-        
-        # Add to sector TAM list
-        sector_tam.append({
-            'Sector': sector,
-            'Coded Companies': f"{coded_companies:,.0f}",
-            'Uncoded Companies': f"{uncoded_companies:,.0f}",
-            'Total Companies': f"{companies:,.0f}",
-            'Revenue ($M)': f"${revenue:,.0f}",
-            'IT Budget ($M)': f"${it_budget:,.0f}",
-            'Security Budget ($M)': f"${security_budget:,.0f}"
-        })
+    # Calculate TAM for each sector (security budgets scaled to the $180B target)
+    viz_data = compute_sector_tam(naics_data)
     
-    # Calculate scaling factor to match target TAM of $180B
-    target_security_tam = 180000  # $180B in millions
-    scaling_factor = 1.0
-    
-    if total_security_budget > 0:
-        scaling_factor = target_security_tam / total_security_budget
-    
-    # Apply scaling factor if needed
-    if abs(scaling_factor - 1.0) > 0.01:  # If scaling factor is significantly different from 1.0
-        for item in sector_tam:
-            # Extract numeric values from formatted strings
-            it_budget = float(item['IT Budget ($M)'].replace('$', '').replace(',', ''))
-            security_budget = float(item['Security Budget ($M)'].replace('$', '').replace(',', ''))
-            
-            # Apply scaling factor to security budget
-            adjusted_security_budget = security_budget * scaling_factor
-            
-            # Update the item with scaled security budget
-            item['Security Budget ($M)'] = f"${adjusted_security_budget:,.0f}"
+    # Format values for display
+    sector_tam = pd.DataFrame({
+        'Sector': viz_data['Sector'],
+        'Coded Companies': viz_data['Coded Companies'].map(lambda x: f"{x:,.0f}"),
+        'Uncoded Companies': viz_data['Uncoded Companies'].map(lambda x: f"{x:,.0f}"),
+        'Total Companies': viz_data['Total Companies'].map(lambda x: f"{x:,.0f}"),
+        'Revenue ($M)': viz_data['Revenue ($M)'].map(lambda x: f"${x:,.0f}"),
+        'IT Budget ($M)': viz_data['IT Budget ($M)'].map(lambda x: f"${x:,.0f}"),
+        'Security Budget ($M)': viz_data['Security Budget ($M)'].map(lambda x: f"${x:,.0f}")
+    })
     
     # Display the TAM table
     st.dataframe(sector_tam)
-    
-    # Create visualization data
-    viz_data = pd.DataFrame(sector_tam)
-    
-    # Convert string columns to numeric for plotting
-    viz_data['Coded Companies'] = viz_data['Coded Companies'].str.replace(',', '').astype(float)
-    viz_data['Uncoded Companies'] = viz_data['Uncoded Companies'].str.replace(',', '').astype(float)
-    viz_data['Revenue ($M)'] = viz_data['Revenue ($M)'].str.replace('$', '').str.replace(',', '').astype(float)
-    viz_data['Security Budget ($M)'] = viz_data['Security Budget ($M)'].str.replace('$', '').str.replace(',', '').astype(float)
+    show_export_controls("sector_tam", lambda fmt: export_frame(viz_data, fmt), key="sector_tam_export")
     
     # Sort by Security Budget for better visualization
     viz_data = viz_data.sort_values('Security Budget ($M)', ascending=False)
@@ -96,6 +56,287 @@ def show():
     viz_data = viz_data[viz_data['Sector'] != 'Other']
     
     # Create a mixed chart (bar for companies, line for security budget)
+    plotly_chart(submit_figure(create_sector_tam_chart, viz_data), use_container_width=True)
+    
+    show_tam_sensitivity()
+    show_price_point_solver()
+    show_market_funnel()
+    show_projections()
+    
+    # Add note about uncoded records
+    st.write("### Data Processing Notes")
+    st.write("""
+    **Note on Business Counts:**
+    
+    The business counts in this analysis include both coded and uncoded records from the NAICS data source:
+    
+    - **Coded Companies**: Businesses with specific revenue information categorized in revenue tiers
+    - **Uncoded Companies**: Businesses that don't have specific revenue information but are still counted in the industry totals
+    
+    For revenue calculations, we've made the conservative assumption that uncoded records represent small businesses 
+    with annual revenue under $500,000 (using a multiplier of $250,000 per business).
+    
+    This approach ensures we're accounting for all businesses in each sector, including government entities, 
+    non-profits, and other organizations that may not report detailed revenue information but are still potential 
+    customers for security products and services.
+    """)
+
+def show_tam_sensitivity():
+    """Tornado chart of security TAM swing across each assumption's plausible range"""
+    st.write("### TAM Assumption Sensitivity")
+    st.write("""
+    How far the security TAM moves when one assumption goes from the low to the high end of its range, others
+    held at their base values: average revenue per tier (the tier's bounds; $1B-$3B for the open tier), each
+    industry's IT and security percentages (its preset min and max) and the $180B calibration target (±25%).
+    """)
+    sensitivity = get_tam_sensitivity(data.sector_preset_key(), data.vintage_key())
+    if sensitivity is None:
+        st.error("Failed to load NAICS data. Please check the console for errors.")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        measure = st.radio("TAM", ["Raw (uncalibrated)", "Calibrated to $180B"], key="sensitivity_measure")
+    with col2:
+        sector = st.selectbox("Sector", ["All Sectors"] + sensitivity.sectors, key="sensitivity_sector")
+    with col3:
+        top = st.slider("Assumptions Shown", 5, 40, 15, key="sensitivity_top")
+    
+    calibrated = measure != "Raw (uncalibrated)"
+    baseline, tornado = sensitivity.tornado(None if sector == "All Sectors" else sector, calibrated)
+    if calibrated and sector == "All Sectors":
+        st.caption("Calibration fixes the total at the target, so only the target itself moves it; pick a sector "
+                   "to see how assumptions shift its share.")
+    shown = tornado.head(top).iloc[::-1]
+    
+    plotly_chart(submit_figure(create_tornado_chart, shown, baseline, sector), use_container_width=True)
+    
+    with st.expander("Sensitivity Table"):
+        st.dataframe(
+            tornado.style.format({
+                "Base": "{:,.4g}", "Low": "{:,.4g}", "High": "{:,.4g}",
+                "TAM at Low ($M)": "${:,.0f}", "TAM at High ($M)": "${:,.0f}", "Swing ($M)": "${:,.0f}"
+            }),
+            hide_index=True,
+            use_container_width=True
+        )
+        show_export_controls("tam_sensitivity", lambda fmt: export_frame(tornado, fmt), key="tam_sensitivity_export")
+
+def get_market_funnel(shape):
+    """This session's funnel for a distribution shape, rebuilt when the presets or the NAICS vintage change"""
+    session_derived = derived_cache()
+    key = ("market_funnel", shape, data.sector_preset_key(), data.vintage_key())
+    if key not in session_derived:
+        for stale in [k for k in session_derived if k[0] == "market_funnel"]:
+            del session_derived[stale]
+        session_derived[key] = MarketFunnel(get_market_solver(shape))
+    return session_derived[key]
+
+def show_market_funnel():
+    """TAM -> SAM -> SOM funnel from sector, tier, size and price filters plus penetration assumptions"""
+    st.write("### TAM → SAM → SOM Funnel")
+    st.write("""
+    Narrow the total market to the serviceable market (sectors, revenue tiers, company size and price fit) and then
+    to the obtainable market (reachable share and win rate). Company size uses a revenue-per-employee assumption,
+    and revenue within each tier follows the fitted Pareto distribution, so the TAM here is not scaled to $180B.
+    """)
+    funnel = get_market_funnel("pareto")
+    
+    with st.expander("Serviceable Market Filters", expanded=True):
+        sectors = st.multiselect("Sectors", funnel.sectors, default=funnel.sectors, key="funnel_sectors")
+        tiers = st.multiselect("Revenue Tiers", TIER_LABELS, default=TIER_LABELS, key="funnel_tiers")
+        col1, col2 = st.columns(2)
+        with col1:
+            edges = list(EMPLOYEE_BAND_EDGES)
+            min_employees, max_employees = st.select_slider("Employees", edges, value=(edges[0], edges[-1]),
+                                                            key="funnel_employees")
+            revenue_per_employee = st.number_input("Revenue per Employee ($K)", 10, 5_000,
+                                                   DEFAULT_REVENUE_PER_EMPLOYEE, 10, key="funnel_revenue_per_employee")
+        with col2:
+            price = st.number_input("Product Price (ACV, $)", 1_000, 10_000_000, 100_000, 1_000, key="funnel_price")
+            max_share = st.slider("Max Share of Security Budget (%)", 1.0, 100.0, DEFAULT_MAX_BUDGET_SHARE, 1.0,
+                                  key="funnel_max_share")
+    col1, col2 = st.columns(2)
+    with col1:
+        reachable = st.slider("Reachable Share (%)", 0.0, 100.0, DEFAULT_REACHABLE_SHARE, 1.0, key="funnel_reachable")
+    with col2:
+        win_rate = st.slider("Win Rate (%)", 0.0, 100.0, DEFAULT_WIN_RATE, 1.0, key="funnel_win_rate")
+    
+    funnel.update([
+        (tuple(sectors),),
+        (tuple(tiers),),
+        (EMPLOYEE_BAND_EDGES[min_employees], EMPLOYEE_BAND_EDGES[max_employees], revenue_per_employee),
+        (price, max_share),
+        (reachable,),
+        (win_rate,)
+    ])
+    summary = funnel.summary()
+    sam, som = summary[summary["Market"] == "SAM"].iloc[-1], summary.iloc[-1]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("TAM (Security Budget)", f"${summary.iloc[0]['Security Budget ($M)'] / 1000:,.1f}B",
+                f"{summary.iloc[0]['Companies']:,.0f} companies", delta_color="off")
+    col2.metric("SAM (Security Budget)", f"${sam['Security Budget ($M)'] / 1000:,.1f}B",
+                f"{sam['Companies']:,.0f} companies", delta_color="off")
+    col3.metric("SOM (Annual Contract Value)", f"${som['Companies'] * price / 1e6:,.1f}M",
+                f"{som['Companies']:,.0f} customers", delta_color="off")
+    
+    measure = st.radio("Funnel Measure", ["Companies", "Security Budget ($M)"], horizontal=True,
+                       key="funnel_measure")
+    plotly_chart(submit_figure(create_funnel_chart, summary, measure), use_container_width=True)
+    st.caption(f"Recomputed {funnel.recomputed} of {len(summary) - 1} stages on this run.")
+    
+    by_sector = funnel.by_sector().sort_values("SOM Companies", ascending=False)
+    st.dataframe(
+        by_sector.style.format({column: "${:,.0f}" if "$" in column else "{:,.0f}" for column in by_sector.columns[1:]}),
+        hide_index=True,
+        use_container_width=True
+    )
+    show_export_controls("market_funnel", lambda fmt: export_frame(by_sector, fmt), key="market_funnel_export")
+
+def show_projections():
+    """Multi-year revenue, IT and security budget projection per sector and revenue tier"""
+    st.write("### Multi-Year TAM Projection")
+    st.write("""
+    Project the market forward with annual growth rates per industry for revenue, the IT share of revenue and the
+    security share of IT. Company counts are held constant, revenue sits at each tier's midpoint (uncoded records
+    in the smallest tier) and shares are capped at 100%, so totals are not scaled to the $180B target above.
+    """)
+    
+    years = st.slider("Projection Horizon (years)", *PROJECTION_YEARS, DEFAULT_PROJECTION_YEARS,
+                      key="projection_years")
+    with st.expander("Growth Assumptions by Industry"):
+        st.data_editor(default_growth_assumptions(), key=GROWTH_EDITOR_KEY, disabled=["Industry"],
+                       hide_index=True, use_container_width=True)
+    
+    projection = get_tam_projection(assumption_key(current_growth_assumptions()), years, data.sector_preset_key(),
+                                    data.vintage_key())
+    if projection is None:
+        st.error("Failed to load NAICS data. Please check the console for errors.")
+        return
+    
+    totals = projection.totals()
+    first, last = totals.index[0], totals.index[-1]
+    growth = (totals.loc[last] / totals.loc[first]) ** (1 / years) - 1
+    col1, col2, col3 = st.columns(3)
+    col1.metric(f"Security TAM {last}", f"${totals.loc[last, 'Security Budget ($M)'] / 1000:,.1f}B",
+                f"{growth['Security Budget ($M)']:.1%}/yr")
+    col2.metric(f"IT Budget {last}", f"${totals.loc[last, 'IT Budget ($M)'] / 1000:,.1f}B",
+                f"{growth['IT Budget ($M)']:.1%}/yr")
+    col3.metric(f"Revenue {last}", f"${totals.loc[last, 'Revenue ($M)'] / 1_000_000:,.2f}T",
+                f"{growth['Revenue ($M)']:.1%}/yr")
+    
+    by_sector = projection.by_sector().sort_values(last, ascending=False)
+    plotly_chart(submit_figure(create_sector_projection_chart, by_sector, projection.years),
+                 use_container_width=True)
+    
+    year_format = {year: "${:,.0f}" for year in projection.years}
+    tab1, tab2, tab3 = st.tabs(["By Sector", "By Revenue Tier", "Totals"])
+    with tab1:
+        st.dataframe(by_sector.style.format(year_format), use_container_width=True)
+    with tab2:
+        st.dataframe(projection.by_tier().style.format(year_format), use_container_width=True)
+    with tab3:
+        st.dataframe(totals.style.format("${:,.0f}"), use_container_width=True)
+    
+    export_df = by_sector.rename_axis("Sector").reset_index()
+    export_df.columns = export_df.columns.astype(str)
+    show_export_controls("tam_projection", lambda fmt: export_frame(export_df, fmt), key="tam_projection_export")
+
+def show_price_point_solver():
+    """How many companies can afford a given price, per sector, plus a sweep over many price points"""
+    st.write("### Price-Point Addressable Market")
+    st.write("""
+    Find the companies that can afford a product at a given annual contract value (ACV), assuming it may take at
+    most the chosen share of a company's security budget. Each sector uses its industry's typical IT and security
+    percentages. Revenue within each tier follows the chosen distribution instead of sitting at the tier midpoint.
+    """)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        price = st.slider("Product Price (ACV, $)", 10_000, 2_000_000, 250_000, 10_000, format="$%d")
+    with col2:
+        max_share = st.slider("Max Share of Security Budget (%)", 1.0, 100.0, DEFAULT_MAX_BUDGET_SHARE, 1.0)
+    with col3:
+        shape = st.selectbox("Revenue Within Tiers", list(DISTRIBUTION_SHAPES))
+    solver = get_market_solver(DISTRIBUTION_SHAPES[shape])
+    
+    result = solver.solve(price, max_share)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Addressable Companies", f"{result['companies'].sum():,.0f}")
+    col2.metric("Their Combined Revenue", f"${result['revenue'].sum() / 1000:,.1f}B")
+    col3.metric("Market at This Price", f"${result['acv_market'].sum():,.0f}M")
+    
+    sector_df = pd.DataFrame({
+        "Sector": solver.segments,
+        "Industry": solver.industries,
+        "Minimum Revenue ($M)": result["threshold_revenue"],
+        "Addressable Companies": result["companies"],
+        "Addressable Revenue ($M)": result["revenue"],
+        "Market at Price ($M)": result["acv_market"]
+    }).sort_values("Addressable Companies", ascending=False)
+    st.dataframe(
+        sector_df.style.format({
+            "Minimum Revenue ($M)": "${:,.1f}",
+            "Addressable Companies": "{:,.0f}",
+            "Addressable Revenue ($M)": "${:,.0f}",
+            "Market at Price ($M)": "${:,.0f}"
+        }),
+        hide_index=True,
+        use_container_width=True
+    )
+    
+    with st.expander("Revenue Distribution by Sector"):
+        quantiles = [0.5, 0.9, 0.99, 0.999]
+        revenue_quantiles = solver.distribution.quantile(np.array(quantiles)[:, None])
+        quantile_df = pd.DataFrame({"Sector": solver.segments})
+        for q, values in zip(quantiles, revenue_quantiles):
+            quantile_df[f"P{q * 100:g} Revenue ($M)"] = values
+        st.dataframe(
+            quantile_df.style.format({column: "${:,.2f}" for column in quantile_df.columns[1:]}),
+            hide_index=True,
+            use_container_width=True
+        )
+    
+    with st.expander("Minimum Revenue by Industry"):
+        st.dataframe(
+            industry_thresholds(price, max_share).style.format({
+                "IT Budget (%)": "{:g}%",
+                "Security Budget (% of IT)": "{:g}%",
+                "Minimum Revenue ($M)": "${:,.1f}"
+            }),
+            hide_index=True,
+            use_container_width=True
+        )
+    
+    # Batch mode: sweep a range of price points
+    with st.expander("Price Sweep"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            low = st.number_input("From ($)", 1_000, 10_000_000, 10_000, 1_000)
+        with col2:
+            high = st.number_input("To ($)", 1_000, 10_000_000, 2_000_000, 1_000)
+        with col3:
+            points = st.number_input("Price Points", 2, MAX_SWEEP_PRICES, 1_000, 100)
+        
+        if high <= low:
+            st.error("The upper price must be above the lower price.")
+            return
+        
+        prices = np.geomspace(low, high, int(points))
+        sweep = solver.sweep(prices, max_share)
+        sweep_df = pd.DataFrame({
+            "Price ($)": prices,
+            "Addressable Companies": sweep["companies"].sum(axis=1),
+            "Addressable Revenue ($M)": sweep["revenue"].sum(axis=1),
+            "Market at Price ($M)": sweep["acv_market"].sum(axis=1)
+        })
+        
+        plotly_chart(submit_figure(create_price_sweep_chart, prices, sweep_df, price), use_container_width=True)
+        show_export_controls("price_sweep", lambda fmt: export_frame(sweep_df, fmt), key="price_sweep_export")
+
+
+def create_sector_tam_chart(viz_data):
+    """Stacked coded/uncoded company bars per sector with the security budget on a second axis"""
     fig = make_subplots(specs=[[{"secondary_y": True}]])
     
     # Add bar chart for coded companies
@@ -157,23 +398,81 @@ def show():
     fig.update_yaxes(title_text="Number of Companies", secondary_y=False)
     fig.update_yaxes(title_text="Security Budget ($M)", secondary_y=True)
     
-    # Display the chart
-    st.plotly_chart(fig, use_container_width=True)
-    
-    # Add note about uncoded records
-    st.write("### Data Processing Notes")
-    st.write("""
-    **Note on Business Counts:**
-    
-    The business counts in this analysis include both coded and uncoded records from the NAICS data source:
-    
-    - **Coded Companies**: Businesses with specific revenue information categorized in revenue tiers
-    - **Uncoded Companies**: Businesses that don't have specific revenue information but are still counted in the industry totals
-    
-    For revenue calculations, we've made the conservative assumption that uncoded records represent small businesses 
-    with annual revenue under $500,000 (using a multiplier of $250,000 per business).
-    
-    This approach ensures we're accounting for all businesses in each sector, including government entities, 
-    non-profits, and other organizations that may not report detailed revenue information but are still potential 
-    customers for security products and services.
-    """)
\ No newline at end of file
+    return fig
+
+
+def create_tornado_chart(shown, baseline, sector):
+    """Tornado of security TAM at each assumption's low and high end around the baseline"""
+    fig = go.Figure()
+    for end, color in (("Low", "#008581"), ("High", "#E4509A")):
+        fig.add_trace(go.Bar(
+            y=shown["Assumption"],
+            x=shown[f"TAM at {end} ($M)"] - baseline,
+            base=baseline,
+            orientation="h",
+            name=f"Assumption at {end.lower()} end",
+            marker_color=color,
+            customdata=shown[[end, f"TAM at {end} ($M)"]],
+            hovertemplate="%{y}<br>Value: %{customdata[0]:,.4g}<br>TAM: $%{customdata[1]:,.0f}M<extra></extra>"
+        ))
+    fig.add_vline(x=baseline, line_color="gray", line_dash="dash")
+    fig.update_layout(
+        title_text=f"Security TAM Swing ({sector}, base ${baseline:,.0f}M)",
+        barmode="overlay",
+        xaxis=dict(title="Security TAM ($M)"),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        height=max(350, 28 * len(shown) + 150),
+        margin=dict(l=50, r=50, t=80, b=50)
+    )
+    return fig
+
+
+def create_funnel_chart(summary, measure):
+    """Funnel of a measure across the TAM -> SAM -> SOM stages"""
+    fig = go.Figure(go.Funnel(
+        y=summary["Stage"], x=summary[measure], textinfo="value+percent initial",
+        texttemplate="%{value:,.0f}<br>%{percentInitial:.2%}",
+        marker=dict(color=["#008581"] + ["#4C9C8B"] * 4 + ["#E4509A"] * 2)
+    ))
+    fig.update_layout(height=450, margin=dict(l=50, r=50, t=30, b=30))
+    return fig
+
+
+def create_sector_projection_chart(by_sector, years):
+    """Stacked area of projected security budget per sector"""
+    fig = go.Figure()
+    for sector, values in by_sector.iterrows():
+        fig.add_trace(go.Scatter(x=years, y=values, name=sector, stackgroup="sectors",
+                                 hovertemplate="%{x}: $%{y:,.0f}M<extra>" + sector + "</extra>"))
+    fig.update_layout(
+        title_text="Projected Security Budget by Sector",
+        xaxis=dict(title="Year", tickformat="d", dtick=1),
+        yaxis=dict(title="Security Budget ($M)"),
+        height=550
+    )
+    return fig
+
+
+def create_price_sweep_chart(prices, sweep_df, price):
+    """Addressable companies and market across swept price points, marking the chosen price"""
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig.add_trace(
+        go.Scatter(x=prices, y=sweep_df["Addressable Companies"], name="Addressable Companies",
+                   line=dict(color='rgba(55, 83, 109, 0.9)', width=2)),
+        secondary_y=False
+    )
+    fig.add_trace(
+        go.Scatter(x=prices, y=sweep_df["Market at Price ($M)"], name="Market at Price ($M)",
+                   line=dict(color='rgba(219, 64, 82, 0.7)', width=2)),
+        secondary_y=True
+    )
+    fig.add_vline(x=price, line_dash="dash", line_color="gray")
+    fig.update_layout(
+        title_text="Addressable Market by Price Point",
+        xaxis=dict(title="Product Price ($)", type="log"),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        height=450
+    )
+    fig.update_yaxes(title_text="Companies", type="log", secondary_y=False)
+    fig.update_yaxes(title_text="Market ($M)", secondary_y=True)
+    return fig
@@ -0,0 +1,216 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Mapping
+import numpy as np
+import pandas as pd
+from session_memory import CUSTOM_INDUSTRY_FIELDS
+
+# Versioned industry benchmark data file; edits are picked up without a restart
+PRESET_DATA_PATH = os.environ.get(
+    "PRESET_DATA_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "industry_presets.json")
+)
+
+# Minimum seconds between checks of the data file's modification time
+PRESET_RELOAD_INTERVAL = float(os.environ.get("PRESET_RELOAD_INTERVAL", "2"))
+
+# Industry used for unknown names; the data file must define it
+DEFAULT_INDUSTRY = "Weighted Average"
+
+# Registry columns, in the same order as custom industries
+PRESET_FIELDS = CUSTOM_INDUSTRY_FIELDS
+
+logger = logging.getLogger(__name__)
+
+
+class PresetError(ValueError):
+    """Raised when the preset data file is malformed"""
+
+
+class PresetSnapshot:
+    """Immutable columnar view of one version of the preset data file"""
+    __slots__ = ("version", "source", "names", "lookup", "index", "values", "native", "hashes", "content_hash",
+                 "mtime")
+
+    def __init__(self, version, source, names, values, mtime=0, native=None):
+        self.version = version
+        self.source = source
+        self.names = list(names)
+        self.lookup = {name: i for i, name in enumerate(self.names)}
+        self.index = pd.Index(self.names)
+        self.values = values
+        self.values.setflags(write=False)
+        # Row values as written in the data file (ints stay ints, so 4 displays as "4%" rather than "4.0%")
+        self.native = native if native is not None else [tuple(row) for row in values.tolist()]
+        self.mtime = mtime
+
+        # Per-industry hashes let caches depend on only the industries they use
+        self.hashes = {
+            name: hashlib.sha1(name.encode() + row.tobytes()).hexdigest()
+            for name, row in zip(self.names, values)
+        }
+        digest = hashlib.sha1(version.encode())
+        for name in self.names:
+            digest.update(self.hashes[name].encode())
+        self.content_hash = digest.hexdigest()
+
+
+def parse_presets(document, mtime=0):
+    """Validate a preset document and build its snapshot"""
+    version = document.get("version")
+    industries = document.get("industries")
+    if not isinstance(version, str) or not version:
+        raise PresetError("Preset data needs a version string")
+    if not isinstance(industries, dict) or not industries:
+        raise PresetError("Preset data needs a non-empty industries object")
+    if DEFAULT_INDUSTRY not in industries:
+        raise PresetError(f"Preset data must define {DEFAULT_INDUSTRY!r}")
+
+    values = np.empty((len(industries), len(PRESET_FIELDS)), dtype=np.float64)
+    native = []
+    for row, (name, preset) in enumerate(industries.items()):
+        try:
+            raw = [preset[group][level] for group in ("it", "security") for level in ("min", "typical", "max")]
+            values[row] = [float(value) for value in raw]
+        except (KeyError, TypeError, ValueError):
+            raise PresetError(f"{name}: it and security need numeric min, typical and max")
+        native.append(tuple(value if isinstance(value, (int, float)) and not isinstance(value, bool) else float(value)
+                            for value in raw))
+        if not (values[row, 0] <= values[row, 1] <= values[row, 2] and values[row, 3] <= values[row, 4] <= values[row, 5]):
+            raise PresetError(f"{name}: min, typical and max must be in ascending order")
+    return PresetSnapshot(version, document.get("source", ""), industries.keys(), values, mtime, native)
+
+
+def load_presets(path=PRESET_DATA_PATH):
+    """Read and validate the preset data file"""
+    mtime = os.stat(path).st_mtime_ns
+    with open(path, encoding="utf-8") as f:
+        try:
+            document = json.load(f)
+        except json.JSONDecodeError as e:
+            raise PresetError(f"Invalid JSON in {path}: {e}")
+    return parse_presets(document, mtime)
+
+
+def _row_ids(snapshot, industries, default):
+    ids = snapshot.index.get_indexer(pd.Index(np.asarray(industries, dtype=object).ravel()))
+    return np.where(ids < 0, snapshot.lookup[default], ids)
+
+
+class PresetRegistry:
+    """Industry presets with O(1) lookup, vectorized gathers and hot reload of the data file
+
+    Readers always see one consistent snapshot; a reload swaps in a new snapshot. Each industry has its
+    own content hash, so caches keyed with dependency_key() on the industries they read are only
+    invalidated when those presets change. A file that fails validation is logged and the previous
+    snapshot kept.
+    """
+
+    def __init__(self, path=PRESET_DATA_PATH, reload_interval=PRESET_RELOAD_INTERVAL):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._snapshot = load_presets(path)
+        self._checked = time.monotonic()
+        self._failed_mtime = None
+        self.reloads = 0
+        self.last_error = None
+
+    def snapshot(self):
+        """Current snapshot, reloading first if the data file changed"""
+        if time.monotonic() - self._checked >= self.reload_interval:
+            self._reload_if_changed()
+        return self._snapshot
+
+    def reload(self):
+        """Check the data file now instead of waiting for the reload interval"""
+        self._checked = float("-inf")
+        return self.snapshot()
+
+    def _reload_if_changed(self):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._checked < self.reload_interval:
+                return
+            self._checked = now
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError as e:
+                self.last_error = str(e)
+                return
+            if mtime in (self._snapshot.mtime, self._failed_mtime):
+                return
+
+            try:
+                snapshot = load_presets(self.path)
+            except (OSError, PresetError) as e:
+                self._failed_mtime = mtime
+                self.last_error = str(e)
+                logger.warning("Keeping preset data version %s: %s", self._snapshot.version, e)
+                return
+
+            previous = self._snapshot
+            changed = sum(
+                previous.hashes.get(name) != snapshot.hashes.get(name)
+                for name in set(previous.names) | set(snapshot.names)
+            )
+            self._snapshot = snapshot
+            self._failed_mtime = None
+            self.last_error = None
+            self.reloads += 1
+            logger.info("Loaded preset data version %s (%d industries changed)", snapshot.version, changed)
+
+    @property
+    def version(self):
+        return self.snapshot().version
+
+    @property
+    def content_hash(self):
+        return self.snapshot().content_hash
+
+    def ids(self, industries, default=DEFAULT_INDUSTRY):
+        """Row ids for an array of industry names; unknown names map to the default industry"""
+        return _row_ids(self.snapshot(), industries, default)
+
+    def gather(self, industries, fields=PRESET_FIELDS, default=DEFAULT_INDUSTRY):
+        """Preset values (field -> array) for an array of industry names in one indexed read"""
+        snapshot = self.snapshot()
+        ids = _row_ids(snapshot, industries, default)
+        return {field: snapshot.values[ids, PRESET_FIELDS.index(field)] for field in fields}
+
+    def dependency_key(self, industries=None):
+        """Cache key covering only the given industries (all of them when None)"""
+        snapshot = self.snapshot()
+        if industries is None:
+            return snapshot.content_hash
+        return tuple(snapshot.hashes.get(name) for name in industries)
+
+
+class PresetView(Mapping):
+    """Read-only live mapping of industry -> preset fields (renamed by keys), backed by the registry"""
+
+    def __init__(self, registry, keys):
+        self._registry = registry
+        self._keys = [(key, PRESET_FIELDS.index(field)) for key, field in keys.items()]
+
+    def __getitem__(self, industry):
+        snapshot = self._registry.snapshot()
+        values = snapshot.native[snapshot.lookup[industry]]
+        return {key: values[column] for key, column in self._keys}
+
+    def __contains__(self, industry):
+        return industry in self._registry.snapshot().lookup
+
+    def __iter__(self):
+        return iter(self._registry.snapshot().names)
+
+    def __len__(self):
+        return len(self._registry.snapshot().names)
+
+
+# Process-wide registry shared by the app, API server and benchmarks
+PRESETS = PresetRegistry()
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+import data
+from data import NAICS_REVENUE_TIERS, SECTOR_TO_INDUSTRY
+from calculations import tier_average_revenue
+from preset_registry import PRESETS, DEFAULT_INDUSTRY
+from metrics import track_cache
+
+# First projected year is the year of the NAICS counts
+BASE_YEAR = 2024
+
+# Projection horizons offered in the app (years after the base year)
+PROJECTION_YEARS = (1, 10)
+DEFAULT_PROJECTION_YEARS = 5
+
+# Assumption columns (annual growth in %) and their defaults for every industry
+GROWTH_COLUMNS = {
+    "revenue": "Revenue Growth (%/yr)",
+    "it_share": "IT Share Growth (%/yr)",
+    "security_share": "Security Share Growth (%/yr)"
+}
+DEFAULT_GROWTH_RATES = {"revenue": 4.0, "it_share": 2.0, "security_share": 5.0}
+
+# Session state key of the assumptions editor
+GROWTH_EDITOR_KEY = "growth_assumptions_editor"
+
+
+def default_growth_assumptions():
+    """One row of default growth rates per preset industry"""
+    industries = list(PRESETS.snapshot().names)
+    frame = pd.DataFrame({"Industry": industries})
+    for field, column in GROWTH_COLUMNS.items():
+        frame[column] = DEFAULT_GROWTH_RATES[field]
+    return frame
+
+
+def current_growth_assumptions():
+    """Default assumptions with this session's edits applied (usable on any tab before the editor renders)"""
+    frame = default_growth_assumptions()
+    edits = st.session_state.get(GROWTH_EDITOR_KEY) or {}
+    for row, changes in edits.get("edited_rows", {}).items():
+        for column, value in changes.items():
+            if column in frame.columns and value is not None:
+                frame.loc[int(row), column] = value
+    return frame
+
+
+def assumption_key(assumptions):
+    """Hashable (industry, revenue, IT share, security share growth) tuples for caching"""
+    columns = ["Industry"] + list(GROWTH_COLUMNS.values())
+    return tuple(tuple(row) for row in assumptions[columns].itertuples(index=False))
+
+
+def growth_factors(rates, years):
+    """Compound growth factor per row and year: (rows x years + 1), year 0 = 1"""
+    return (1 + np.asarray(rates, dtype=float)[:, None] / 100) ** np.arange(years + 1)
+
+
+class TamProjection:
+    """Revenue, IT and security budget ($M) over a sector x revenue tier x year tensor"""
+
+    def __init__(self, sectors, tiers, years, revenue, it_budget, security_budget):
+        self.sectors = list(sectors)
+        self.tiers = list(tiers)
+        self.years = list(years)
+        self.revenue = revenue
+        self.it_budget = it_budget
+        self.security_budget = security_budget
+
+    def by_sector(self, measure="security_budget"):
+        """Sector x year totals of a measure"""
+        return pd.DataFrame(getattr(self, measure).sum(axis=1), index=self.sectors, columns=self.years)
+
+    def by_tier(self, measure="security_budget"):
+        """Revenue tier x year totals of a measure"""
+        return pd.DataFrame(getattr(self, measure).sum(axis=0), index=self.tiers, columns=self.years)
+
+    def totals(self):
+        """Year x measure totals"""
+        return pd.DataFrame({
+            "Revenue ($M)": self.revenue.sum(axis=(0, 1)),
+            "IT Budget ($M)": self.it_budget.sum(axis=(0, 1)),
+            "Security Budget ($M)": self.security_budget.sum(axis=(0, 1))
+        }, index=pd.Index(self.years, name="Year"))
+
+
+def project_tam(counts, avg_revenue, it_percentage, security_percentage, growth, years):
+    """Project budgets for (sectors x tiers) company counts in one broadcast
+
+    it_percentage and security_percentage are per sector; growth is (sectors x 3) annual % for
+    revenue, IT share and security share. Company counts are held constant; shares are capped at 100%.
+    """
+    growth = np.asarray(growth, dtype=float)
+    revenue = (np.asarray(counts, dtype=float) * avg_revenue)[:, :, None] * growth_factors(growth[:, 0], years)[:, None, :]
+    it_share = np.minimum(np.asarray(it_percentage, dtype=float)[:, None] * growth_factors(growth[:, 1], years), 100)
+    security_share = np.minimum(np.asarray(security_percentage, dtype=float)[:, None] * growth_factors(growth[:, 2], years), 100)
+    it_budget = revenue * it_share[:, None, :] / 100
+    security_budget = it_budget * security_share[:, None, :] / 100
+    return revenue, it_budget, security_budget
+
+
+def build_tam_projection(tier_cube, assumptions, years):
+    """Sector x tier x year projection from the workbook tier cube and per-industry growth assumptions"""
+    tier_columns = [column for column in NAICS_REVENUE_TIERS if column != "Uncoded records"]
+    counts = tier_cube[tier_columns].to_numpy(dtype=float)
+    # Uncoded records are assumed to be small businesses (under $500K), as in the sector TAM
+    counts[:, 0] += tier_cube["Uncoded records"].to_numpy(dtype=float)
+    sectors = list(tier_cube.index)
+    industries = [SECTOR_TO_INDUSTRY.get(sector, DEFAULT_INDUSTRY) for sector in sectors]
+
+    presets = PRESETS.gather(industries, ("it_typical", "security_typical"))
+    growth = assumptions.set_index("Industry")[list(GROWTH_COLUMNS.values())]
+    defaults = pd.Series({column: DEFAULT_GROWTH_RATES[field] for field, column in GROWTH_COLUMNS.items()})
+    growth = growth.reindex(industries).fillna(defaults)
+    revenue, it_budget, security_budget = project_tam(
+        counts, tier_average_revenue(), presets["it_typical"], presets["security_typical"],
+        growth.to_numpy(dtype=float), years
+    )
+    return TamProjection(sectors, tier_columns, range(BASE_YEAR, BASE_YEAR + years + 1),
+                         revenue, it_budget, security_budget)
+
+
+@track_cache(st.cache_data, max_entries=32, show_spinner=False)
+def get_tam_projection(growth_key, years, preset_key, vintage_key):
+    """Projection for one assumption set, horizon, preset version and NAICS vintage"""
+    tier_cube = data.load_naics_tier_cube(vintage_key[0])
+    if tier_cube is None:
+        return None
+    columns = ["Industry"] + list(GROWTH_COLUMNS.values())
+    return build_tam_projection(tier_cube, pd.DataFrame(list(growth_key), columns=columns), years)
+
+
+def project_company_budget(annual_revenue, it_percentage, security_percentage, growth, years):
+    """Year x (revenue, IT budget, security budget) for one company and its industry's growth rates"""
+    revenue, it_budget, security_budget = project_tam(
+        [[annual_revenue]], 1.0, [it_percentage], [security_percentage], [growth], years
+    )
+    return pd.DataFrame({
+        "Revenue ($M)": revenue[0, 0],
+        "IT Budget ($M)": it_budget[0, 0],
+        "Security Budget ($M)": security_budget[0, 0]
+    }, index=pd.Index(range(BASE_YEAR, BASE_YEAR + years + 1), name="Year"))
@@ -0,0 +1,213 @@
+import re
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import streamlit as st
+from calculations import calculate_budgets
+from data import NAICS_TO_SECTOR, SECTOR_TO_INDUSTRY
+from naics_mapping import get_naics_mapping, normalize_naics_codes
+from preset_registry import PRESETS, DEFAULT_INDUSTRY
+from metrics import CACHE_EVICTIONS
+
+# Rows parsed and scored per chunk; progress is reported after each one
+PROSPECT_CHUNK_ROWS = 50_000
+
+# Largest accounts (by security budget) kept for the per-account table
+TOP_ACCOUNTS = 1_000
+
+# Scored uploads kept in memory across sessions
+MAX_CACHED_PORTFOLIOS = 8
+
+# Accepted header spellings per field, compared lower-cased without spaces or punctuation
+PROSPECT_COLUMNS = {
+    "account": ("account", "accountname", "company", "companyname", "name"),
+    "annual_revenue": ("annualrevenue", "annualrevenuem", "revenue", "revenuem"),
+    "industry": ("industry", "vertical"),
+    "naics": ("naics", "naicscode"),
+    "it_percentage": ("itpercentage", "it", "itbudget"),
+    "security_percentage": ("securitypercentage", "security", "securitybudget")
+}
+
+UNKNOWN_SECTOR = "Unknown (no NAICS code)"
+
+
+def detect_prospect_columns(header):
+    """Map each known field to the CSV column that holds it"""
+    normalized = {re.sub(r"[^a-z0-9]", "", str(column).lower()): column for column in header}
+    columns = {}
+    for field, spellings in PROSPECT_COLUMNS.items():
+        column = next((normalized[spelling] for spelling in spellings if spelling in normalized), None)
+        if column is not None:
+            columns[field] = column
+    return columns
+
+
+class ProspectPortfolio:
+    """Running aggregates of scored accounts per industry and NAICS sector, plus the largest accounts"""
+
+    def __init__(self, industries, sectors, columns):
+        self.industries = list(industries)
+        self.sectors = list(sectors)
+        self.columns = columns
+        self.rows = 0
+        self.skipped = 0
+        # Accounts, revenue, IT budget and security budget per industry and per sector
+        self.industry_totals = np.zeros((len(self.industries), 4))
+        self.sector_totals = np.zeros((len(self.sectors), 4))
+        self.top_accounts = pd.DataFrame()
+
+    @property
+    def accounts(self):
+        return int(self.industry_totals[:, 0].sum())
+
+    @property
+    def security_budget(self):
+        return float(self.industry_totals[:, 3].sum())
+
+    def add(self, names, industry_ids, sector_ids, revenue, it_budget, security_budget, it_pct, sec_pct):
+        values = np.stack([np.ones_like(revenue), revenue, it_budget, security_budget], axis=1)
+        for totals, ids in ((self.industry_totals, industry_ids), (self.sector_totals, sector_ids)):
+            for column in range(values.shape[1]):
+                totals[:, column] += np.bincount(ids, weights=values[:, column], minlength=len(totals))
+
+        # Keep only the largest accounts seen so far
+        keep = np.argsort(security_budget)[::-1][:TOP_ACCOUNTS]
+        chunk_top = pd.DataFrame({
+            "Account": names[keep],
+            "Industry": np.array(self.industries, dtype=object)[industry_ids[keep]],
+            "Sector": np.array(self.sectors, dtype=object)[sector_ids[keep]],
+            "Annual Revenue ($M)": revenue[keep],
+            "IT Budget (%)": it_pct[keep],
+            "Security Budget (% of IT)": sec_pct[keep],
+            "IT Budget ($M)": it_budget[keep],
+            "Security Budget ($M)": security_budget[keep]
+        })
+        self.top_accounts = (pd.concat([self.top_accounts, chunk_top], ignore_index=True) if len(self.top_accounts)
+                             else chunk_top)
+        self.top_accounts = self.top_accounts.nlargest(TOP_ACCOUNTS, "Security Budget ($M)").reset_index(drop=True)
+
+    def _frame(self, label, names, totals):
+        frame = pd.DataFrame({
+            label: names,
+            "Accounts": totals[:, 0],
+            "Revenue ($M)": totals[:, 1],
+            "IT Budget ($M)": totals[:, 2],
+            "Security Budget ($M)": totals[:, 3]
+        })
+        return frame[frame["Accounts"] > 0].sort_values("Security Budget ($M)", ascending=False, ignore_index=True)
+
+    def by_industry(self):
+        return self._frame("Industry", self.industries, self.industry_totals)
+
+    def by_sector(self):
+        return self._frame("Sector", self.sectors, self.sector_totals)
+
+
+def _sector_lookup(sectors):
+    """Sector index for every 2-digit NAICS prefix (the last slot is the unknown sector)"""
+    lookup = np.full(100, len(sectors) - 1, dtype=np.int64)
+    for code, sector in NAICS_TO_SECTOR.items():
+        lookup[int(code)] = sectors.index(sector)
+    return lookup
+
+
+def score_prospects(source, on_chunk=None, chunk_rows=PROSPECT_CHUNK_ROWS):
+    """Score a prospect CSV chunk by chunk into a ProspectPortfolio
+
+    Industries are matched to the presets by name (case-insensitive); accounts without a known
+    industry use their NAICS code's industry, else the default. Optional IT and security percentage
+    columns override the industry typical values per account. on_chunk(portfolio) runs after each chunk.
+    """
+    header = pd.read_csv(source, nrows=0).columns
+    source.seek(0)
+    columns = detect_prospect_columns(header)
+    if "annual_revenue" not in columns:
+        raise ValueError("The file needs an annual revenue column (in $M), e.g. 'annual_revenue' or 'Revenue'.")
+
+    industries = list(PRESETS.snapshot().names)
+    if DEFAULT_INDUSTRY not in industries:
+        industries.append(DEFAULT_INDUSTRY)
+    default_id = industries.index(DEFAULT_INDUSTRY)
+    industry_index = pd.Index([name.lower() for name in industries])
+    presets = PRESETS.gather(industries, ("it_typical", "security_typical"))
+
+    mapping = get_naics_mapping()
+    # Mapping industry id -> preset industry id; the extra last slot (id -1) is "no match"
+    naics_to_preset = np.array([industries.index(name) if name in industries else default_id
+                                for name in mapping.industries] + [-1])
+    sectors = list(dict.fromkeys(NAICS_TO_SECTOR.values())) + [UNKNOWN_SECTOR]
+    sector_lookup = _sector_lookup(sectors)
+
+    portfolio = ProspectPortfolio(industries, sectors, columns)
+    usecols = list(columns.values())
+    dtypes = {columns[field]: str for field in ("account", "industry", "naics") if field in columns}
+    for chunk in pd.read_csv(source, usecols=usecols, dtype=dtypes, chunksize=chunk_rows):
+        revenue = pd.to_numeric(chunk[columns["annual_revenue"]], errors="coerce").to_numpy(dtype=float)
+        valid = np.isfinite(revenue) & (revenue > 0)
+        portfolio.rows += len(chunk)
+        portfolio.skipped += int((~valid).sum())
+        chunk, revenue = chunk[valid], revenue[valid]
+
+        industry_ids = np.full(len(chunk), -1, dtype=np.int64)
+        if "industry" in columns:
+            industry_ids = industry_index.get_indexer(chunk[columns["industry"]].fillna("").str.strip().str.lower())
+        sector_ids = np.full(len(chunk), len(sectors) - 1, dtype=np.int64)
+        if "naics" in columns:
+            values, digits = normalize_naics_codes(chunk[columns["naics"]])
+            naics_ids = naics_to_preset[mapping.industry_ids_for_values(values, digits)]
+            industry_ids = np.where(industry_ids < 0, naics_ids, industry_ids)
+            prefixes = np.where(digits > 0, values // 10 ** np.maximum(digits - 2, 0), 0)
+            sector_ids = sector_lookup[prefixes]
+        industry_ids = np.where(industry_ids < 0, default_id, industry_ids)
+
+        it_pct = presets["it_typical"][industry_ids]
+        sec_pct = presets["security_typical"][industry_ids]
+        for field, typical in (("it_percentage", it_pct), ("security_percentage", sec_pct)):
+            if field in columns:
+                override = pd.to_numeric(chunk[columns[field]], errors="coerce").to_numpy(dtype=float)
+                typical[np.isfinite(override)] = override[np.isfinite(override)]
+        it_budget, security_budget = calculate_budgets(revenue, it_pct, sec_pct)
+
+        names = (chunk[columns["account"]].to_numpy(dtype=object) if "account" in columns
+                 else (portfolio.rows - len(valid) + np.flatnonzero(valid) + 1).astype(str).astype(object))
+        portfolio.add(names, industry_ids, sector_ids, revenue, it_budget, security_budget, it_pct, sec_pct)
+        if on_chunk is not None:
+            on_chunk(portfolio)
+    return portfolio
+
+
+class PortfolioCache:
+    """Scored uploads by (file digest, preset version), least recently used evicted first"""
+
+    def __init__(self, max_entries=MAX_CACHED_PORTFOLIOS):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            portfolio = self._entries.get(key)
+            if portfolio is not None:
+                self._entries.move_to_end(key)
+            return portfolio
+
+    def put(self, key, portfolio):
+        with self._lock:
+            self._entries[key] = portfolio
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                CACHE_EVICTIONS.inc("prospect_portfolios")
+
+
+@st.cache_resource
+def get_portfolio_cache():
+    """Process-wide cache of scored prospect uploads"""
+    return PortfolioCache()
+
+
+def industry_tam(sector_tam):
+    """Calibrated security TAM ($M) per preset industry, summed over the sectors mapped to it"""
+    industries = sector_tam["Sector"].map(SECTOR_TO_INDUSTRY).fillna(DEFAULT_INDUSTRY)
+    return sector_tam.groupby(industries.to_numpy())["Security Budget ($M)"].sum()
@@ -0,0 +1,155 @@
+import numpy as np
+from calculations import OPEN_TIER_AVERAGE_REVENUE
+
+# Within-tier revenue shapes: a power law fitted to neighbouring tier densities, or flat in log revenue
+DISTRIBUTION_SHAPES = {"Pareto (fitted)": "pareto", "Log-uniform": "log-uniform"}
+
+# Smallest revenue ($M) modelled; the "Under 500,000" tier starts here instead of at 0
+REVENUE_FLOOR = 0.01
+
+# Lookup grid: log-spaced revenue points ($M) from the floor to $1T
+GRID_POINTS = 4096
+GRID_MAX_REVENUE = 1e6
+
+# Fitted power-law exponents are clipped to this range to keep sparse tiers well behaved
+ALPHA_RANGE = (-3.0, 5.0)
+
+
+def _power_law_tables(x, low, high, alpha):
+    """Fraction of companies and mean revenue contribution below x for a power law on [low, high]
+
+    Density is proportional to x^-(alpha + 1); alpha = 0 is log-uniform. Arrays broadcast; high may be inf.
+    """
+    # Nudge exponents off the removable singularities at 0 and 1
+    alpha = np.where(np.abs(alpha) < 1e-9, 1e-9, alpha)
+    alpha = np.where(np.abs(alpha - 1) < 1e-9, 1 + 1e-9, alpha)
+    x = np.clip(x, low, high)
+    norm = low ** -alpha - high ** -alpha
+    fraction = (low ** -alpha - x ** -alpha) / norm
+    partial_mean = alpha / norm * (x ** (1 - alpha) - low ** (1 - alpha)) / (1 - alpha)
+    return fraction, partial_mean
+
+
+class RevenueDistribution:
+    """Companies and revenue at or below any revenue level, per segment, from dense precomputed tables
+
+    cdf[s, g] is the number of companies in segment s with revenue <= grid[g] and partial[s, g] their
+    combined revenue ($M). Queries interpolate linearly in log revenue on the uniform grid, so they
+    are vectorized over any broadcastable array of thresholds or quantiles per segment.
+    """
+
+    def __init__(self, segments, grid, cdf, partial, total_companies, total_revenue, alpha,
+                 tier_counts, tier_lows, tier_highs):
+        self.segments = list(segments)
+        self.grid = grid
+        self.cdf = cdf
+        self.partial = partial
+        self.total_companies = total_companies
+        self.total_revenue = total_revenue
+        self.alpha = alpha
+        self.tier_counts = tier_counts
+        self.tier_lows = tier_lows
+        self.tier_highs = tier_highs
+        self._log_grid = np.log(grid)
+        self._log_step = self._log_grid[1] - self._log_grid[0]
+
+    @property
+    def nbytes(self):
+        return self.grid.nbytes + self.cdf.nbytes + self.partial.nbytes
+
+    def _interpolate(self, table, revenue):
+        """Interpolate a (segments x grid) table at revenue values broadcasting against (..., segments)"""
+        position = (np.log(np.clip(revenue, self.grid[0], self.grid[-1])) - self._log_grid[0]) / self._log_step
+        position = np.clip(position, 0, len(self.grid) - 1)
+        left = np.minimum(position.astype(np.int64), len(self.grid) - 2)
+        weight = position - left
+        rows = np.arange(len(self.segments))
+        return table[rows, left] * (1 - weight) + table[rows, left + 1] * weight
+
+    def companies_above(self, revenue):
+        """Companies with revenue at or above each threshold ($M), broadcasting against (..., segments)"""
+        revenue = np.asarray(revenue, dtype=float)
+        below = self._interpolate(self.cdf, revenue)
+        return np.where(revenue <= self.grid[0], self.total_companies, self.total_companies - below)
+
+    def revenue_above(self, revenue):
+        """Combined revenue ($M) of companies at or above each threshold"""
+        revenue = np.asarray(revenue, dtype=float)
+        below = self._interpolate(self.partial, revenue)
+        return np.where(revenue <= self.grid[0], self.total_revenue, self.total_revenue - below)
+
+    def tier_between(self, low, high):
+        """Companies and revenue ($M) per segment and tier with revenue in [low, high] ($M per segment)
+
+        Evaluated exactly from each tier's fitted power law rather than the lookup grid.
+        """
+        low = np.asarray(low, dtype=float)[..., None]
+        high = np.maximum(np.asarray(high, dtype=float)[..., None], low)
+        fraction_low, mean_low = _power_law_tables(low, self.tier_lows, self.tier_highs, self.alpha)
+        fraction_high, mean_high = _power_law_tables(high, self.tier_lows, self.tier_highs, self.alpha)
+        return (self.tier_counts * (fraction_high - fraction_low),
+                self.tier_counts * (mean_high - mean_low))
+
+    def quantile(self, q):
+        """Revenue ($M) below which a fraction q of each segment's companies fall, broadcasting like q"""
+        q = np.clip(np.asarray(q, dtype=float), 0, 1)
+        segments, points = self.cdf.shape
+        fractions = self.cdf / np.where(self.total_companies > 0, self.total_companies, 1)[:, None]
+        # Offset each segment's CDF by its row number so one searchsorted covers every segment
+        flat = (fractions + np.arange(segments)[:, None]).ravel()
+        row_start = np.arange(segments) * points
+        target = q + np.arange(segments)
+        index = np.clip(np.searchsorted(flat, target, side="left"), row_start + 1, row_start + points - 1)
+        lower, upper = flat[index - 1], flat[index]
+        span = upper - lower
+        weight = np.where(span > 0, (target - lower) / np.where(span > 0, span, 1), 0)
+        log_revenue = self._log_grid[index - row_start - 1] + np.clip(weight, 0, 1) * self._log_step
+        return np.where(self.total_companies > 0, np.exp(log_revenue), np.nan)
+
+
+def fit_tier_exponents(counts, lows, highs):
+    """Power-law exponent per segment and bounded tier from the slope of log density across tiers"""
+    widths = np.log(highs / lows)
+    centers = np.log(np.sqrt(lows * highs))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_density = np.log(counts / widths)
+        slope = np.gradient(log_density, centers, axis=1) if counts.shape[1] > 1 else np.zeros_like(counts)
+    # Companies per unit log revenue fall off as x^-alpha
+    alpha = np.where(np.isfinite(slope), -slope, 0.0)
+    return np.clip(alpha, *ALPHA_RANGE)
+
+
+def build_revenue_distribution(segments, counts, tiers, shape="pareto",
+                               open_tier_mean=OPEN_TIER_AVERAGE_REVENUE, grid_points=GRID_POINTS):
+    """Fit a within-tier revenue distribution per segment and precompute its lookup tables
+
+    counts is (segments x tiers) over tiers [(low, high), ...] in $M, the last of which may be open
+    ended (high = inf). The open tier is a Pareto tail whose mean matches open_tier_mean.
+    """
+    counts = np.asarray(counts, dtype=float)
+    lows = np.maximum(np.array([low for low, _ in tiers], dtype=float), REVENUE_FLOOR)
+    highs = np.array([high for _, high in tiers], dtype=float)
+    bounded = np.isfinite(highs)
+
+    alpha = np.zeros_like(counts)
+    if shape == "pareto":
+        alpha[:, bounded] = fit_tier_exponents(counts[:, bounded], lows[bounded], highs[bounded])
+    elif shape != "log-uniform":
+        raise ValueError(f"Unknown distribution shape: {shape}")
+    if not bounded.all():
+        # Pareto tail mean = alpha * low / (alpha - 1)
+        open_low = lows[~bounded]
+        alpha[:, ~bounded] = open_tier_mean / (open_tier_mean - open_low)
+
+    grid = np.geomspace(REVENUE_FLOOR, GRID_MAX_REVENUE, grid_points)
+    fraction, partial_mean = _power_law_tables(
+        grid[None, None, :], lows[None, :, None], highs[None, :, None], alpha[:, :, None]
+    )
+    cdf = np.einsum("st,stg->sg", counts, fraction)
+    partial = np.einsum("st,stg->sg", counts, partial_mean)
+
+    # Tier means over the full tier (the open tier extends past the grid)
+    _, tier_mean = _power_law_tables(np.inf, lows[None, :], highs[None, :], alpha)
+    total_revenue = (counts * np.where(bounded, tier_mean, open_tier_mean)).sum(axis=1)
+    return RevenueDistribution(segments, grid, cdf, partial, counts.sum(axis=1), total_revenue, alpha,
+                               counts, lows, highs)
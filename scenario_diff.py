@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+import data
+from data import SECTOR_TO_INDUSTRY
+from calculations import calculate_budgets, tam_scaling_factor
+from preset_registry import PRESETS
+from metrics import track_cache
+
+
+def scenario_label(scenario_id, industry, it_percentage, security_percentage, annual_revenue):
+    """Label for a saved scenario that stays the same on every page of the history (it uses the store id)"""
+    return f"#{scenario_id} {industry}: {security_percentage:g}% of {it_percentage:g}% IT at ${annual_revenue:,.0f}M"
+
+
+def scenario_rows(page):
+    """Hashable (id, industry, IT %, security %, revenue) rows of a ScenarioPage, for cache keys"""
+    return tuple(zip(page.ids.tolist(), page.industries, page.it_percentage.tolist(),
+                     page.security_percentage.tolist(), page.annual_revenue.tolist()))
+
+
+class ScenarioDiff:
+    """Security budgets of saved scenarios over chart revenue points and NAICS sectors, diffed against a baseline
+
+    budgets is (scenarios x points), where the points are the chart revenue points followed by every
+    sector's revenue; for the sectors the budgets are calibrated security TAM.
+    """
+
+    def __init__(self, scenarios, revenue, sectors, budgets, baseline=0):
+        self.scenarios = list(scenarios)
+        self.labels = [scenario_label(*scenario) for scenario in self.scenarios]
+        self.revenue = np.asarray(revenue, dtype=float)
+        self.sectors = list(sectors)
+        self.budgets = budgets
+        self.baseline = baseline
+        base = budgets[baseline]
+        self.delta = budgets - base
+        self.relative = np.divide(self.delta, base, out=np.full_like(self.delta, np.nan), where=base > 0) * 100
+
+    @property
+    def budget_share(self):
+        """Security budget as a fraction of revenue per scenario"""
+        return np.array([it / 100 * sec / 100 for _, _, it, sec, _ in self.scenarios])
+
+    @property
+    def saved_budget(self):
+        """Security budget ($M) of each scenario at its own saved revenue"""
+        return self.budget_share * np.array([revenue for *_, revenue in self.scenarios])
+
+    def crossover(self):
+        """Revenue ($M) at which each scenario (rows) reaches the budget another scenario (columns) saved
+
+        Budgets are proportional to revenue, so two scenarios' budget lines never cross above zero;
+        the crossover is where one scenario's line meets the other's saved budget.
+        """
+        share = self.budget_share
+        with np.errstate(divide="ignore", invalid="ignore"):
+            revenue = np.divide.outer(self.saved_budget, share).T
+        return pd.DataFrame(np.where(np.isfinite(revenue), revenue, np.nan), index=self.labels, columns=self.labels)
+
+    def summary(self):
+        """One row per scenario: budget share, relative difference, TAM and crossover against the baseline"""
+        share = self.budget_share
+        tam = self.budgets[:, len(self.revenue):].sum(axis=1)
+        # Budgets scale with revenue, so the relative difference is the same at every revenue point
+        with np.errstate(divide="ignore", invalid="ignore"):
+            relative = (share / share[self.baseline] - 1) * 100
+        return pd.DataFrame({
+            "Scenario": self.labels,
+            "Security Budget (% of revenue)": share * 100,
+            "Budget at Saved Revenue ($M)": self.saved_budget,
+            "Difference vs Baseline (%)": relative,
+            "Security TAM ($M)": tam,
+            "TAM Difference ($M)": tam - tam[self.baseline],
+            "Crossover Revenue ($M)": self.crossover().iloc[:, self.baseline].to_numpy()
+        })
+
+    def _long_frame(self, label, names, columns):
+        scenarios = len(self.labels)
+        return pd.DataFrame({
+            "Scenario": np.repeat(self.labels, len(names)),
+            label: np.tile(np.asarray(names, dtype=object), scenarios),
+            "Security Budget ($M)": self.budgets[:, columns].ravel(),
+            "Difference ($M)": self.delta[:, columns].ravel(),
+            "Difference (%)": self.relative[:, columns].ravel()
+        })
+
+    def by_revenue(self):
+        """Scenario x chart revenue point budgets and differences from the baseline"""
+        return self._long_frame("Annual Revenue ($M)", self.revenue, slice(0, len(self.revenue)))
+
+    def by_sector(self):
+        """Scenario x NAICS sector security TAM and differences from the baseline"""
+        return self._long_frame("Sector", self.sectors, slice(len(self.revenue), None))
+
+
+def compute_scenario_diff(scenarios, revenue, sectors, sector_revenue, baseline=0, scaling_factor=1.0):
+    """Diff scenarios over revenue points and sectors in one (scenarios x points) broadcast"""
+    it_pct = np.array([it for _, _, it, _, _ in scenarios], dtype=float)
+    sec_pct = np.array([sec for _, _, _, sec, _ in scenarios], dtype=float)
+    points = np.concatenate([np.asarray(revenue, dtype=float), np.asarray(sector_revenue, dtype=float) * scaling_factor])
+    _, budgets = calculate_budgets(points, it_pct[:, None], sec_pct[:, None])
+    return ScenarioDiff(scenarios, revenue, sectors, budgets, baseline)
+
+
+@track_cache(st.cache_data, max_entries=32, show_spinner=False)
+def get_scenario_diff(scenarios, revenue_points, baseline, preset_key, vintage_key):
+    """Diff of one scenario selection (most often a pair), cached per revenue points, baseline, preset version and vintage
+
+    Sector TAM uses the scenarios' percentages for every sector, with the Sector TAM calibration factor.
+    """
+    sectors, sector_revenue, scaling_factor = [], [], 1.0
+    naics_data = data.load_naics_revenue_data(vintage_key[0])
+    if naics_data is not None:
+        sectors = naics_data["sector_name"].tolist()
+        sector_revenue = naics_data["Revenue"].to_numpy(dtype=float)
+        presets = PRESETS.gather(naics_data["sector_name"].map(SECTOR_TO_INDUSTRY), ("it_typical", "security_typical"))
+        _, preset_security = calculate_budgets(sector_revenue, presets["it_typical"], presets["security_typical"])
+        scaling_factor = tam_scaling_factor(preset_security)
+    return compute_scenario_diff(scenarios, revenue_points, sectors, sector_revenue, baseline, scaling_factor)
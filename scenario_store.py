@@ -0,0 +1,155 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import numpy as np
+import streamlit as st
+
+# Location of the scenario database (override with SCENARIO_DB_PATH)
+SCENARIO_DB_PATH = os.environ.get("SCENARIO_DB_PATH", "scenarios.db")
+
+# Number of saved scenarios shown per page in tables and charts
+SCENARIO_PAGE_SIZE = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    owner TEXT NOT NULL,
+    industry TEXT NOT NULL,
+    it_percentage REAL NOT NULL,
+    security_percentage REAL NOT NULL,
+    annual_revenue REAL NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scenarios_owner_created ON scenarios (owner, created_at);
+CREATE INDEX IF NOT EXISTS idx_scenarios_industry ON scenarios (industry);
+CREATE INDEX IF NOT EXISTS idx_scenarios_created ON scenarios (created_at);
+"""
+
+
+class ScenarioPage:
+    """Compact, array-backed view of one page of saved scenarios"""
+    __slots__ = ("ids", "industries", "it_percentage", "security_percentage",
+                 "annual_revenue", "created_at", "offset", "total")
+
+    def __init__(self, rows=(), offset=0, total=0):
+        rows = list(rows)
+        self.ids = np.array([r[0] for r in rows], dtype=np.int64)
+        self.industries = [r[1] for r in rows]
+        self.it_percentage = np.array([r[2] for r in rows], dtype=np.float64)
+        self.security_percentage = np.array([r[3] for r in rows], dtype=np.float64)
+        self.annual_revenue = np.array([r[4] for r in rows], dtype=np.float64)
+        self.created_at = np.array([r[5] for r in rows], dtype=np.float64)
+        self.offset = offset
+        self.total = total
+
+    def __len__(self):
+        return len(self.ids)
+
+    def labels(self):
+        """Column labels for each scenario, numbered across the whole history"""
+        return [
+            f"Calc #{self.offset + idx + 1} ({sec:g}% of {it:g}% IT)"
+            for idx, (it, sec) in enumerate(zip(self.it_percentage, self.security_percentage))
+        ]
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the page"""
+        return (self.ids.nbytes + self.it_percentage.nbytes + self.security_percentage.nbytes
+                + self.annual_revenue.nbytes + self.created_at.nbytes
+                + sum(len(name) for name in self.industries))
+
+
+class ScenarioStore:
+    """SQLite (WAL mode) store for saved budget calculations"""
+
+    def __init__(self, path=SCENARIO_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def add(self, owner, industry, it_percentage, security_percentage, annual_revenue):
+        """Save a single calculation"""
+        self.add_many(owner, [(industry, it_percentage, security_percentage, annual_revenue)])
+
+    def add_many(self, owner, scenarios):
+        """Bulk insert (industry, it %, security %, revenue) tuples in one transaction"""
+        now = time.time()
+        rows = [
+            (owner, str(industry), float(it), float(sec), float(rev), now)
+            for industry, it, sec, rev in scenarios
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO scenarios (owner, industry, it_percentage, security_percentage, "
+                "annual_revenue, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return len(rows)
+
+    def count(self, owner, industry=None):
+        """Number of scenarios saved by an owner, optionally for one industry"""
+        query = "SELECT COUNT(*) FROM scenarios WHERE owner = ?"
+        params = [owner]
+        if industry is not None:
+            query += " AND industry = ?"
+            params.append(industry)
+        with self._lock:
+            return self._conn.execute(query, params).fetchone()[0]
+
+    def fetch_page(self, owner, page=0, page_size=SCENARIO_PAGE_SIZE, industry=None):
+        """Fetch one page of scenarios (oldest first) as a ScenarioPage"""
+        total = self.count(owner, industry)
+        offset = max(0, page) * page_size
+        query = ("SELECT id, industry, it_percentage, security_percentage, annual_revenue, created_at "
+                 "FROM scenarios WHERE owner = ?")
+        params = [owner]
+        if industry is not None:
+            query += " AND industry = ?"
+            params.append(industry)
+        query += " ORDER BY created_at, id LIMIT ? OFFSET ?"
+        params.extend([page_size, offset])
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return ScenarioPage(rows, offset=offset, total=total)
+
+    def fetch_ids(self, owner, ids):
+        """Fetch specific scenarios by id as a ScenarioPage"""
+        ids = [int(i) for i in ids]
+        if not ids:
+            return ScenarioPage()
+        placeholders = ",".join("?" * len(ids))
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, industry, it_percentage, security_percentage, annual_revenue, created_at "
+                f"FROM scenarios WHERE owner = ? AND id IN ({placeholders}) ORDER BY created_at, id",
+                [owner, *ids]
+            ).fetchall()
+        return ScenarioPage(rows, total=len(rows))
+
+    def clear(self, owner):
+        """Delete all scenarios saved by an owner"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM scenarios WHERE owner = ?", (owner,))
+
+
+@st.cache_resource
+def get_scenario_store(path=SCENARIO_DB_PATH):
+    """Shared scenario store for all sessions"""
+    return ScenarioStore(path)
+
+
+def get_scenario_owner():
+    """Identify the current user/session, persisted in the URL so reloads keep history"""
+    if 'scenario_owner' not in st.session_state:
+        owner = st.query_params.get("sid")
+        if not owner:
+            owner = uuid.uuid4().hex
+            st.query_params["sid"] = owner
+        st.session_state.scenario_owner = owner
+    return st.session_state.scenario_owner
@@ -1,3 +1,4 @@
+import time
 import streamlit as st
 import plotly.io as pio
 import pages.budget_calculator as budget_calculator
@@ -6,10 +7,19 @@ import pages.naics_analysis as naics_analysis
 import pages.sector_tam_analysis as sector_tam_analysis
 from data import initialize_session_state
 from utils import set_custom_css, display_logo
+from session_memory import show_session_memory, get_session_registry
+from figure_pool import deferred_charts
+from metrics import ACTIVE_SESSIONS, PAGE_SECONDS, RERUNS, RERUN_SECONDS, start_metrics_server
+
+rerun_start = time.perf_counter()
 
 # Set page layout to wide
 st.set_page_config(layout="wide", menu_items=None)
 
+# Prometheus metrics from a sidecar thread (once per process)
+start_metrics_server()
+ACTIVE_SESSIONS.set_function(get_session_registry().count)
+
 # Initialize session state variables
 initialize_session_state()
 
@@ -72,18 +82,34 @@ The code is open-source under the BSD license at [github](https://github.com/oro
 # Create tabs for different views
 tab1, tab2, tab3, tab4 = st.tabs(["Budget Calculator", "Industry Benchmarks", "NAICS Analysis", "Sector TAM Analysis"])
 
-# Tab 1: Budget Calculator
-with tab1:
-    budget_calculator.show()
+# Pages lay out their charts and submit the figures to the figure pool; each chart is drawn
+# in its place as soon as its figure is built, after all four tabs are laid out
+with deferred_charts():
+    # Tab 1: Budget Calculator
+    with tab1:
+        with PAGE_SECONDS.time("budget_calculator"):
+            budget_calculator.show()
+
+    # Tab 2: Industry Benchmarks
+    with tab2:
+        with PAGE_SECONDS.time("industry_benchmarks"):
+            industry_benchmarks.show()
+
+    # Tab 3: NAICS Analysis
+    with tab3:
+        with PAGE_SECONDS.time("naics_analysis"):
+            naics_analysis.show()
+
+    # Tab 4: Sector TAM Analysis
+    with tab4:
+        with PAGE_SECONDS.time("sector_tam_analysis"):
+            sector_tam_analysis.show()
 
-# Tab 2: Industry Benchmarks
-with tab2:
-    industry_benchmarks.show()
+# NAICS data release used by the NAICS and TAM views
+naics_analysis.show_vintage_picker()
 
-# Tab 3: NAICS Analysis
-with tab3:
-    naics_analysis.show()
+# Per-session memory accounting for capacity planning
+show_session_memory()
 
-# Tab 4: Sector TAM Analysis
-with tab4:
-    sector_tam_analysis.show() 
\ No newline at end of file
+RERUNS.inc()
+RERUN_SECONDS.observe(time.perf_counter() - rerun_start)
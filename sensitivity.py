@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+import data
+from data import NAICS_REVENUE_MULTIPLIERS, REVENUE_TIERS, SECTOR_TO_INDUSTRY
+from calculations import TARGET_SECURITY_TAM, format_revenue_range
+from preset_registry import PRESETS, DEFAULT_INDUSTRY
+from metrics import track_cache
+
+# Range tested for the open-ended 1B+ tier's average revenue ($M): the tier floor to twice the estimate
+OPEN_TIER_REVENUE_RANGE = (1000, 3000)
+
+# Relative swing tested for the calibration target
+CALIBRATION_SWING = 0.25
+
+
+class TamSensitivity:
+    """Security TAM swing per assumption from precomputed partial contributions
+
+    Security TAM is a sum of companies x average revenue x IT % x security % terms, so it is linear in
+    every single assumption. contributions[p, s] is the part of sector s's raw security TAM that scales
+    with assumption p; moving p from its base value by a factor f moves that part by (f - 1). Calibrated
+    sector TAM is a ratio of two such sums and also follows in closed form.
+    """
+
+    def __init__(self, sectors, assumptions, base, low, high, contributions, sector_tam):
+        self.sectors = list(sectors)
+        self.assumptions = list(assumptions)
+        self.base = np.asarray(base, dtype=float)
+        self.low = np.asarray(low, dtype=float)
+        self.high = np.asarray(high, dtype=float)
+        self.contributions = contributions
+        self.sector_tam = sector_tam
+
+    def factors(self):
+        """(assumptions x 2) factors taking each assumption to its low and high value"""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.base[:, None] > 0, np.stack([self.low, self.high], axis=1) / self.base[:, None], 1)
+
+    def raw(self, sector=None):
+        """Uncalibrated security TAM ($M) and its values at each assumption's low and high end"""
+        rows = slice(None) if sector is None else self.sectors.index(sector)
+        baseline = self.sector_tam[rows].sum()
+        contribution = self.contributions[:, rows].reshape(len(self.assumptions), -1).sum(axis=1)
+        return baseline, baseline + (self.factors() - 1) * contribution[:, None]
+
+    def calibrated(self, sector=None, target=TARGET_SECURITY_TAM):
+        """Security TAM ($M) scaled so the total hits the target, and its values at each low and high end
+
+        The last row is the calibration target itself.
+        """
+        total, total_swings = self.raw()
+        value, value_swings = self.raw(sector)
+        baseline = target * value / total
+        target_swing = np.array([[1 - CALIBRATION_SWING, 1 + CALIBRATION_SWING]]) * baseline
+        return baseline, np.vstack([target * value_swings / total_swings, target_swing])
+
+    def tornado(self, sector=None, calibrated=False, target=TARGET_SECURITY_TAM):
+        """Assumptions sorted by TAM swing, with the TAM at their low and high values"""
+        if calibrated:
+            baseline, swings = self.calibrated(sector, target)
+            labels = self.assumptions + [f"Calibration target (${target / 1000:,.0f}B)"]
+            base = np.append(self.base, target)
+            low = np.append(self.low, target * (1 - CALIBRATION_SWING))
+            high = np.append(self.high, target * (1 + CALIBRATION_SWING))
+        else:
+            baseline, swings = self.raw(sector)
+            labels, base, low, high = self.assumptions, self.base, self.low, self.high
+        frame = pd.DataFrame({
+            "Assumption": labels,
+            "Base": base,
+            "Low": low,
+            "High": high,
+            "TAM at Low ($M)": swings[:, 0],
+            "TAM at High ($M)": swings[:, 1],
+            "Swing ($M)": np.abs(swings[:, 1] - swings[:, 0])
+        })
+        return baseline, frame.sort_values("Swing ($M)", ascending=False, ignore_index=True)
+
+
+def build_tam_sensitivity(naics_data):
+    """Assumption ranges and partial security TAM contributions from the NAICS sector summary"""
+    sectors = naics_data['sector_name'].tolist()
+    tier_columns = list(NAICS_REVENUE_MULTIPLIERS)
+    counts = naics_data[tier_columns].to_numpy(dtype=float)
+    multipliers = np.array(list(NAICS_REVENUE_MULTIPLIERS.values()), dtype=float)
+    industries = [SECTOR_TO_INDUSTRY.get(sector, DEFAULT_INDUSTRY) for sector in sectors]
+    presets = PRESETS.gather(industries, ("it_min", "it_typical", "it_max",
+                                          "security_min", "security_typical", "security_max"))
+    budget_share = presets["it_typical"] * presets["security_typical"] / 10_000
+    # Security TAM per sector and tier column
+    terms = counts * multipliers * budget_share[:, None]
+
+    # Average revenue assumptions: uncoded records span the under-$500K tier, tiers their own bounds
+    labels, base, low, high, rows = [], [], [], [], []
+    for index, (multiplier, tier) in enumerate(zip(multipliers, [None] + REVENUE_TIERS)):
+        if tier is None:
+            name, (range_low, range_high) = "Uncoded records", REVENUE_TIERS[0]
+        else:
+            name = format_revenue_range(*tier)
+            range_low, range_high = tier if np.isfinite(tier[1]) else OPEN_TIER_REVENUE_RANGE
+        labels.append(f"Avg revenue: {name} (${multiplier:g}M)")
+        base.append(multiplier)
+        low.append(range_low)
+        high.append(range_high)
+        rows.append(terms[:, index])
+
+    # Percentage assumptions: each industry's preset range, applied to the sectors mapped to it
+    sector_terms = terms.sum(axis=1)
+    industry_array = np.array(industries)
+    for industry in dict.fromkeys(industries):
+        in_industry = industry_array == industry
+        first = np.flatnonzero(in_industry)[0]
+        for kind, label in (("it", "IT %"), ("security", "Security %")):
+            typical = presets[f"{kind}_typical"][first]
+            labels.append(f"{label}: {industry} ({typical:g}%)")
+            base.append(typical)
+            low.append(presets[f"{kind}_min"][first])
+            high.append(presets[f"{kind}_max"][first])
+            rows.append(np.where(in_industry, sector_terms, 0))
+
+    return TamSensitivity(sectors, labels, base, low, high, np.vstack(rows), sector_terms)
+
+
+@track_cache(st.cache_data, max_entries=8, show_spinner=False)
+def get_tam_sensitivity(preset_key, vintage_key):
+    """Sensitivity engine for a NAICS vintage, rebuilt only when the presets or the vintage change"""
+    naics_data = data.load_naics_revenue_data(vintage_key[0])
+    if naics_data is None:
+        return None
+    return build_tam_sensitivity(naics_data)
@@ -0,0 +1,236 @@
+import os
+import sys
+import threading
+import time
+from collections.abc import MutableMapping
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from metrics import CACHE_EVICTIONS
+
+# Sessions idle longer than this have their derived data evicted
+SESSION_IDLE_SECONDS = int(os.environ.get("SESSION_IDLE_SECONDS", "600"))
+
+# Sessions idle longer than this are dropped from the registry (their browser tab is most likely gone)
+SESSION_EXPIRE_SECONDS = int(os.environ.get("SESSION_EXPIRE_SECONDS", "3600"))
+
+CUSTOM_INDUSTRY_FIELDS = ("it_min", "it_typical", "it_max", "security_min", "security_typical", "security_max")
+
+
+class CustomIndustryTable(MutableMapping):
+    """Dict-like store of custom industries backed by one float array instead of a dict per industry"""
+
+    def __init__(self, industries=None):
+        self._names = []
+        self._index = {}
+        self._values = np.empty((0, len(CUSTOM_INDUSTRY_FIELDS)), dtype=np.float64)
+        for name, values in (industries or {}).items():
+            self[name] = values
+
+    def __getitem__(self, name):
+        row = self._values[self._index[name]]
+        return {field: float(value) for field, value in zip(CUSTOM_INDUSTRY_FIELDS, row)}
+
+    def __setitem__(self, name, values):
+        row = [float(values[field]) for field in CUSTOM_INDUSTRY_FIELDS]
+        if name in self._index:
+            self._values[self._index[name]] = row
+            return
+        # Grow capacity geometrically so bulk adds stay amortised O(1)
+        if len(self._names) == len(self._values):
+            grown = np.empty((max(8, 2 * len(self._values)), len(CUSTOM_INDUSTRY_FIELDS)), dtype=np.float64)
+            grown[:len(self._values)] = self._values
+            self._values = grown
+        self._index[name] = len(self._names)
+        self._names.append(name)
+        self._values[self._index[name]] = row
+
+    def update_many(self, names, values):
+        """Bulk add or replace industries from a names list and an (n, 6) array in CUSTOM_INDUSTRY_FIELDS order"""
+        values = np.asarray(values, dtype=np.float64).reshape(len(names), len(CUSTOM_INDUSTRY_FIELDS))
+        # Later duplicates win, like repeated dict assignment
+        last_row = {name: i for i, name in enumerate(names)}
+        existing = [(self._index[name], row) for name, row in last_row.items() if name in self._index]
+        added = [(name, row) for name, row in last_row.items() if name not in self._index]
+        for position, row in existing:
+            self._values[position] = values[row]
+        if added:
+            start = len(self._names)
+            needed = start + len(added)
+            if needed > len(self._values):
+                grown = np.empty((max(8, needed, 2 * len(self._values)), len(CUSTOM_INDUSTRY_FIELDS)), dtype=np.float64)
+                grown[:start] = self._values[:start]
+                self._values = grown
+            self._values[start:needed] = values[[row for _, row in added]]
+            for offset, (name, _) in enumerate(added):
+                self._index[name] = start + offset
+                self._names.append(name)
+
+    def __delitem__(self, name):
+        position = self._index.pop(name)
+        self._names.pop(position)
+        self._values = np.delete(self._values, position, axis=0)
+        self._index = {n: i for i, n in enumerate(self._names)}
+
+    def clear(self):
+        self._names, self._index = [], {}
+        self._values = np.empty((0, len(CUSTOM_INDUSTRY_FIELDS)), dtype=np.float64)
+
+    def __iter__(self):
+        return iter(list(self._names))
+
+    def __len__(self):
+        return len(self._names)
+
+    def columns(self):
+        """All custom industries as (names, field -> array) without building per-industry dicts"""
+        values = self._values[:len(self._names)]
+        return list(self._names), {field: values[:, i] for i, field in enumerate(CUSTOM_INDUSTRY_FIELDS)}
+
+    def fingerprint(self):
+        """Bytes identifying the current contents (names, order and values)"""
+        return "\0".join(self._names).encode() + self._values[:len(self._names)].tobytes()
+
+    @property
+    def nbytes(self):
+        return self._values.nbytes + sum(sys.getsizeof(name) for name in self._names)
+
+
+def estimate_size(obj, seen=None):
+    """Approximate memory held by an object and everything it references"""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    if hasattr(obj, "nbytes") and not isinstance(obj, type):
+        return int(obj.nbytes)
+    if hasattr(obj, "to_plotly_json"):
+        return estimate_size(obj.to_plotly_json(), seen)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, seen) + estimate_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += estimate_size(vars(obj), seen)
+    elif hasattr(obj, "__slots__"):
+        size += sum(estimate_size(getattr(obj, slot), seen) for slot in obj.__slots__ if hasattr(obj, slot))
+    return size
+
+
+class SessionRecord:
+    """Registry entry for one browser session"""
+    __slots__ = ("last_active", "state_bytes", "derived")
+
+    def __init__(self):
+        self.last_active = time.time()
+        self.state_bytes = 0
+        self.derived = {}
+
+
+class SessionRegistry:
+    """Tracks active sessions, their memory footprint and evictable derived data"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self.evictions = 0
+
+    def touch(self, session_id):
+        """Mark a session active and evict derived data of idle sessions"""
+        now = time.time()
+        with self._lock:
+            record = self._sessions.get(session_id)
+            if record is None:
+                record = self._sessions[session_id] = SessionRecord()
+            record.last_active = now
+            for other_id, other in list(self._sessions.items()):
+                idle = now - other.last_active
+                if idle > SESSION_EXPIRE_SECONDS:
+                    del self._sessions[other_id]
+                elif idle > SESSION_IDLE_SECONDS and other.derived:
+                    self.evictions += len(other.derived)
+                    CACHE_EVICTIONS.inc("session_derived", amount=len(other.derived))
+                    other.derived.clear()
+            return record
+
+    def count(self):
+        """Sessions seen within the expiry window"""
+        return len(self._sessions)
+
+    def record_bytes(self, session_id, state_bytes):
+        with self._lock:
+            if session_id in self._sessions:
+                self._sessions[session_id].state_bytes = state_bytes
+
+    def summary(self):
+        """Active session count and total/average bytes per session"""
+        with self._lock:
+            sizes = [r.state_bytes + estimate_size(r.derived) for r in self._sessions.values()]
+        total = sum(sizes)
+        return {
+            "sessions": len(sizes),
+            "total_bytes": total,
+            "bytes_per_session": total / len(sizes) if sizes else 0,
+            "evictions": self.evictions
+        }
+
+
+@st.cache_resource
+def get_session_registry():
+    """Process-wide session registry"""
+    return SessionRegistry()
+
+
+def _session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "local"
+
+
+def derived_cache():
+    """Per-session dict for data derivable from the store or presets; cleared when the session goes idle"""
+    return get_session_registry().touch(_session_id()).derived
+
+
+def session_memory_report():
+    """Bytes held by each session state key, plus this session's derived data"""
+    report = {key: estimate_size(value) for key, value in st.session_state.items()}
+    report["(derived data)"] = estimate_size(derived_cache())
+    return dict(sorted(report.items(), key=lambda item: item[1], reverse=True))
+
+
+def format_bytes(size):
+    """Human readable byte count"""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:,.0f} {unit}" if unit == "B" else f"{size:,.1f} {unit}"
+        size /= 1024
+    return f"{size:,.1f} GB"
+
+
+def show_session_memory():
+    """Sidebar dashboard of this session's memory and the average across active sessions"""
+    report = session_memory_report()
+    session_bytes = sum(report.values())
+    registry = get_session_registry()
+    registry.record_bytes(_session_id(), session_bytes - report["(derived data)"])
+    summary = registry.summary()
+
+    with st.sidebar.expander("Session Memory"):
+        st.metric("This Session", format_bytes(session_bytes))
+        st.metric("Average per Session", format_bytes(summary["bytes_per_session"]),
+                  f"{summary['sessions']} active session(s)", delta_color="off")
+        st.caption(f"Derived data evicted from idle sessions: {summary['evictions']:,} entries")
+        st.dataframe(
+            pd.DataFrame({"Key": list(report.keys()), "Bytes": list(report.values())}),
+            hide_index=True,
+            use_container_width=True
+        )
@@ -2,6 +2,9 @@ import plotly.graph_objects as go
 import streamlit as st
 import pandas as pd
 import numpy as np
+from calculations import budget_table_values
+from exports import EXPORT_FORMATS
+from formula_engine import get_assumption_model
 
 
 def set_custom_css():
@@ -77,7 +80,7 @@ def create_security_budget_chart(revenue_array, x_positions, current_it, current
                               show_ranges=False, min_it_percentage=0, max_it_percentage=0,
                               typical_it_percentage=0, min_security_percentage=0, 
                               max_security_percentage=0, typical_security_percentage=0,
-                              chart_colors=None):
+                              chart_colors=None, calculations=None):
     """Create a mixed bar and line chart showing security budget calculations"""
     if chart_colors is None:
         chart_colors = {
@@ -94,11 +97,10 @@ def create_security_budget_chart(revenue_array, x_positions, current_it, current
     # Use the typical IT percentage for all security budget tiers
     it_percentage = typical_it_percentage
     
-    # Calculate security budget values for different tiers (5%, 10%, 15%, 20%)
-    security_5pct = revenue_array * (it_percentage / 100) * (5 / 100)
-    security_10pct = revenue_array * (it_percentage / 100) * (10 / 100)
-    security_15pct = revenue_array * (it_percentage / 100) * (15 / 100)
-    security_20pct = revenue_array * (it_percentage / 100) * (20 / 100)
+    # Calculate security budget tiers (5%, 10%, 15%, 20% of IT) with the spreadsheet assumption model
+    model = get_assumption_model()
+    model_values = model.evaluate(revenue_array, {"IT Budget": it_percentage})
+    tier_labels = [label for label in model.labels if label.startswith("Security Budget")]
     
     # User selection
     user_budget = revenue_array * (current_it / 100) * (current_security / 100)
@@ -109,57 +111,21 @@ def create_security_budget_chart(revenue_array, x_positions, current_it, current
     typical_line = revenue_array * (typical_it_percentage / 100) * (typical_security_percentage / 100)
     
     # Add bars for different security budget tiers using go.Bar directly
-    fig.add_trace(go.Bar(
-        name=f"5% of IT Budget ({it_percentage}% IT)",
-        x=revenue_array,
-        y=security_5pct,
-        marker_color=chart_colors["bar_colors"][0],
-        hovertemplate="<b>Revenue:</b> $%{x}M<br>" +
-                    f"<b>IT:</b> {it_percentage}%<br>" +
-                    "<b>Security:</b> 5% of IT<br>" +
-                    "<b>Budget:</b> $%{y:.2f}M<extra></extra>",
-        text=["$" + f"{y:.2f}M" for y in security_5pct],
-        textposition='outside'
-    ))
-    
-    fig.add_trace(go.Bar(
-        name=f"10% of IT Budget ({it_percentage}% IT)",
-        x=revenue_array,
-        y=security_10pct,
-        marker_color=chart_colors["bar_colors"][1],
-        hovertemplate="<b>Revenue:</b> $%{x}M<br>" +
-                    f"<b>IT:</b> {it_percentage}%<br>" +
-                    "<b>Security:</b> 10% of IT<br>" +
-                    "<b>Budget:</b> $%{y:.2f}M<extra></extra>",
-        text=["$" + f"{y:.2f}M" for y in security_10pct],
-        textposition='outside'
-    ))
-    
-    fig.add_trace(go.Bar(
-        name=f"15% of IT Budget ({it_percentage}% IT)",
-        x=revenue_array,
-        y=security_15pct,
-        marker_color=chart_colors["bar_colors"][2],
-        hovertemplate="<b>Revenue:</b> $%{x}M<br>" +
-                    f"<b>IT:</b> {it_percentage}%<br>" +
-                    "<b>Security:</b> 15% of IT<br>" +
-                    "<b>Budget:</b> $%{y:.2f}M<extra></extra>",
-        text=["$" + f"{y:.2f}M" for y in security_15pct],
-        textposition='outside'
-    ))
-    
-    fig.add_trace(go.Bar(
-        name=f"20% of IT Budget ({it_percentage}% IT)",
-        x=revenue_array,
-        y=security_20pct,
-        marker_color=chart_colors["bar_colors"][3],
-        hovertemplate="<b>Revenue:</b> $%{x}M<br>" +
-                    f"<b>IT:</b> {it_percentage}%<br>" +
-                    "<b>Security:</b> 20% of IT<br>" +
-                    "<b>Budget:</b> $%{y:.2f}M<extra></extra>",
-        text=["$" + f"{y:.2f}M" for y in security_20pct],
-        textposition='outside'
-    ))
+    for idx, label in enumerate(tier_labels):
+        tier_percentage = f"{model.parameter(label):g}"
+        tier_budget = model_values[label]
+        fig.add_trace(go.Bar(
+            name=f"{tier_percentage}% of IT Budget ({it_percentage}% IT)",
+            x=revenue_array,
+            y=tier_budget,
+            marker_color=chart_colors["bar_colors"][idx % len(chart_colors["bar_colors"])],
+            hovertemplate="<b>Revenue:</b> $%{x}M<br>" +
+                        f"<b>IT:</b> {it_percentage}%<br>" +
+                        f"<b>Security:</b> {tier_percentage}% of IT<br>" +
+                        "<b>Budget:</b> $%{y:.2f}M<extra></extra>",
+            texttemplate="$%{y:.2f}M",
+            textposition='outside'
+        ))
     
     # Add trend lines
     if show_ranges:
@@ -207,11 +173,24 @@ def create_security_budget_chart(revenue_array, x_positions, current_it, current
         hovertemplate="<b>Revenue:</b> $%{x}M<br>" +
                     "<b>Your Selection:</b> $%{y:.2f}M<br>" +
                     f"IT Budget: {current_it}% of Revenue<br>" +
-                    f"Security Budget: {current_security}% of IT Budget<extra></extra>",
-        text=["$" + f"{y:.2f}M" for y in user_budget],
-        textposition='top center'
+                    f"Security Budget: {current_security}% of IT Budget<extra></extra>"
     ))
     
+    # Add lines for the visible page of saved calculations
+    if calculations is not None and len(calculations) > 0:
+        calc_colors = chart_colors.get("user_calculations", [chart_colors["user_selection"]])
+        user_budgets = np.outer(calculations.it_percentage / 100 * calculations.security_percentage / 100, revenue_array)
+        for idx, (label, calc_budget) in enumerate(zip(calculations.labels(), user_budgets)):
+            fig.add_trace(go.Scatter(
+                x=revenue_array,
+                y=calc_budget,
+                mode='lines',
+                name=label,
+                line=dict(color=calc_colors[idx % len(calc_colors)], width=2, dash='dash'),
+                hovertemplate="<b>Revenue:</b> $%{x}M<br>" +
+                            f"<b>{label}:</b> " + "$%{y:.2f}M<extra></extra>"
+            ))
+    
     # Update layout with proper bar settings
     fig.update_layout(
         title="Security Budget by Annual Revenue",
@@ -237,7 +216,9 @@ def create_security_budget_chart(revenue_array, x_positions, current_it, current
     # Add x-axis labels for revenue points
     fig.update_xaxes(
         tickvals=revenue_array,
-        ticktext=[f"${x}M" for x in revenue_array]
+        tickformat="d",
+        tickprefix="$",
+        ticksuffix="M"
     )
     
     # Add a subtitle with the current settings
@@ -252,48 +233,53 @@ def create_security_budget_chart(revenue_array, x_positions, current_it, current
     return fig
 
 
-def create_budget_table(revenue_array, current_it, current_security):
+def create_budget_table(revenue_array, current_it, current_security, calculations=None):
     """Create a budget breakdown table with standard and user-defined security percentages"""
-    table_data = []
-    
-    # Define standard security percentages to show
-    standard_security_percentages = [5, 10, 15, 20]
+    # Use revenue array for revenue tiers (prevent division by zero)
+    revenue = np.asarray(revenue_array, dtype=float)
+    revenue = revenue[revenue > 0]
     
-    # Use revenue array for revenue tiers
-    for rev in revenue_array:
-        if rev > 0:  # Prevent division by zero
-            row_data = {"Annual Revenue": f"${rev:,.0f}M"}
-            
-            # Calculate IT budget
-            it_budget = rev * (current_it / 100)
-            row_data["IT Budget (%)"] = f"{current_it}%"
-            
-            # Add standard security percentage columns
-            for sec_percent in standard_security_percentages:
-                security_budget = it_budget * (sec_percent / 100)
-                row_data[f"{sec_percent}% of IT"] = f"${security_budget:,.2f}M"
-            
-            # Add current user-defined security budget if not already in standard percentages
-            if current_security not in standard_security_percentages:
-                security_budget = it_budget * (current_security / 100)
-                row_data[f"User ({current_security}% of IT)"] = f"${security_budget:,.2f}M"
-            
-            # Add user calculations in separate columns - always use the saved percentages for these
-            for idx, calc in enumerate(st.session_state.user_calculations):
-                user_it = calc['it_percentage']
-                user_security = calc['security_percentage']
-                
-                # Calculate at current revenue with saved IT/Security percentages
-                user_it_budget = rev * (user_it / 100)
-                user_security_budget = user_it_budget * (user_security / 100)
-                row_data[f"Calc #{idx+1} ({user_security}% of {user_it}% IT)"] = f"${user_security_budget:,.2f}M"
-            
-            table_data.append(row_data)
+    # Calculate every budget column at once, then format for display
+    columns = budget_table_values(revenue, current_it, current_security, calculations)
+    table_data = {
+        "Annual Revenue": [f"${rev:,.0f}M" for rev in columns.pop("Annual Revenue")],
+        "IT Budget (%)": [f"{current_it}%"] * len(revenue)
+    }
+    for label, values in columns.items():
+        table_data[label] = [f"${b:,.2f}M" for b in values]
     
     # Convert to DataFrame
     return pd.DataFrame(table_data)
 
 
+def show_export_controls(filename, export_fn, key):
+    """Format picker and download button; export_fn(fmt) returns the file bytes
+
+    The file is only generated once "Prepare" is clicked, and only while its download button is shown,
+    so reruns don't build exports nobody downloads.
+    """
+    prepared_key = f"{key}_prepared"
+    format_col, button_col = st.columns([1, 3])
+    with format_col:
+        fmt = st.selectbox("Export format", list(EXPORT_FORMATS.keys()), key=f"{key}_format",
+                           label_visibility="collapsed")
+    extension, mime = EXPORT_FORMATS[fmt]
+    with button_col:
+        if st.session_state.get(prepared_key) != fmt:
+            if not st.button(f"Prepare {fmt}", key=f"{key}_prepare"):
+                return
+            st.session_state[prepared_key] = fmt
+        if st.download_button(
+            f"Download {fmt}",
+            data=export_fn(fmt),
+            file_name=f"{filename}.{extension}",
+            mime=mime,
+            key=f"{key}_download"
+        ):
+            # This run still serves the file; the next export is prepared on request again
+            st.session_state.pop(prepared_key, None)
+
+
 def highlight_selected_revenue(row):
     """Highlight the row closest to the selected annual revenue"""
     target_rev = float(st.session_state.annual_revenue)